@@ -1,11 +1,17 @@
 
 import os
+import re
 import json
 import shutil
 
+import numpy as np
+
+import maya.api.OpenMaya as om
 import maya.cmds as cmds
 
 from rig.deformers import skincluster, ngSkinToolsData 
+from rig.deformers.skin_file import FILE_EXTENSION
+from rig.deformers.skin_topology import TopologyIndex
 from rig.objects.object_data import DagNodeData
 
 
@@ -90,7 +96,7 @@ class Component:
             None
         """
         if cmds.objExists('geometry'):
-            geometry_grp = DagNodeData('geometry')
+            geometry_grp = DagNodeData.get('geometry')
             geometry_temp_name = cmds.rename(geometry_grp.dag_path, 'geometry_temp')
             cmds.file(self.get_file_path('model'), i=True)
             geometry_content = cmds.listRelatives('geometry', children=True, fullPath=True)
@@ -230,7 +236,12 @@ class Component:
                 return
 
         for control in controls:
-            control_data = self.cTools.get_curve_data(control)
+            c_control = DagNodeData.get(control)
+
+            control_data = {}
+            for shape_index, shape in enumerate(c_control.shapes):
+                if shape.hasFn(om.MFn.kNurbsCurve):
+                    control_data[shape.partialPathName().split('|')[-1]] = c_control.get_points(shape_index).tolist()
 
             file_out = open('{}/{}.json'.format(full_path, control), 'w')
             json.dump(control_data, file_out, indent=2)
@@ -252,25 +263,27 @@ class Component:
         full_path = os.path.join(component_path, component_version)
 
         imported_controls = []
+        component_files = set(os.listdir(full_path))
 
         controls = cmds.ls('ctrl_*', type='transform', shapes=False)
         for control in controls:
-            if cmds.listRelatives(control, shapes=True):
-                ctrl_shapes = cmds.listRelatives(control, shapes=True)
-
-                for ctrl_shape in ctrl_shapes:
-                    component_file = '{}.json'.format(control)
-                    if component_file in os.listdir(full_path):
-                        if cmds.objExists(ctrl_shape):
-                            file_in = open(os.path.join(full_path, component_file))
-                            control_data = json.load(file_in)
-                            file_in.close()
-
-                            control_cvs = cmds.ls('{}.cv[*]'.format(ctrl_shape), flatten=True)
-                            for i, cv in enumerate(control_cvs):
-                                cv_shape = '{}.cv[{}]'.format(ctrl_shape, i)
-                                cmds.move(control_data[cv_shape][0], control_data[cv_shape][1], control_data[cv_shape][2],
-                                          cv, localSpace=True)
+            component_file = '{}.json'.format(control)
+            if component_file not in component_files:
+                continue
+
+            file_in = open(os.path.join(full_path, component_file))
+            control_data = json.load(file_in)
+            file_in.close()
+
+            c_control = DagNodeData.get(control)
+            for shape_index, shape in enumerate(c_control.shapes):
+                if not shape.hasFn(om.MFn.kNurbsCurve):
+                    continue
+
+                points = self._get_control_shape_points(control_data, shape.partialPathName().split('|')[-1],
+                                                        c_control.get_point_count(shape_index))
+                if points is not None:
+                    c_control.set_points(points, shape_index)
 
             imported_controls.append(control)
 
@@ -284,10 +297,14 @@ class Component:
         return
 
 
-    def export_deformers_component(self):
+    def export_deformers_component(self, topology_index=None):
         """
         Exports the skinCluster weights and ngSkinTools data.
 
+        Args:
+            topology_index (str, optional): The path of a show wide topology index to
+                register the exported skin files in. Defaults to None.
+
         Returns:
             None
         """
@@ -295,19 +312,23 @@ class Component:
         component_version = self.get_component_version(component_path, latest=True)
         full_path = os.path.join(component_path, component_version)
 
-        skinweights_exported = []
-
-        c_ngskintools_data = ngSkinToolsData.NgSkinData()
-
         selection = cmds.ls(sl=True)
+
+        skinweights_exported = skincluster.export_skincluster_data(selection, full_path,
+                                                                   chunk_store=os.path.join(component_path, 'chunks'))
         for obj in selection:
-            try:
-                skincluster.saveSkinclusterData(obj, full_path)
-                skinweights_exported.append(obj)
-            except:
+            if obj not in skinweights_exported:
                 print('{} does not have a skincluster node'.format(obj))
 
-            self.c_ngskintools_data.exportNgSkinData(obj, full_path)
+        c_ngskintools_data = ngSkinToolsData.NgSkinData()
+        for obj in selection:
+            c_ngskintools_data.exportNgSkinData(obj, full_path)
+
+        if topology_index and skinweights_exported:
+            c_topology_index = TopologyIndex(topology_index)
+            for obj in skinweights_exported:
+                c_topology_index.add_skin_file(os.path.join(full_path, 'skincluster', '{}{}'.format(obj, FILE_EXTENSION)))
+            c_topology_index.save()
 
         if skinweights_exported:
             print('#' * 50)
@@ -318,12 +339,17 @@ class Component:
 
         return
 
-    def import_deformers_component(self, ng_skin=True):
+    def import_deformers_component(self, ng_skin=True, allow_pickle=False):
         """
         Imports the skinCluster weights and ngSkinTools data.
 
+        Versions exported before the skin container hold .pckl.gzip files. Those are only
+        loaded with allow_pickle, otherwise every skipped file is named in a warning.
+
         Args:
             ng_skin (bool, optional): Whether to import ngSkinTools data. Defaults to True.
+            allow_pickle (bool, optional): Whether to load legacy .pckl.gzip skin files that
+                have no .skin counterpart. Defaults to False.
 
         Returns:
             None
@@ -336,10 +362,25 @@ class Component:
 
         skincluster_path = os.path.join(full_path, 'skincluster')
         if os.path.exists(skincluster_path):
-            for obj in os.listdir(skincluster_path):
-                obj = obj.split('.')[0]
+            skin_files = os.listdir(skincluster_path)
+            for skin_file in skin_files:
+                if skin_file.endswith(FILE_EXTENSION):
+                    obj = skin_file[:-len(FILE_EXTENSION)]
+
+                elif skin_file.endswith('.pckl.gzip'):
+                    obj = skin_file[:-len('.pckl.gzip')]
+                    if '{}{}'.format(obj, FILE_EXTENSION) in skin_files:
+                        continue
+
+                    if not allow_pickle:
+                        cmds.warning('Skipped legacy skin file {}, pass allow_pickle=True to import it.'
+                                     .format(os.path.join(skincluster_path, skin_file)))
+                        continue
+                else:
+                    continue
+
                 if cmds.objExists(obj):
-                    skincluster.load_skincluster_data(obj, skincluster_path)
+                    skincluster.load_skincluster_data(obj, skincluster_path, allow_pickle=allow_pickle)
                     skinweights_imported.append(obj)
 
         if ng_skin:
@@ -549,9 +590,11 @@ class Component:
         Returns:
             str: The version of the component.
         """
-        versions = os.listdir(component_path)
+        component = os.path.basename(os.path.normpath(component_path))
+        versions = sorted(version for version in os.listdir(component_path)
+                          if re.match(r'{}_\d+$'.format(re.escape(component)), version))
         if not versions:
-            first_version = '{}_001'.format(component_path.split('/')[-1])
+            first_version = '{}_001'.format(component)
             os.makedirs(os.path.join(component_path, first_version))
             versions.append(first_version)
 
@@ -565,6 +608,9 @@ class Component:
         """
         Creates a new version of a component.
 
+        Deformer versions only hold skin files listing chunk hashes, the weights themselves
+        live once in the component's chunk store, so copying a version is cheap.
+
         Args:
             component: (str) The name of the component.
 
@@ -609,6 +655,35 @@ class Component:
         return new_file_path
 
 
+    def _get_control_shape_points(self, control_data, shape_name, num_cvs):
+        """
+        Returns the saved CV positions of a control shape.
+
+        Args:
+            control_data (dict): The data loaded from a control component file.
+            shape_name (str): The short name of the curve shape.
+            num_cvs (int): The number of CVs of the shape in the scene.
+
+        Returns:
+            np.ndarray: The (num_cvs, 3) object space positions, or None if the file holds
+                no matching positions for the shape.
+        """
+        if shape_name in control_data:
+            points = np.asarray(control_data[shape_name], dtype=np.float64)
+        else:
+            # files from before shapes were saved as arrays hold one entry per CV
+            keys = ['{}.cv[{}]'.format(shape_name, i) for i in range(num_cvs)]
+            if not all(key in control_data for key in keys):
+                return None
+
+            points = np.asarray([control_data[key] for key in keys], dtype=np.float64)
+
+        if len(points) != num_cvs:
+            return None
+
+        return points
+
+
 
 def clean_anim_ctrls(suffix='Ctrl'):
     """
@@ -54,11 +54,11 @@ class Control(BaseObject):
         else:
             if self._shape in self.SHAPES:
                 shape_method = getattr(ControlShapes, self._shape)
-                self._ctrl = DagNodeData(shape_method(self._combined_name))
+                self._ctrl = DagNodeData.get(shape_method(self._combined_name))
             else:
                 raise ValueError(f'Please pick a control shape. Available shapes: {self.SHAPES}')
             
-            self._offset = DagNodeData(cmds.createNode('transform', 
+            self._offset = DagNodeData.get(cmds.createNode('transform', 
                                         name=f'{self._combined_name}_hrc'))
 
             cmds.parent(self._ctrl.dag_path, self._offset.dag_path)
@@ -92,8 +92,8 @@ class Control(BaseObject):
     def from_data(cls, meta_node, data):
         super().from_data(meta_node, data)
         
-        cls.instance.control = DagNodeData(data['control'])
-        cls.instance.offset = DagNodeData(data['offset'])
+        cls.instance.control, cls.instance.offset = DagNodeData.from_many(
+            [data[key] for key in ('control', 'offset')])
         cls.instance.thickness = float(data['thickness'])
         cls.instance.color = data['color']
 
@@ -2,6 +2,8 @@
 import os
 from ngSkinTools2 import api as ngst_api
 
+from rig.deformers.skin_mirror import mirror_globs
+
 class NgSkinData():
 
     def exportNgSkinData(self, node, path):
@@ -18,7 +20,7 @@ class NgSkinData():
         config = ngst_api.InfluenceMappingConfig()
         config.use_distance_matching = True
         config.use_name_matching = False
-        config.globs = [('L_*', 'R_*'), ('*_l_*', '*_r_*')]
+        config.globs = mirror_globs()
 
         # run the import
         ngst_api.import_json(node,
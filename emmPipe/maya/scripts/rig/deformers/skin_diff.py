@@ -0,0 +1,194 @@
+import numpy as np
+
+from rig.deformers.skin_weights import build_influence_map, remap_influences
+from rig.deformers.skin_file import CHUNK_ROWS, SkinFile, shape_entries, iter_weight_blocks
+
+
+def _short_name(name):
+    """
+    Returns a node name without its DAG path.
+
+    Args:
+        name (str): The node name or DAG path.
+
+    Returns:
+        str: The short name.
+    """
+    return name.split('|')[-1]
+
+def diff_shape_weights(file_a, prefix_a, metadata_a, file_b, prefix_b, metadata_b, tolerance=1e-4,
+                       block_vertices=CHUNK_ROWS):
+    """
+    Compares the weights of one shape in two skin files, one block of vertices at a time.
+
+    Both weight matrices are mapped onto the union of their influences by name, so
+    reordered influences do not show up as changes. Only a block of each file is in
+    memory at any time.
+
+    Args:
+        file_a (SkinFile): The old skin file.
+        prefix_a (str): The array name prefix of the shape in the old file.
+        metadata_a (dict): The shape metadata in the old file.
+        file_b (SkinFile): The new skin file.
+        prefix_b (str): The array name prefix of the shape in the new file.
+        metadata_b (dict): The shape metadata in the new file.
+        tolerance (float, optional): The smallest weight delta counted as a change. Defaults to 1e-4.
+        block_vertices (int, optional): The number of vertices compared at once. Defaults to CHUNK_ROWS.
+
+    Returns:
+        dict: The shape report, holding:
+            shape (str): The shape name.
+            num_vertices (tuple): The vertex count of both files.
+            added_influences (list): Influences only in the new file.
+            removed_influences (list): Influences only in the old file.
+            changed_vertices (np.ndarray): The vertices with a delta above the tolerance.
+            vertex_l1 (np.ndarray): The summed absolute delta of every changed vertex.
+            vertex_linf (np.ndarray): The largest absolute delta of every changed vertex.
+            influence_l1 (dict): The summed absolute delta per influence.
+            influence_linf (dict): The largest absolute delta per influence.
+    """
+    names_a = metadata_a['influence_names']
+    names_b = metadata_b['influence_names']
+
+    short_names_a = [_short_name(name) for name in names_a]
+    short_names_b = [_short_name(name) for name in names_b]
+    union = short_names_a + [name for name in short_names_b if name not in short_names_a]
+
+    column_map_a = build_influence_map(names_a, union)
+    column_map_b = build_influence_map(names_b, union)
+
+    num_vertices = (metadata_a['num_vertices'], metadata_b['num_vertices'])
+    num_compared = min(num_vertices)
+
+    influence_l1 = np.zeros(len(union))
+    influence_linf = np.zeros(len(union))
+    changed_vertices = []
+    vertex_l1 = []
+    vertex_linf = []
+
+    blocks_a = iter_weight_blocks(file_a, prefix_a, len(names_a), block_vertices)
+    blocks_b = iter_weight_blocks(file_b, prefix_b, len(names_b), block_vertices)
+    for (start, weights_a), (_, weights_b) in zip(blocks_a, blocks_b):
+        if start >= num_compared:
+            break
+
+        rows = min(len(weights_a), len(weights_b))
+        delta = np.abs(remap_influences(weights_b[:rows], column_map_b, len(union)) -
+                       remap_influences(weights_a[:rows], column_map_a, len(union)))
+
+        np.add(influence_l1, delta.sum(axis=0), out=influence_l1)
+        np.maximum(influence_linf, delta.max(axis=0, initial=0.0), out=influence_linf)
+
+        block_linf = delta.max(axis=1, initial=0.0)
+        changed = np.flatnonzero(block_linf > tolerance)
+        changed_vertices.append(changed + start)
+        vertex_l1.append(delta[changed].sum(axis=1))
+        vertex_linf.append(block_linf[changed])
+
+    return {'shape': metadata_b.get('shape', metadata_a.get('shape')),
+            'num_vertices': num_vertices,
+            'added_influences': [name for name in short_names_b if name not in short_names_a],
+            'removed_influences': [name for name in short_names_a if name not in short_names_b],
+            'changed_vertices': np.concatenate(changed_vertices) if changed_vertices else np.empty(0, dtype=np.int64),
+            'vertex_l1': np.concatenate(vertex_l1) if vertex_l1 else np.empty(0),
+            'vertex_linf': np.concatenate(vertex_linf) if vertex_linf else np.empty(0),
+            'influence_l1': dict(zip(union, influence_l1.tolist())),
+            'influence_linf': dict(zip(union, influence_linf.tolist()))}
+
+def diff_skin_files(path_a, path_b, tolerance=1e-4, block_vertices=CHUNK_ROWS):
+    """
+    Compares two skin files, e.g. the same asset in two deformer component versions.
+
+    Shapes are matched by name, falling back to their order. Only files and NumPy are
+    needed, so this runs without Maya.
+
+    Args:
+        path_a (str): The path of the old skin file.
+        path_b (str): The path of the new skin file.
+        tolerance (float, optional): The smallest weight delta counted as a change. Defaults to 1e-4.
+        block_vertices (int, optional): The number of vertices compared at once. Defaults to CHUNK_ROWS.
+
+    Returns:
+        dict: The report, holding:
+            shapes (list): A report per matched shape, see diff_shape_weights.
+            added_shapes (list): Shapes only in the new file.
+            removed_shapes (list): Shapes only in the old file.
+    """
+    file_a = SkinFile(path_a)
+    file_b = SkinFile(path_b)
+
+    entries_a = shape_entries(file_a)
+    entries_b = shape_entries(file_b)
+
+    names_a = [_short_name(metadata.get('shape', '')) for metadata, _ in entries_a]
+    names_b = [_short_name(metadata.get('shape', '')) for metadata, _ in entries_b]
+
+    report = {'shapes': [], 'added_shapes': [], 'removed_shapes': []}
+    matched_a = set()
+
+    for index_b, (metadata_b, prefix_b) in enumerate(entries_b):
+        if names_b[index_b] in names_a:
+            index_a = names_a.index(names_b[index_b])
+        elif index_b < len(entries_a) and names_a[index_b] not in names_b:
+            index_a = index_b
+        else:
+            report['added_shapes'].append(names_b[index_b])
+            continue
+
+        matched_a.add(index_a)
+        metadata_a, prefix_a = entries_a[index_a]
+        report['shapes'].append(diff_shape_weights(file_a, prefix_a, metadata_a, file_b, prefix_b, metadata_b,
+                                                   tolerance, block_vertices))
+
+    report['removed_shapes'] = [name for index_a, name in enumerate(names_a) if index_a not in matched_a]
+
+    return report
+
+def format_diff_report(report, max_items=10):
+    """
+    Formats a diff report as short text for review.
+
+    Args:
+        report (dict): The report returned by diff_skin_files.
+        max_items (int, optional): The number of worst vertices and influences listed
+            per shape. Defaults to 10.
+
+    Returns:
+        str: The formatted report.
+    """
+    lines = []
+
+    for name in report['added_shapes']:
+        lines.append('+ shape {}'.format(name))
+    for name in report['removed_shapes']:
+        lines.append('- shape {}'.format(name))
+
+    for shape_report in report['shapes']:
+        changed = shape_report['changed_vertices']
+        num_vertices = shape_report['num_vertices']
+
+        lines.append('{}: {} of {} vertices changed'.format(shape_report['shape'], len(changed), num_vertices[1]))
+        if num_vertices[0] != num_vertices[1]:
+            lines.append('  vertex count {} -> {}'.format(*num_vertices))
+
+        for name in shape_report['added_influences']:
+            lines.append('  + influence {}'.format(name))
+        for name in shape_report['removed_influences']:
+            lines.append('  - influence {}'.format(name))
+
+        if not len(changed):
+            continue
+
+        worst = np.argsort(shape_report['vertex_linf'])[::-1][:max_items]
+        lines.append('  worst vertices (index, max delta, summed delta):')
+        for i in worst:
+            lines.append('    {:>8} {:.4f} {:.4f}'.format(int(changed[i]), shape_report['vertex_linf'][i],
+                                                         shape_report['vertex_l1'][i]))
+
+        influences = sorted(shape_report['influence_l1'].items(), key=lambda item: item[1], reverse=True)
+        lines.append('  most changed influences (name, max delta, summed delta):')
+        for name, l1 in influences[:max_items]:
+            if l1 > 0.0:
+                lines.append('    {} {:.4f} {:.4f}'.format(name, shape_report['influence_linf'][name], l1))
+
+    return '\n'.join(lines)
@@ -0,0 +1,281 @@
+import numpy as np
+
+from rig.deformers.skin_file import decode_shape_weights
+
+# skinCluster.skinningMethod values
+CLASSIC_LINEAR = 0
+DUAL_QUATERNION = 1
+WEIGHT_BLENDED = 2
+
+# Upper bound of gathered per-frame, per-vertex values held at once while evaluating
+EVALUATION_BUDGET = 1 << 22
+
+
+def skin_matrices(bind_pre_matrices, world_matrices):
+    """
+    Combines bindPreMatrix values with influence world matrices.
+
+    Maya multiplies row vectors from the left, so a rest point p deforms with influence
+    i as p * bindPreMatrix[i] * worldMatrix[i].
+
+    Args:
+        bind_pre_matrices (np.ndarray): The (num_influences, 4, 4) bindPreMatrix values.
+        world_matrices (np.ndarray): The (num_frames, num_influences, 4, 4) influence world
+            matrices, or (num_influences, 4, 4) for a single frame.
+
+    Returns:
+        np.ndarray: The (num_frames, num_influences, 4, 4) skinning matrices.
+    """
+    world_matrices = np.asarray(world_matrices, dtype=np.float64)
+    if world_matrices.ndim == 3:
+        world_matrices = world_matrices[None]
+
+    return np.matmul(np.asarray(bind_pre_matrices, dtype=np.float64)[None], world_matrices)
+
+def quaternion_multiply(a, b):
+    """
+    Multiplies quaternions stored as (w, x, y, z) along the last axis.
+
+    Args:
+        a (np.ndarray): The left quaternions.
+        b (np.ndarray): The right quaternions.
+
+    Returns:
+        np.ndarray: The products, broadcast over the leading axes.
+    """
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+
+    return np.stack([aw * bw - ax * bx - ay * by - az * bz,
+                     aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw], axis=-1)
+
+def matrices_to_dual_quaternions(matrices):
+    """
+    Converts rigid row-vector transformation matrices into unit dual quaternions.
+
+    Scale and shear in the matrices are not represented.
+
+    Args:
+        matrices (np.ndarray): The (..., 4, 4) matrices.
+
+    Returns:
+        tuple: The (..., 4) real and dual parts, as (w, x, y, z).
+    """
+    # Maya matrices act on row vectors, the column-vector rotation is the transpose
+    rotation = np.swapaxes(matrices[..., :3, :3], -1, -2)
+    translation = matrices[..., 3, :3]
+
+    m00, m01, m02 = rotation[..., 0, 0], rotation[..., 0, 1], rotation[..., 0, 2]
+    m10, m11, m12 = rotation[..., 1, 0], rotation[..., 1, 1], rotation[..., 1, 2]
+    m20, m21, m22 = rotation[..., 2, 0], rotation[..., 2, 1], rotation[..., 2, 2]
+
+    # the four candidate solutions, each accurate where its diagonal term is largest
+    candidates = np.stack([np.stack([1.0 + m00 + m11 + m22, m21 - m12, m02 - m20, m10 - m01], axis=-1),
+                           np.stack([m21 - m12, 1.0 + m00 - m11 - m22, m01 + m10, m02 + m20], axis=-1),
+                           np.stack([m02 - m20, m01 + m10, 1.0 - m00 + m11 - m22, m12 + m21], axis=-1),
+                           np.stack([m10 - m01, m02 + m20, m12 + m21, 1.0 - m00 - m11 + m22], axis=-1)], axis=-2)
+    traces = np.stack([m00 + m11 + m22, m00, m11, m22], axis=-1)
+    best = np.argmax(traces, axis=-1)
+
+    real = np.take_along_axis(candidates, best[..., None, None], axis=-2)[..., 0, :]
+    real /= np.linalg.norm(real, axis=-1, keepdims=True)
+
+    pure_translation = np.concatenate([np.zeros(translation.shape[:-1] + (1,)), translation], axis=-1)
+    dual = 0.5 * quaternion_multiply(pure_translation, real)
+
+    return real, dual
+
+def weight_slots(weights, max_influences=None):
+    """
+    Lists the non-zero weights of every vertex, largest first.
+
+    Args:
+        weights (np.ndarray): The (num_vertices, num_influences) weight matrix.
+        max_influences (int, optional): The number of slots. Defaults to None, which uses
+            the largest number of non-zero weights of any vertex.
+
+    Returns:
+        tuple: The (num_vertices, slots) influence indices and weights.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if max_influences is None:
+        max_influences = max(int(np.count_nonzero(weights, axis=1).max(initial=0)), 1)
+    max_influences = min(max_influences, weights.shape[1])
+
+    order = np.argsort(-weights, axis=1, kind='stable')[:, :max_influences]
+
+    return order, np.take_along_axis(weights, order, axis=1)
+
+def _linear_block(points, indices, values, matrices):
+    """
+    Deforms points with classic linear skinning.
+
+    Args:
+        points (np.ndarray): The (num_vertices, 3) rest points.
+        indices (np.ndarray): The (num_vertices, slots) influence indices.
+        values (np.ndarray): The (num_vertices, slots) weights.
+        matrices (np.ndarray): The (num_frames, num_influences, 4, 4) skinning matrices.
+
+    Returns:
+        np.ndarray: The (num_frames, num_vertices, 3) deformed points.
+    """
+    deformed = np.zeros((matrices.shape[0], len(points), 3))
+
+    for slot in range(indices.shape[1]):
+        slot_matrices = matrices[:, indices[:, slot]]
+        transformed = np.matmul(points[None, :, None, :], slot_matrices[..., :3, :3])[..., 0, :]
+        transformed += slot_matrices[..., 3, :3]
+        deformed += values[None, :, slot, None] * transformed
+
+    return deformed
+
+def _dual_quaternion_block(points, indices, values, real, dual):
+    """
+    Deforms points with dual quaternion skinning.
+
+    Quaternions are flipped into the hemisphere of the vertex's largest influence before
+    blending, so the blend takes the short way around.
+
+    Args:
+        points (np.ndarray): The (num_vertices, 3) rest points.
+        indices (np.ndarray): The (num_vertices, slots) influence indices, largest weight first.
+        values (np.ndarray): The (num_vertices, slots) weights.
+        real (np.ndarray): The (num_frames, num_influences, 4) real parts.
+        dual (np.ndarray): The (num_frames, num_influences, 4) dual parts.
+
+    Returns:
+        np.ndarray: The (num_frames, num_vertices, 3) deformed points.
+    """
+    pivot = real[:, indices[:, 0]]
+    blended_real = np.zeros(pivot.shape)
+    blended_dual = np.zeros(pivot.shape)
+
+    for slot in range(indices.shape[1]):
+        slot_real = real[:, indices[:, slot]]
+        signs = np.where(np.einsum('fvi,fvi->fv', slot_real, pivot) < 0.0, -1.0, 1.0)
+        slot_weights = (signs * values[None, :, slot])[..., None]
+
+        blended_real += slot_weights * slot_real
+        blended_dual += slot_weights * dual[:, indices[:, slot]]
+
+    norms = np.linalg.norm(blended_real, axis=-1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    blended_real /= norms
+    blended_dual /= norms
+
+    # rotate by the real part, then translate by 2 * dual * conjugate(real)
+    conjugate = blended_real * np.array([1.0, -1.0, -1.0, -1.0])
+    pure_points = np.concatenate([np.zeros(points.shape[:-1] + (1,)), points], axis=-1)
+
+    rotated = quaternion_multiply(quaternion_multiply(blended_real, pure_points[None]), conjugate)[..., 1:]
+    translation = 2.0 * quaternion_multiply(blended_dual, conjugate)[..., 1:]
+
+    return rotated + translation
+
+def evaluate_skin(rest_points, weights, bind_pre_matrices, world_matrices, skinning_method=CLASSIC_LINEAR,
+                  blend_weights=None, max_influences=None):
+    """
+    Deforms rest points like a skinCluster, for a batch of poses, without Maya.
+
+    Vertices are evaluated in blocks sized so the gathered per-frame values stay
+    within EVALUATION_BUDGET, every block is vectorized over frames and vertices.
+
+    Args:
+        rest_points (np.ndarray): The (num_vertices, 3) undeformed points.
+        weights (np.ndarray): The (num_vertices, num_influences) weight matrix.
+        bind_pre_matrices (np.ndarray): The (num_influences, 4, 4) bindPreMatrix values.
+        world_matrices (np.ndarray): The (num_frames, num_influences, 4, 4) influence world
+            matrices, or (num_influences, 4, 4) for a single frame.
+        skinning_method (int, optional): CLASSIC_LINEAR, DUAL_QUATERNION or WEIGHT_BLENDED,
+            as stored in skinCluster.skinningMethod. Defaults to CLASSIC_LINEAR.
+        blend_weights (np.ndarray, optional): The per-vertex blend between linear (0) and
+            dual quaternion (1) skinning, used by WEIGHT_BLENDED. Defaults to None.
+        max_influences (int, optional): The number of largest weights evaluated per vertex.
+            Defaults to None, which evaluates every non-zero weight.
+
+    Returns:
+        np.ndarray: The (num_frames, num_vertices, 3) deformed points.
+
+    Raises:
+        ValueError: If the skinning method is unknown, or WEIGHT_BLENDED has no blend weights.
+    """
+    if skinning_method not in (CLASSIC_LINEAR, DUAL_QUATERNION, WEIGHT_BLENDED):
+        raise ValueError('Unknown skinning method {}'.format(skinning_method))
+    if skinning_method == WEIGHT_BLENDED and blend_weights is None:
+        raise ValueError('Weight blended skinning needs blend weights')
+
+    rest_points = np.asarray(rest_points, dtype=np.float64).reshape(-1, 3)
+    matrices = skin_matrices(bind_pre_matrices, world_matrices)
+    indices, values = weight_slots(weights, max_influences)
+
+    if skinning_method != CLASSIC_LINEAR:
+        real, dual = matrices_to_dual_quaternions(matrices)
+
+    num_frames = matrices.shape[0]
+    block_vertices = max(1, EVALUATION_BUDGET // (num_frames * indices.shape[1] * 16))
+
+    deformed = np.empty((num_frames, len(rest_points), 3))
+    for start in range(0, len(rest_points), block_vertices):
+        block = slice(start, start + block_vertices)
+        points, block_indices, block_values = rest_points[block], indices[block], values[block]
+
+        if skinning_method == CLASSIC_LINEAR:
+            deformed[:, block] = _linear_block(points, block_indices, block_values, matrices)
+            continue
+
+        dual_quaternion = _dual_quaternion_block(points, block_indices, block_values, real, dual)
+        if skinning_method == DUAL_QUATERNION:
+            deformed[:, block] = dual_quaternion
+            continue
+
+        linear = _linear_block(points, block_indices, block_values, matrices)
+        blend = np.asarray(blend_weights, dtype=np.float64)[block][None, :, None]
+        deformed[:, block] = linear + blend * (dual_quaternion - linear)
+
+    return deformed
+
+def evaluate_shape_data(data, world_matrices, weights=None, max_influences=None):
+    """
+    Deforms the rest points of saved shape data for a batch of poses.
+
+    The saved skinning method, blend weights and envelope are applied.
+
+    Args:
+        data (dict): The shape data returned by read_skincluster_data.
+        world_matrices (np.ndarray): The (num_frames, num_influences, 4, 4) influence world
+            matrices, in the saved influence order.
+        weights (np.ndarray, optional): Weights to evaluate instead of the saved ones,
+            e.g. from a revision. Defaults to None.
+        max_influences (int, optional): See evaluate_skin. Defaults to None.
+
+    Returns:
+        np.ndarray: The (num_frames, num_vertices, 3) deformed points.
+    """
+    if weights is None:
+        weights = decode_shape_weights(data)
+
+    rest_points = np.asarray(data['rest_points'], dtype=np.float64).reshape(-1, 3)
+    deformed = evaluate_skin(rest_points, weights, data['bind_pre_matrix_values'], world_matrices,
+                             skinning_method=data.get('skinning_method', CLASSIC_LINEAR),
+                             blend_weights=data.get('blend_weights'),
+                             max_influences=max_influences)
+
+    envelope = data.get('envelope', 1.0)
+    if envelope != 1.0:
+        deformed = rest_points + envelope * (deformed - rest_points)
+
+    return deformed
+
+def bind_pose_matrices(data):
+    """
+    Returns the influence world matrices of the bind pose of saved shape data.
+
+    Args:
+        data (dict): The shape data returned by read_skincluster_data.
+
+    Returns:
+        np.ndarray: The (num_influences, 4, 4) inverse bindPreMatrix values.
+    """
+    return np.linalg.inv(np.asarray(data['bind_pre_matrix_values'], dtype=np.float64))
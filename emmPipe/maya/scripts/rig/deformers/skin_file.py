@@ -0,0 +1,942 @@
+import os
+import json
+import gzip
+import pickle
+import struct
+import hashlib
+import tempfile
+
+import numpy as np
+
+from rig.deformers.skin_weights import (dense_to_csr, csr_to_dense, condition_weights, encode_weight_values,
+                                        decode_weight_values, influence_usage, weight_encoding_error)
+
+MAGIC = b'EMMSKIN\x00'
+# 1: arrays in the file, 2: arrays in a chunk store, 3: arrays appended to the file in segments
+FORMAT_VERSION = 3
+FILE_EXTENSION = '.skin'
+ALIGNMENT = 64
+# Rows per chunk when arrays are stored in a chunk store, vertices for per-vertex arrays
+CHUNK_ROWS = 4096
+
+# magic, format version, header offset, header length, data offset
+_PREAMBLE = struct.Struct('<8sI4xQQQ')
+_PREAMBLE_SIZE = 64
+
+
+def _align(offset, alignment=ALIGNMENT):
+    """
+    Rounds an offset up to the next multiple of the alignment.
+
+    Args:
+        offset (int): The offset to align.
+        alignment (int, optional): The alignment in bytes. Defaults to ALIGNMENT.
+
+    Returns:
+        int: The aligned offset.
+    """
+    return (offset + alignment - 1) // alignment * alignment
+
+def _chunk_splits(arrays, chunk_rows):
+    """
+    Works out where every array is split into chunks.
+
+    Arrays are split every chunk_rows rows, so per-vertex arrays split on the same
+    vertex blocks. CSR weights are split on those vertex blocks too: the indices and
+    values at the indptr offsets of the block starts, and indptr itself is stored
+    relative to the first offset of every chunk. Repainting a few vertices then only
+    changes the chunks of their block.
+
+    Args:
+        arrays (dict): Array names mapped to NumPy arrays.
+        chunk_rows (int): The number of rows, or vertices, per chunk.
+
+    Returns:
+        tuple: A dict mapping array names to their split rows, and the set of array
+            names stored relative to the first value of every chunk.
+    """
+    splits = {name: np.arange(chunk_rows, len(array), chunk_rows) if np.ndim(array) else []
+              for name, array in arrays.items()}
+    relative = set()
+
+    for name in arrays:
+        if not name.endswith('weights/indptr'):
+            continue
+
+        prefix = name[:-len('indptr')]
+        indptr = arrays[name]
+        vertex_splits = np.arange(chunk_rows, len(indptr) - 1, chunk_rows)
+
+        splits[name] = vertex_splits
+        splits['{}indices'.format(prefix)] = indptr[vertex_splits]
+        splits['{}values'.format(prefix)] = indptr[vertex_splits]
+        relative.add(name)
+
+    return splits, relative
+
+def write_skin_file(path, metadata, arrays, chunk_store=None, chunk_rows=CHUNK_ROWS):
+    """
+    Writes metadata and raw arrays to a versioned skin container.
+
+    The file starts with a fixed size preamble, followed by a JSON header describing
+    the metadata and the dtype, shape and offset of every array. The arrays follow as
+    raw, 64 byte aligned buffers so they can be opened with np.memmap.
+
+    With a chunk store, the arrays are split into content hashed chunks that are put
+    in the store, and the file only holds the list of chunk hashes. Chunks that are
+    already in the store, e.g. from a previous version, are not written again.
+
+    The file is written next to the target and moved into place once complete, so
+    readers on a shared drive never see a partially written file.
+
+    Args:
+        path (str): The file path to write to.
+        metadata (dict): JSON serializable metadata.
+        arrays (dict): Array names mapped to numeric NumPy arrays.
+        chunk_store (ChunkStore, optional): The store to put the array chunks in.
+            Defaults to None, which stores the arrays in the file.
+        chunk_rows (int, optional): The number of rows, or vertices, per chunk.
+            Defaults to CHUNK_ROWS.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If an array does not have a numeric dtype.
+    """
+    array_table = {}
+    buffers = []
+    offset = 0
+
+    if chunk_store is not None:
+        splits, relative = _chunk_splits(arrays, chunk_rows)
+
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.kind not in 'biuf':
+            raise TypeError('Array {} has unsupported dtype {}'.format(name, array.dtype))
+
+        if chunk_store is not None:
+            array_table[name] = {'dtype': array.dtype.str,
+                                 'shape': list(array.shape),
+                                 'chunks': []}
+
+            for chunk in np.split(array, splits[name]) if array.ndim else [array]:
+                base = int(chunk[0]) if name in relative and len(chunk) else 0
+                array_table[name]['chunks'].append({'digest': chunk_store.put(chunk - base if base else chunk),
+                                                    'rows': len(chunk) if chunk.ndim else 1,
+                                                    'base': base})
+            continue
+
+        offset = _align(offset)
+        array_table[name] = {'dtype': array.dtype.str,
+                             'shape': list(array.shape),
+                             'offset': offset,
+                             'nbytes': array.nbytes}
+        buffers.append((offset, array))
+        offset += array.nbytes
+
+    header = {'metadata': metadata, 'arrays': array_table}
+    if chunk_store is not None:
+        header['chunk_store'] = os.path.relpath(chunk_store.path, os.path.dirname(os.path.abspath(path)))
+
+    header = json.dumps(header).encode('utf-8')
+    data_offset = _align(_PREAMBLE_SIZE + len(header))
+    version = 2 if chunk_store is not None else 1
+
+    temp_path = '{}.tmp'.format(path)
+    with open(temp_path, 'wb') as file_obj:
+        file_obj.write(_PREAMBLE.pack(MAGIC, version, _PREAMBLE_SIZE, len(header), data_offset)
+                       .ljust(_PREAMBLE_SIZE, b'\x00'))
+        file_obj.write(header)
+
+        for array_offset, array in buffers:
+            file_obj.seek(data_offset + array_offset)
+            file_obj.write(array.tobytes())
+
+    os.replace(temp_path, path)
+
+    return
+
+
+class ChunkStore:
+    """
+    A directory of content addressed array chunks shared by several skin files.
+
+    Every chunk is stored once under the hash of its dtype, trailing shape and bytes,
+    so versions that share most of their weights share most of their chunks.
+
+    Properties:
+        path (str): The directory of the store.
+    """
+    def __init__(self, path):
+        """
+        Initializes a new instance of the ChunkStore class.
+
+        Args:
+            path (str): The directory of the store. It is created on the first write.
+        """
+        self._path = path
+
+    #... Public Methods ...#
+    def digest(self, array):
+        """
+        Returns the content hash of an array.
+
+        Args:
+            array (np.ndarray): A contiguous array.
+
+        Returns:
+            str: The hex digest.
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update('{}{}'.format(array.dtype.str, array.shape[1:]).encode('utf-8'))
+        hasher.update(array.tobytes())
+
+        return hasher.hexdigest()
+
+    def chunk_path(self, digest):
+        """
+        Returns the file path of a chunk.
+
+        Args:
+            digest (str): The hex digest of the chunk.
+
+        Returns:
+            str: The path of the chunk file.
+        """
+        return os.path.join(self._path, digest[:2], digest)
+
+    def has(self, digest):
+        """
+        Checks if a chunk is in the store.
+
+        Args:
+            digest (str): The hex digest of the chunk.
+
+        Returns:
+            bool: True if the chunk exists.
+        """
+        return os.path.exists(self.chunk_path(digest))
+
+    def put(self, array):
+        """
+        Adds an array chunk to the store, unless an identical chunk is already stored.
+
+        Args:
+            array (np.ndarray): The chunk to store.
+
+        Returns:
+            str: The hex digest of the chunk.
+        """
+        array = np.ascontiguousarray(array)
+        digest = self.digest(array)
+
+        chunk_path = self.chunk_path(digest)
+        if os.path.exists(chunk_path):
+            return digest
+
+        os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+
+        file_handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(chunk_path), suffix='.tmp')
+        with os.fdopen(file_handle, 'wb') as file_obj:
+            file_obj.write(array.tobytes())
+
+        os.replace(temp_path, chunk_path)
+
+        return digest
+
+    def get(self, digest, dtype, shape):
+        """
+        Reads an array chunk from the store.
+
+        Args:
+            digest (str): The hex digest of the chunk.
+            dtype (np.dtype): The dtype of the chunk.
+            shape (tuple): The shape of the chunk.
+
+        Returns:
+            np.ndarray: The chunk.
+
+        Raises:
+            KeyError: If the chunk is not in the store.
+        """
+        chunk_path = self.chunk_path(digest)
+        if not os.path.exists(chunk_path):
+            raise KeyError('Chunk {} is missing from {}'.format(digest, self._path))
+
+        return np.fromfile(chunk_path, dtype=dtype).reshape(shape)
+
+    #... Properties ...#
+    @property
+    def path(self):
+        return self._path
+
+
+class SkinFileWriter:
+    """
+    Writes a skin container incrementally, so arrays never have to be in memory whole.
+
+    Arrays are appended block by block as they are produced. Without a chunk store every
+    block is written to the file as a raw, aligned segment, with a chunk store it is put
+    in the store like write_skin_file does. The JSON header is written after the data
+    once the sizes of all arrays are known, and the preamble at the start of the file is
+    patched to point at it.
+
+    Like write_skin_file, the file is written next to the target and only moved into
+    place by close.
+
+    Properties:
+        path (str): The path of the file being written.
+    """
+    def __init__(self, path, chunk_store=None, chunk_rows=CHUNK_ROWS):
+        """
+        Initializes a new instance of the SkinFileWriter class.
+
+        Args:
+            path (str): The file path to write to.
+            chunk_store (ChunkStore, optional): The store to put the array chunks in.
+                Defaults to None, which stores the arrays in the file.
+            chunk_rows (int, optional): The number of rows per chunk of arrays written
+                whole with write_array. Defaults to CHUNK_ROWS.
+        """
+        self._path = path
+        self._chunk_store = chunk_store
+        self._chunk_rows = chunk_rows
+        self._arrays = {}
+        self._weight_offsets = {}
+
+        self._temp_path = '{}.tmp'.format(path)
+        self._file_obj = open(self._temp_path, 'wb')
+        self._file_obj.write(b'\x00' * _PREAMBLE_SIZE)
+        self._offset = 0
+
+    #... Public Methods ...#
+    def write_array(self, name, array):
+        """
+        Writes a whole array. Scalars are stored as one element arrays.
+
+        Args:
+            name (str): The name of the array.
+            array (np.ndarray): The numeric array.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the array does not have a numeric dtype.
+        """
+        array = np.ascontiguousarray(array)
+        if not array.ndim:
+            array = array.reshape(1)
+
+        self.append_rows(name, array[:0])
+        for start in range(0, len(array), self._chunk_rows):
+            self.append_rows(name, array[start:start + self._chunk_rows])
+
+    def append_rows(self, name, rows, base=0):
+        """
+        Appends rows to an array, creating the array on the first call.
+
+        Args:
+            name (str): The name of the array.
+            rows (np.ndarray): The rows to append. Their dtype and trailing shape must
+                match the rows appended before.
+            base (int, optional): A value added to the rows when they are read, so offsets
+                can be stored relative to the block they belong to. Defaults to 0.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the rows do not have a numeric dtype or do not match the array.
+        """
+        rows = np.ascontiguousarray(rows)
+        if rows.dtype.kind not in 'biuf':
+            raise TypeError('Array {} has unsupported dtype {}'.format(name, rows.dtype))
+
+        info = self._arrays.setdefault(name, {'dtype': rows.dtype.str,
+                                              'shape': [0] + list(rows.shape[1:]),
+                                              'chunks': []})
+        if info['dtype'] != rows.dtype.str or info['shape'][1:] != list(rows.shape[1:]):
+            raise TypeError('Rows of {} do not match its dtype {} and shape {}'
+                            .format(name, info['dtype'], info['shape']))
+
+        if not len(rows):
+            return
+
+        if self._chunk_store is not None:
+            info['chunks'].append({'digest': self._chunk_store.put(rows), 'rows': len(rows), 'base': int(base)})
+        else:
+            self._offset = _align(self._offset)
+            self._file_obj.seek(_PREAMBLE_SIZE + self._offset)
+            self._file_obj.write(rows.tobytes())
+
+            info['chunks'].append({'offset': self._offset, 'rows': len(rows), 'base': int(base)})
+            self._offset += rows.nbytes
+
+        info['shape'][0] += len(rows)
+
+    def append_weight_block(self, prefix, indptr, indices, values):
+        """
+        Appends the CSR weights of a block of vertices.
+
+        The row pointers of every block start at zero and are stored relative to the
+        weights written before, so blocks line up with the chunks of write_skin_file.
+
+        Args:
+            prefix (str): The array name prefix of the shape, see shape_entries.
+            indptr (np.ndarray): The row pointers of the block, starting at 0.
+            indices (np.ndarray): The influence indices of the block.
+            values (np.ndarray): The encoded weight values of the block.
+
+        Returns:
+            None
+        """
+        offset = self._weight_offsets.get(prefix, 0)
+
+        self.append_rows('{}weights/indptr'.format(prefix), indptr[:-1], base=offset)
+        self.append_rows('{}weights/indices'.format(prefix), indices)
+        self.append_rows('{}weights/values'.format(prefix), values)
+
+        self._weight_offsets[prefix] = offset + int(indptr[-1])
+
+    def close(self, metadata):
+        """
+        Writes the header and moves the finished file into place.
+
+        Args:
+            metadata (dict): JSON serializable metadata.
+
+        Returns:
+            str: The path of the written file.
+        """
+        try:
+            # the closing row pointer of every shape
+            for prefix, offset in self._weight_offsets.items():
+                name = '{}weights/indptr'.format(prefix)
+                self.append_rows(name, np.zeros(1, dtype=self._arrays[name]['dtype']), base=offset)
+
+            header = {'metadata': metadata, 'arrays': self._arrays}
+            if self._chunk_store is not None:
+                header['chunk_store'] = os.path.relpath(self._chunk_store.path,
+                                                        os.path.dirname(os.path.abspath(self._path)))
+            header = json.dumps(header).encode('utf-8')
+
+            header_offset = _align(_PREAMBLE_SIZE + self._offset)
+            version = 2 if self._chunk_store is not None else FORMAT_VERSION
+
+            self._file_obj.seek(header_offset)
+            self._file_obj.write(header)
+
+            self._file_obj.seek(0)
+            self._file_obj.write(_PREAMBLE.pack(MAGIC, version, header_offset, len(header), _PREAMBLE_SIZE))
+        finally:
+            self._file_obj.close()
+
+        os.replace(self._temp_path, self._path)
+
+        return self._path
+
+    def discard(self):
+        """
+        Stops writing and removes the partially written file.
+
+        Returns:
+            None
+        """
+        self._file_obj.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+    #... Properties ...#
+    @property
+    def path(self):
+        return self._path
+
+
+class SkinFile:
+    """
+    Read access to a skin container written by write_skin_file or SkinFileWriter.
+
+    Opening a file only reads the preamble and the JSON header, so metadata queries
+    are cheap regardless of the size of the stored arrays. Arrays are memory mapped
+    on request and only the pages that are touched are read from disk. Arrays that
+    were written to a chunk store, or appended to the file in segments, are assembled
+    from their chunks.
+
+    Properties:
+        path (str): The path of the file.
+        version (int): The format version the file was written with.
+        metadata (dict): The metadata stored in the header.
+        array_names (list): The names of all stored arrays.
+        chunk_store (ChunkStore): The store holding the array chunks, or None.
+
+    Raises:
+        ValueError: If the file is not a skin container or was written by a newer version.
+    """
+    def __init__(self, path):
+        """
+        Initializes a new instance of the SkinFile class.
+
+        Args:
+            path (str): The path of the skin container.
+        """
+        self._path = path
+
+        with open(path, 'rb') as file_obj:
+            preamble = file_obj.read(_PREAMBLE_SIZE)
+            if len(preamble) < _PREAMBLE.size or preamble[:len(MAGIC)] != MAGIC:
+                raise ValueError('{} is not a skin file'.format(path))
+
+            _, self._version, header_offset, header_length, self._data_offset = _PREAMBLE.unpack_from(preamble)
+            if self._version > FORMAT_VERSION:
+                raise ValueError('{} was written with format version {}, only up to {} is supported'
+                                 .format(path, self._version, FORMAT_VERSION))
+
+            file_obj.seek(header_offset)
+            header = json.loads(file_obj.read(header_length).decode('utf-8'))
+
+        self._metadata = header['metadata']
+        self._arrays = header['arrays']
+
+        self._chunk_store = None
+        if 'chunk_store' in header:
+            self._chunk_store = ChunkStore(os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(path)),
+                                                                         header['chunk_store'])))
+
+    #... Public Methods ...#
+    def has_array(self, name):
+        """
+        Checks if an array is stored in the file.
+
+        Args:
+            name (str): The name of the array.
+
+        Returns:
+            bool: True if the array exists.
+        """
+        return name in self._arrays
+
+    def array(self, name, mmap=True):
+        """
+        Returns a stored array.
+
+        Args:
+            name (str): The name of the array.
+            mmap (bool, optional): If True, returns a read-only memory map instead of
+                reading the array into memory. Defaults to True.
+
+        Returns:
+            np.ndarray: The stored array.
+
+        Raises:
+            KeyError: If the array does not exist.
+        """
+        if name not in self._arrays:
+            raise KeyError('{} has no array named {}'.format(self._path, name))
+
+        info = self._arrays[name]
+        dtype = np.dtype(info['dtype'])
+        shape = tuple(info['shape'])
+
+        if 'chunks' in info:
+            return self._read_chunks(info['chunks'], dtype, shape, 0, shape[0] if shape else 0)
+
+        offset = self._data_offset + info['offset']
+
+        if not info['nbytes']:
+            return np.empty(shape, dtype=dtype)
+
+        if mmap:
+            return np.memmap(self._path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+        with open(self._path, 'rb') as file_obj:
+            file_obj.seek(offset)
+            return np.fromfile(file_obj, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+    def read_rows(self, name, start, stop):
+        """
+        Reads a range of rows of a stored array into memory.
+
+        Only the pages, or for chunked arrays the chunks, overlapping the range are read,
+        so large arrays can be processed block by block in bounded memory.
+
+        Args:
+            name (str): The name of the array.
+            start (int): The first row to read.
+            stop (int): The row to stop before. Clamped to the number of rows.
+
+        Returns:
+            np.ndarray: The rows, as an array of their own.
+
+        Raises:
+            KeyError: If the array does not exist.
+        """
+        if name not in self._arrays:
+            raise KeyError('{} has no array named {}'.format(self._path, name))
+
+        info = self._arrays[name]
+        shape = tuple(info['shape'])
+        stop = min(stop, shape[0])
+        start = min(start, stop)
+
+        if 'chunks' in info:
+            return self._read_chunks(info['chunks'], np.dtype(info['dtype']), shape, start, stop)
+
+        return np.array(self.array(name)[start:stop])
+
+    #... Private Methods ...#
+    def _read_chunks(self, chunks, dtype, shape, start, stop):
+        """
+        Assembles rows of an array from its chunks in the chunk store or its segments in the file.
+
+        Args:
+            chunks (list): The digest or file offset, row count and base value of every chunk.
+            dtype (np.dtype): The dtype of the array.
+            shape (tuple): The shape of the whole array.
+            start (int): The first row to read.
+            stop (int): The row to stop before.
+
+        Returns:
+            np.ndarray: The assembled rows.
+        """
+        if not shape:
+            return self._chunk_store.get(chunks[0]['digest'], dtype, shape)
+
+        array = np.empty((stop - start,) + shape[1:], dtype=dtype)
+
+        row = 0
+        for chunk in chunks:
+            end = row + chunk['rows']
+            if end > start and row < stop:
+                if 'digest' in chunk:
+                    values = self._chunk_store.get(chunk['digest'], dtype, (chunk['rows'],) + shape[1:])
+                else:
+                    values = np.memmap(self._path, dtype=dtype, mode='r', offset=self._data_offset + chunk['offset'],
+                                       shape=(chunk['rows'],) + shape[1:])
+                rows = array[max(row, start) - start:min(end, stop) - start]
+                rows[:] = values[max(row, start) - row:min(end, stop) - row]
+                if chunk['base']:
+                    rows += chunk['base']
+
+            row = end
+
+        return array
+
+    #... Properties ...#
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def metadata(self):
+        return self._metadata
+
+    @property
+    def array_names(self):
+        return list(self._arrays)
+
+    @property
+    def chunk_store(self):
+        return self._chunk_store
+
+
+def shape_entries(skin_file):
+    """
+    Returns the metadata and array name prefix of every shape stored in a skin file.
+
+    Args:
+        skin_file (SkinFile): The open skin file.
+
+    Returns:
+        list: A (shape metadata, prefix) tuple per shape. Files from before multi shape
+            support hold a single shape with an empty prefix.
+    """
+    if 'shapes' in skin_file.metadata:
+        return [(shape_metadata, '{}/'.format(shape_index))
+                for shape_index, shape_metadata in enumerate(skin_file.metadata['shapes'])]
+
+    return [(skin_file.metadata, '')]
+
+def iter_weight_blocks(skin_file, prefix, num_influences, block_vertices=CHUNK_ROWS):
+    """
+    Decodes the stored weights of a shape one block of vertices at a time.
+
+    Args:
+        skin_file (SkinFile): The open skin file.
+        prefix (str): The array name prefix of the shape, see shape_entries.
+        num_influences (int): The number of influence columns.
+        block_vertices (int, optional): The number of vertices per block. Defaults to CHUNK_ROWS.
+
+    Yields:
+        tuple: The first vertex index and the dense (block_vertices, num_influences)
+            weights of every block.
+    """
+    num_vertices = skin_file.array('{}weights/indptr'.format(prefix)).shape[0] - 1
+
+    for start in range(0, num_vertices, block_vertices):
+        yield start, read_weight_rows(skin_file, prefix, num_influences, start, start + block_vertices)
+
+def read_weight_rows(skin_file, prefix, num_influences, start, stop):
+    """
+    Decodes the stored weights of a range of vertices.
+
+    Args:
+        skin_file (SkinFile): The open skin file.
+        prefix (str): The array name prefix of the shape, see shape_entries.
+        num_influences (int): The number of influence columns.
+        start (int): The first vertex.
+        stop (int): The vertex to stop before.
+
+    Returns:
+        np.ndarray: The dense (stop - start, num_influences) weights.
+    """
+    indptr = skin_file.read_rows('{}weights/indptr'.format(prefix), start, stop + 1)
+    indices = skin_file.read_rows('{}weights/indices'.format(prefix), indptr[0], indptr[-1])
+    values = skin_file.read_rows('{}weights/values'.format(prefix), indptr[0], indptr[-1])
+
+    indptr = indptr - indptr[0]
+
+    return csr_to_dense(indptr, indices, decode_weight_values(indptr, values), num_influences)
+
+def _group_by_block(indices, block_rows):
+    """
+    Groups row indices by the block of rows they fall in.
+
+    Args:
+        indices (np.ndarray): The row indices.
+        block_rows (int): The number of rows per block.
+
+    Yields:
+        tuple: The first row of every touched block and the positions in indices of
+            the rows inside it.
+    """
+    blocks = indices // block_rows
+    order = np.argsort(blocks, kind='stable')
+    unique_blocks, starts = np.unique(blocks[order], return_index=True)
+
+    for block, positions in zip(unique_blocks, np.split(order, starts[1:])):
+        yield int(block) * block_rows, positions
+
+def read_row_subset(skin_file, name, indices, block_rows=CHUNK_ROWS):
+    """
+    Reads selected rows of a stored array, e.g. the blend weights of some vertices.
+
+    Rows are read a block at a time, so only the blocks containing selected rows are
+    read from disk.
+
+    Args:
+        skin_file (SkinFile): The open skin file.
+        name (str): The name of the array.
+        indices (np.ndarray): The rows to read.
+        block_rows (int, optional): The number of rows per block. Defaults to CHUNK_ROWS.
+
+    Returns:
+        np.ndarray: The selected rows, in the order of indices.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+
+    block = skin_file.read_rows(name, 0, 0)
+    subset = np.empty((len(indices),) + block.shape[1:], dtype=block.dtype)
+    for start, positions in _group_by_block(indices, block_rows):
+        subset[positions] = skin_file.read_rows(name, start, start + block_rows)[indices[positions] - start]
+
+    return subset
+
+def read_weight_subset(skin_file, prefix, num_influences, indices, block_vertices=CHUNK_ROWS):
+    """
+    Decodes the stored weights of selected vertices.
+
+    The row pointers of a block locate its weights, and for chunked files the chunk
+    table locates the block, so only the blocks containing selected vertices are read.
+
+    Args:
+        skin_file (SkinFile): The open skin file.
+        prefix (str): The array name prefix of the shape, see shape_entries.
+        num_influences (int): The number of influence columns.
+        indices (np.ndarray): The vertices to decode.
+        block_vertices (int, optional): The number of vertices per block. Defaults to CHUNK_ROWS.
+
+    Returns:
+        np.ndarray: The dense (len(indices), num_influences) weights, in the order of indices.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+
+    subset = np.empty((len(indices), num_influences), dtype=np.float64)
+    for start, positions in _group_by_block(indices, block_vertices):
+        weights = read_weight_rows(skin_file, prefix, num_influences, start, start + block_vertices)
+        subset[positions] = weights[indices[positions] - start]
+
+    return subset
+
+def read_skincluster_data(full_path, allow_pickle=False):
+    """
+    Reads saved skincluster data, one dictionary per skinned shape.
+
+    Skin container files are memory mapped, so only the arrays that are used are read
+    from disk. Older .pckl.gzip files are only read when allow_pickle is True, since
+    unpickling files from a shared drive can execute arbitrary code.
+
+    Args:
+        full_path (str): The path of the saved file.
+        allow_pickle (bool, optional): Whether to read legacy pickle files. Defaults to False.
+
+    Returns:
+        list: The skin attributes and stored arrays of every shape. Use
+            decode_shape_weights to expand the weights.
+
+    Raises:
+        ValueError: If the file is a pickle file and allow_pickle is False.
+    """
+    if full_path.endswith(FILE_EXTENSION):
+        skin_file = SkinFile(full_path)
+
+        shapes_data = []
+        for shape_metadata, prefix in shape_entries(skin_file):
+            data = dict(shape_metadata)
+            for name in skin_file.array_names:
+                if name.startswith(prefix) and (prefix or not name[0].isdigit()):
+                    data[name[len(prefix):]] = skin_file.array(name)
+
+            shapes_data.append(data)
+
+        return shapes_data
+
+    if not allow_pickle:
+        raise ValueError('{} is a pickle file, pass allow_pickle=True to load it'.format(full_path))
+
+    with gzip.open(full_path, 'rb') as file_obj:
+        data = pickle.load(file_obj)
+
+    if data.get('format') == 'csr':
+        for name in ('indptr', 'indices', 'values'):
+            data['weights/{}'.format(name)] = data.pop('weights_{}'.format(name))
+
+    return [data]
+
+def decode_shape_weights(data):
+    """
+    Expands the stored weights of a shape into a dense weight matrix.
+
+    Args:
+        data (dict): The shape data returned by read_skincluster_data.
+
+    Returns:
+        np.ndarray: The (num_vertices, num_influences) weight matrix.
+    """
+    if 'weights/indptr' in data:
+        indptr = data['weights/indptr']
+        return csr_to_dense(indptr, data['weights/indices'], decode_weight_values(indptr, data['weights/values']),
+                            data['num_influences'])
+
+    return np.asarray(data['weights'], dtype=np.float64).reshape(-1, len(data['influence_names']))
+
+def decode_shape_weight_rows(data, start, stop):
+    """
+    Expands the stored weights of a range of vertices of a shape into a dense block.
+
+    Only the stored values of those vertices are read, so memory mapped shape data is
+    never expanded as a whole.
+
+    Args:
+        data (dict): The shape data returned by read_skincluster_data.
+        start (int): The first vertex.
+        stop (int): The vertex to stop before.
+
+    Returns:
+        np.ndarray: The dense (stop - start, num_influences) weights, fewer rows at the
+            end of the shape.
+    """
+    if 'weights/indptr' in data:
+        indptr = np.asarray(data['weights/indptr'][start:stop + 1])
+        first, last = int(indptr[0]), int(indptr[-1])
+        indptr = indptr - first
+
+        values = decode_weight_values(indptr, data['weights/values'][first:last])
+        return csr_to_dense(indptr, data['weights/indices'][first:last], values, data['num_influences'])
+
+    weights = np.asarray(data['weights'], dtype=np.float64)
+
+    return weights.reshape(-1, len(data['influence_names']))[start:stop]
+
+# Per-influence entries of shape data, in influence column order
+INFLUENCE_KEYS = ('influence_names', 'influence_paths', 'influence_indices', 'bind_pre_matrix_values',
+                  'influence_max_weights')
+
+def select_shape_influences(data, columns):
+    """
+    Keeps only some influences of shape data.
+
+    Args:
+        data (dict): The shape data returned by read_skincluster_data.
+        columns (np.ndarray): The influence columns to keep.
+
+    Returns:
+        dict: A copy of the shape data with only the kept influences. Stored weights
+            are left out, pass the weights through weights[:, columns].
+    """
+    columns = np.asarray(columns, dtype=np.intp)
+
+    selected = {key: value for key, value in data.items() if not key.startswith('weights')}
+    for key in INFLUENCE_KEYS:
+        if data.get(key) is None:
+            continue
+
+        if isinstance(data[key], np.ndarray):
+            selected[key] = data[key][columns]
+        else:
+            selected[key] = [data[key][column] for column in columns]
+
+    selected['num_influences'] = len(columns)
+
+    return selected
+
+def condition_skin_file(full_path, prune_threshold=0.0, max_influences=None, output_path=None):
+    """
+    Prunes, limits and normalizes the weights stored in a skin file, without Maya.
+
+    The influence_max_weights and weights_max_error entries of every shape are
+    recomputed from the rewritten weights.
+
+    Args:
+        full_path (str): The path of the skin file.
+        prune_threshold (float, optional): Weights below this value are dropped. Defaults to 0.0.
+        max_influences (int, optional): The number of influences kept per vertex.
+            Defaults to None, which keeps all influences.
+        output_path (str, optional): Where to write the result. Defaults to None, which
+            replaces the file.
+
+    Returns:
+        str: The path of the written file.
+    """
+    skin_file = SkinFile(full_path)
+    metadata = skin_file.metadata
+
+    # Read everything into memory, the source may be replaced by the output
+    arrays = {name: skin_file.array(name, mmap=False) for name in skin_file.array_names}
+
+    for shape_metadata, prefix in shape_entries(skin_file):
+        indptr, indices, values = ['{}weights/{}'.format(prefix, name) for name in ('indptr', 'indices', 'values')]
+        num_influences = shape_metadata['num_influences']
+
+        weights = csr_to_dense(arrays[indptr], arrays[indices],
+                               decode_weight_values(arrays[indptr], arrays[values]), num_influences)
+        weights = condition_weights(weights, prune_threshold, max_influences)
+
+        arrays[indptr], arrays[indices], arrays[values] = dense_to_csr(weights, dtype=np.float64)
+
+        encoding = shape_metadata.get('weights_encoding', 'float32')
+        shape_metadata['weights_max_error'] = weight_encoding_error(arrays[indptr], arrays[values], encoding)
+        shape_metadata['influence_max_weights'] = influence_usage(weights)[0].tolist()
+
+        arrays[values] = encode_weight_values(arrays[indptr], arrays[values], encoding)
+
+    output_path = output_path or full_path
+    write_skin_file(output_path, metadata, arrays, chunk_store=skin_file.chunk_store)
+
+    return output_path
@@ -0,0 +1,130 @@
+import numpy as np
+
+from rig.deformers.skin_weights import remap_influences
+from rig.deformers.skin_transfer import UniformGrid
+
+# Name tokens swapped when mirroring, as used by Control and Joints names, e.g. arm_l_upper_001
+SIDE_TOKENS = (('l', 'r'), ('L', 'R'))
+MIRROR_AXES = {'x': 0, 'y': 1, 'z': 2}
+
+
+def mirror_name(name, side_tokens=SIDE_TOKENS):
+    """
+    Returns the name of the opposite side counterpart of a node.
+
+    Names are split on underscores and every token matching a side token is swapped,
+    so 'arm_l_upper_001' becomes 'arm_r_upper_001' and 'L_eye' becomes 'R_eye'. DAG
+    paths are mirrored per path element.
+
+    Args:
+        name (str): The node name or DAG path.
+        side_tokens (tuple, optional): Pairs of opposite side tokens. Defaults to SIDE_TOKENS.
+
+    Returns:
+        str: The mirrored name, or the name itself for center nodes.
+    """
+    swap = {}
+    for left, right in side_tokens:
+        swap[left] = right
+        swap[right] = left
+
+    return '|'.join('_'.join(swap.get(token, token) for token in element.split('_'))
+                    for element in name.split('|'))
+
+def mirror_globs(side_tokens=SIDE_TOKENS):
+    """
+    Returns wildcard pairs matching the side tokens, e.g. for ngSkinTools influence mapping.
+
+    Args:
+        side_tokens (tuple, optional): Pairs of opposite side tokens. Defaults to SIDE_TOKENS.
+
+    Returns:
+        list: (left, right) wildcard pairs for prefix, infix and suffix tokens.
+    """
+    globs = []
+    for left, right in side_tokens:
+        globs.extend([('{}_*'.format(left), '{}_*'.format(right)),
+                      ('*_{}_*'.format(left), '*_{}_*'.format(right)),
+                      ('*_{}'.format(left), '*_{}'.format(right))])
+
+    return globs
+
+def build_mirror_influence_map(influence_names, side_tokens=SIDE_TOKENS):
+    """
+    Maps every influence column to the column of its opposite side counterpart.
+
+    Args:
+        influence_names (list): The influence names in column order.
+        side_tokens (tuple, optional): Pairs of opposite side tokens. Defaults to SIDE_TOKENS.
+
+    Returns:
+        np.ndarray: The mirrored column of every column. Center influences and influences
+            without a bound counterpart map to themselves.
+    """
+    columns = {name.split('|')[-1]: column for column, name in enumerate(influence_names)}
+
+    column_map = np.arange(len(influence_names), dtype=np.intp)
+    for column, name in enumerate(influence_names):
+        column_map[column] = columns.get(mirror_name(name.split('|')[-1], side_tokens), column)
+
+    return column_map
+
+def find_mirror_vertices(points, axis='x', tolerance=1e-3):
+    """
+    Finds the vertex at the mirrored position of every vertex.
+
+    The points are indexed once in a uniform grid, which is then queried with all
+    reflected positions at once.
+
+    Args:
+        points (np.ndarray): The (num_vertices, 3) object space points.
+        axis (str, optional): The axis the mirror plane is normal to. Defaults to 'x'.
+        tolerance (float, optional): The maximum distance between a reflected position
+            and its counterpart. Defaults to 1e-3.
+
+    Returns:
+        np.ndarray: The index of the mirrored vertex of every vertex, or -1 if no vertex
+            lies within the tolerance.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+    reflected = points.copy()
+    reflected[:, MIRROR_AXES[axis]] *= -1.0
+
+    distances, indices = UniformGrid(points).query(reflected)
+    indices[distances > tolerance] = -1
+
+    return indices
+
+def mirror_weights(weights, points, influence_names, axis='x', direction=1, side_tokens=SIDE_TOKENS,
+                   tolerance=1e-3):
+    """
+    Copies the weights of one side of a shape onto the other side.
+
+    Args:
+        weights (np.ndarray): The (num_vertices, num_influences) weight matrix.
+        points (np.ndarray): The (num_vertices, 3) object space points.
+        influence_names (list): The influence names in column order.
+        axis (str, optional): The axis the mirror plane is normal to. Defaults to 'x'.
+        direction (int, optional): 1 copies the positive side onto the negative side,
+            -1 the negative side onto the positive side. Defaults to 1.
+        side_tokens (tuple, optional): Pairs of opposite side tokens. Defaults to SIDE_TOKENS.
+        tolerance (float, optional): See find_mirror_vertices. Defaults to 1e-3.
+
+    Returns:
+        tuple: The indices of the destination vertices, their mirrored weights, and the
+            indices of destination vertices without a counterpart, which are left out.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    weights = np.asarray(weights)
+
+    mirror_indices = find_mirror_vertices(points, axis, tolerance)
+    column_map = build_mirror_influence_map(influence_names, side_tokens)
+
+    destination = np.flatnonzero(points[:, MIRROR_AXES[axis]] * direction < -tolerance)
+    sources = mirror_indices[destination]
+
+    matched = sources >= 0
+    mirrored = remap_influences(weights[sources[matched]], column_map, weights.shape[1])
+
+    return destination[matched], mirrored, destination[~matched]
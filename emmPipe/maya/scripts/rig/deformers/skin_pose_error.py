@@ -0,0 +1,243 @@
+import numpy as np
+
+from rig.deformers.skin_weights import build_influence_map, remap_influences
+from rig.deformers.skin_file import read_skincluster_data, decode_shape_weight_rows
+from rig.deformers.skin_eval import EVALUATION_BUDGET, CLASSIC_LINEAR, evaluate_skin
+from rig.deformers.skin_diff import _short_name
+
+
+def _shape_weight_stats(data):
+    """
+    Returns the vertex count, the most weights on one vertex and the used influences of shape data.
+
+    Stored weights are only scanned, never expanded.
+
+    Args:
+        data (dict): The shape data returned by read_skincluster_data or capture_shape_data.
+
+    Returns:
+        tuple: The number of vertices, the largest number of weights on a vertex and a
+            boolean array of the influence columns with weight on any vertex.
+    """
+    if 'weights/indptr' in data:
+        indptr = np.asarray(data['weights/indptr'])
+        used = np.bincount(np.asarray(data['weights/indices'], dtype=np.intp), minlength=data['num_influences']) > 0
+
+        return len(indptr) - 1, int(np.diff(indptr).max(initial=0)), used
+
+    weights = np.asarray(data['weights'], dtype=np.float64).reshape(-1, len(data['influence_names']))
+
+    return len(weights), int(np.count_nonzero(weights, axis=1).max(initial=0)), weights.any(axis=0)
+
+def _block_errors(rest_points, read_weights_a, read_weights_b, num_slots, bind_pre_matrices, world_matrices,
+                  skinning_method, blend_weights, envelope, block_vertices):
+    """
+    Accumulates the error report of pose_error, reading the weights one vertex block at a time.
+
+    Args:
+        rest_points (np.ndarray): The (num_vertices, 3) undeformed points.
+        read_weights_a (callable): Returns the dense reference weights of a (start, stop) vertex range.
+        read_weights_b (callable): Returns the dense compared weights of a vertex range, in
+            the influence order of the reference.
+        num_slots (int): The largest number of weights on one vertex, used to size blocks.
+        bind_pre_matrices (np.ndarray): The (num_influences, 4, 4) bindPreMatrix values.
+        world_matrices (np.ndarray): The influence world matrices, one set per pose.
+        skinning_method (int): See skin_eval.evaluate_skin.
+        blend_weights (np.ndarray): See skin_eval.evaluate_skin.
+        envelope (float): The skincluster envelope, see pose_error.
+        block_vertices (int): The number of vertices evaluated at once, or None.
+
+    Returns:
+        dict: The error report, see pose_error.
+    """
+    rest_points = np.asarray(rest_points, dtype=np.float64).reshape(-1, 3)
+    world_matrices = np.asarray(world_matrices, dtype=np.float64)
+    if world_matrices.ndim == 3:
+        world_matrices = world_matrices[None]
+
+    num_vertices = len(rest_points)
+    num_poses = world_matrices.shape[0]
+
+    if block_vertices is None:
+        block_vertices = max(1, EVALUATION_BUDGET // (num_poses * max(num_slots, 1) * 16))
+
+    vertex_max = np.zeros(num_vertices)
+    vertex_rms = np.zeros(num_vertices)
+    pose_max = np.zeros(num_poses)
+    pose_sum = np.zeros(num_poses)
+    pose_worst_vertex = np.zeros(num_poses, dtype=np.int64)
+
+    for start in range(0, num_vertices, block_vertices):
+        stop = min(start + block_vertices, num_vertices)
+        block = slice(start, stop)
+        block_blend = None if blend_weights is None else np.asarray(blend_weights)[block]
+
+        deformed_a = evaluate_skin(rest_points[block], read_weights_a(start, stop), bind_pre_matrices,
+                                   world_matrices, skinning_method, block_blend)
+        deformed_b = evaluate_skin(rest_points[block], read_weights_b(start, stop), bind_pre_matrices,
+                                   world_matrices, skinning_method, block_blend)
+
+        # (num_poses, block) distances between both deformations. The envelope blends
+        # both sides towards the same rest points, so it scales their difference.
+        distances = np.linalg.norm(envelope * (deformed_b - deformed_a), axis=-1)
+
+        vertex_max[block] = distances.max(axis=0)
+        vertex_rms[block] = np.sqrt(np.mean(distances * distances, axis=0))
+
+        block_worst = distances.argmax(axis=1)
+        block_max = distances[np.arange(num_poses), block_worst]
+        improved = block_max > pose_max
+        pose_max[improved] = block_max[improved]
+        pose_worst_vertex[improved] = block_worst[improved] + start
+        pose_sum += distances.sum(axis=1)
+
+    return {'vertex_max': vertex_max,
+            'vertex_rms': vertex_rms,
+            'pose_max': pose_max,
+            'pose_mean': pose_sum / max(num_vertices, 1),
+            'pose_worst_vertex': pose_worst_vertex}
+
+def pose_error(rest_points, weights_a, weights_b, bind_pre_matrices, world_matrices, skinning_method=CLASSIC_LINEAR,
+               blend_weights=None, envelope=1.0, block_vertices=None):
+    """
+    Measures how far two weight sets of the same shape deform apart over a set of poses.
+
+    Both weight sets are evaluated for all poses at once, one block of vertices at a
+    time, and only per-vertex and per-pose reductions are kept, so memory does not grow
+    with the number of vertices times poses.
+
+    Args:
+        rest_points (np.ndarray): The (num_vertices, 3) undeformed points.
+        weights_a (np.ndarray): The (num_vertices, num_influences) reference weights.
+        weights_b (np.ndarray): The (num_vertices, num_influences) compared weights, in the
+            same influence order.
+        bind_pre_matrices (np.ndarray): The (num_influences, 4, 4) bindPreMatrix values.
+        world_matrices (np.ndarray): The (num_poses, num_influences, 4, 4) influence world matrices.
+        skinning_method (int, optional): See skin_eval.evaluate_skin. Defaults to CLASSIC_LINEAR.
+        blend_weights (np.ndarray, optional): See skin_eval.evaluate_skin. Defaults to None.
+        envelope (float, optional): The skincluster envelope, blending the deformation
+            towards the rest points as in skin_eval.evaluate_shape_data. Defaults to 1.0.
+        block_vertices (int, optional): The number of vertices evaluated at once. Defaults to
+            None, which sizes blocks from skin_eval.EVALUATION_BUDGET.
+
+    Returns:
+        dict: The error report, holding:
+            vertex_max (np.ndarray): The largest distance of every vertex over all poses.
+            vertex_rms (np.ndarray): The root mean square distance of every vertex over all poses.
+            pose_max (np.ndarray): The largest distance of any vertex in every pose.
+            pose_mean (np.ndarray): The mean distance over all vertices in every pose.
+            pose_worst_vertex (np.ndarray): The vertex with the largest distance in every pose.
+    """
+    weights_a = np.asarray(weights_a)
+    weights_b = np.asarray(weights_b)
+    num_slots = max(int(np.count_nonzero(weights_a, axis=1).max(initial=1)),
+                    int(np.count_nonzero(weights_b, axis=1).max(initial=1)))
+
+    return _block_errors(rest_points, lambda start, stop: weights_a[start:stop],
+                         lambda start, stop: weights_b[start:stop], num_slots, bind_pre_matrices, world_matrices,
+                         skinning_method, blend_weights, envelope, block_vertices)
+
+def pose_error_shape_data(data_a, data_b, world_matrices, block_vertices=None):
+    """
+    Measures the deformation error between two saved versions of a shape's weights.
+
+    The weights of the compared side are mapped onto the reference influences by name,
+    and both sides are deformed with the reference rest points, bindPreMatrix values,
+    skinning method and envelope. Stored weights are decoded one vertex block at a time, so neither
+    side is ever expanded into a full dense matrix.
+
+    Args:
+        data_a (dict): The reference shape data returned by read_skincluster_data.
+        data_b (dict): The compared shape data.
+        world_matrices (np.ndarray): The (num_poses, num_influences, 4, 4) influence world
+            matrices, in the influence order of the reference.
+        block_vertices (int, optional): See pose_error. Defaults to None.
+
+    Returns:
+        dict: The error report, see pose_error, plus the shape name.
+
+    Raises:
+        ValueError: If the vertex counts differ, or the compared side has weights on
+            influences the reference does not have.
+    """
+    num_vertices_a, slots_a, _ = _shape_weight_stats(data_a)
+    num_vertices_b, slots_b, used_b = _shape_weight_stats(data_b)
+    if num_vertices_a != num_vertices_b:
+        raise ValueError('Cannot compare {} vertices with {} vertices'.format(num_vertices_a, num_vertices_b))
+
+    names_a = [_short_name(name) for name in data_a['influence_names']]
+    names_b = [_short_name(name) for name in data_b['influence_names']]
+
+    extra = [name for column, name in enumerate(names_b) if name not in names_a and used_b[column]]
+    if extra:
+        raise ValueError('Influences missing from the reference: {}'.format(', '.join(extra)))
+
+    # both sides are decoded and remapped one vertex block at a time
+    column_map = build_influence_map(names_b, names_a)
+    def read_weights_b(start, stop):
+        return remap_influences(decode_shape_weight_rows(data_b, start, stop), column_map, len(names_a))
+
+    report = _block_errors(data_a['rest_points'], lambda start, stop: decode_shape_weight_rows(data_a, start, stop),
+                           read_weights_b, max(slots_a, slots_b), data_a['bind_pre_matrix_values'], world_matrices,
+                           data_a.get('skinning_method', CLASSIC_LINEAR), data_a.get('blend_weights'),
+                           data_a.get('envelope', 1.0), block_vertices)
+    report['shape'] = data_a.get('shape')
+
+    return report
+
+def pose_error_skin_files(path_a, path_b, world_matrices, shape_index=0, block_vertices=None):
+    """
+    Measures the deformation error between one shape of two skin files.
+
+    Args:
+        path_a (str): The path of the reference skin file.
+        path_b (str): The path of the compared skin file.
+        world_matrices (np.ndarray): The (num_poses, num_influences, 4, 4) influence world
+            matrices, in the influence order of the reference.
+        shape_index (int, optional): The index of the shape in both files. Defaults to 0.
+        block_vertices (int, optional): See pose_error. Defaults to None.
+
+    Returns:
+        dict: The error report, see pose_error_shape_data.
+    """
+    data_a = read_skincluster_data(path_a)[shape_index]
+    data_b = read_skincluster_data(path_b)[shape_index]
+
+    return pose_error_shape_data(data_a, data_b, world_matrices, block_vertices)
+
+def format_pose_error_report(report, max_items=10, pose_names=None):
+    """
+    Formats a pose error report as short text for review.
+
+    Args:
+        report (dict): The report returned by pose_error or pose_error_shape_data.
+        max_items (int, optional): The number of worst vertices and poses listed. Defaults to 10.
+        pose_names (list, optional): A label for every pose, e.g. its frame. Defaults to None,
+            which labels poses by index.
+
+    Returns:
+        str: The formatted report.
+    """
+    vertex_max = report['vertex_max']
+    pose_max = report['pose_max']
+    if pose_names is None:
+        pose_names = [str(pose) for pose in range(len(pose_max))]
+
+    lines = ['{}: max error {:.4f} over {} vertices and {} poses'.format(report.get('shape', 'shape'),
+                                                                        vertex_max.max(initial=0.0),
+                                                                        len(vertex_max), len(pose_max))]
+
+    lines.append('  worst vertices (index, max error, rms error):')
+    for vertex in np.argsort(vertex_max)[::-1][:max_items]:
+        if vertex_max[vertex] <= 0.0:
+            break
+        lines.append('    {:>8} {:.4f} {:.4f}'.format(int(vertex), vertex_max[vertex], report['vertex_rms'][vertex]))
+
+    lines.append('  worst poses (pose, max error, mean error, worst vertex):')
+    for pose in np.argsort(pose_max)[::-1][:max_items]:
+        if pose_max[pose] <= 0.0:
+            break
+        lines.append('    {} {:.4f} {:.4f} {}'.format(pose_names[pose], pose_max[pose], report['pose_mean'][pose],
+                                                      int(report['pose_worst_vertex'][pose])))
+
+    return '\n'.join(lines)
@@ -0,0 +1,280 @@
+import numpy as np
+
+# Upper bound of per-block (vertex, influence) sums held at once while smoothing
+GATHER_BUDGET = 1 << 23
+
+
+def mesh_adjacency(face_counts, face_vertices, num_vertices):
+    """
+    Builds the vertex adjacency of a polygon mesh as CSR arrays.
+
+    Two vertices are neighbours if they share a polygon edge. The arrays match
+    MFnMesh.getVertices, which returns the vertex count and vertex ids of every face.
+
+    Args:
+        face_counts (np.ndarray): The number of vertices of every face.
+        face_vertices (np.ndarray): The vertex ids of all faces, face after face.
+        num_vertices (int): The number of vertices of the mesh.
+
+    Returns:
+        tuple: The (indptr, indices) arrays, listing the sorted neighbours of every vertex.
+    """
+    face_counts = np.asarray(face_counts, dtype=np.int64)
+    face_vertices = np.asarray(face_vertices, dtype=np.int64)
+
+    # the next vertex of every face vertex, wrapping around at the end of its face
+    face_starts = np.repeat(np.cumsum(face_counts) - face_counts, face_counts)
+    positions = np.arange(len(face_vertices))
+    next_positions = positions + 1
+    next_positions[np.cumsum(face_counts) - 1] = face_starts[np.cumsum(face_counts) - 1]
+
+    # encode every edge in both directions as one sortable key, then drop the edges shared by two faces
+    edges = np.concatenate([face_vertices * num_vertices + face_vertices[next_positions],
+                            face_vertices[next_positions] * num_vertices + face_vertices])
+    edges.sort()
+    edges = edges[np.concatenate([[True], edges[1:] != edges[:-1]])] if len(edges) else edges
+
+    rows, indices = np.divmod(edges, num_vertices)
+
+    indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_vertices), out=indptr[1:])
+
+    return indptr, indices.astype(np.int32)
+
+def triangle_adjacency(triangles, num_vertices):
+    """
+    Builds the vertex adjacency of a triangulated mesh as CSR arrays.
+
+    Triangulation adds diagonals, so prefer mesh_adjacency when the polygons are at hand.
+
+    Args:
+        triangles (np.ndarray): The (num_triangles, 3) vertex ids.
+        num_vertices (int): The number of vertices of the mesh.
+
+    Returns:
+        tuple: The (indptr, indices) arrays, see mesh_adjacency.
+    """
+    triangles = np.asarray(triangles).reshape(-1, 3)
+
+    return mesh_adjacency(np.full(len(triangles), 3), triangles.ravel(), num_vertices)
+
+def _smoothing_operator(indptr, indices, rows, vertex_strength):
+    """
+    Builds the averaging operator of the smoothed vertices as CSR arrays.
+
+    Every smoothed vertex keeps 1 - strength of its own weights and takes strength
+    divided by its neighbour count from every neighbour.
+
+    Args:
+        indptr (np.ndarray): The adjacency row pointers, see mesh_adjacency.
+        indices (np.ndarray): The adjacency neighbour ids, see mesh_adjacency.
+        rows (np.ndarray): The smoothed vertices, all with at least one neighbour.
+        vertex_strength (np.ndarray): The strength of every vertex.
+
+    Returns:
+        tuple: The (indptr, columns, coefficients) arrays, one row per smoothed vertex
+            with the vertex itself first.
+    """
+    degrees = np.diff(indptr)[rows]
+    strength = vertex_strength[rows]
+
+    op_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(degrees + 1, out=op_indptr[1:])
+
+    op_rows = np.repeat(np.arange(len(rows)), degrees + 1)
+    within = np.arange(op_indptr[-1]) - op_indptr[:-1][op_rows]
+    is_self = within == 0
+
+    neighbours = indices[np.maximum(np.asarray(indptr)[rows][op_rows] + within - 1, 0)]
+    columns = np.where(is_self, rows[op_rows], neighbours)
+    coefficients = np.where(is_self, 1.0 - strength[op_rows], (strength / degrees)[op_rows])
+
+    return op_indptr, columns, coefficients
+
+def _multiply_csr(op_indptr, op_columns, op_coefficients, indptr, columns, values, num_columns):
+    """
+    Multiplies a sparse operator with sparse weights, both as CSR arrays.
+
+    Only stored weights are touched. Products are summed a block of operator rows at a
+    time, over the influences used in that block only, so the cost follows the number
+    of stored weights rather than the number of influences.
+
+    Args:
+        op_indptr (np.ndarray): The operator row pointers.
+        op_columns (np.ndarray): The weight row every operator entry reads.
+        op_coefficients (np.ndarray): The factor of every operator entry.
+        indptr (np.ndarray): The weight row pointers.
+        columns (np.ndarray): The influence of every stored weight.
+        values (np.ndarray): The stored weights.
+        num_columns (int): The number of influences.
+
+    Returns:
+        tuple: The (indptr, columns, values) arrays of the product, one row per operator row.
+    """
+    num_rows = len(op_indptr) - 1
+    counts = np.diff(indptr)
+    block_size = max(1, GATHER_BUDGET // max(num_columns, 1))
+
+    result_rows, result_columns, result_values = [], [], []
+    for start in range(0, num_rows, block_size):
+        stop = min(start + block_size, num_rows)
+        first, last = op_indptr[start], op_indptr[stop]
+
+        # expand every operator entry into the stored weights of the row it reads
+        sources = op_columns[first:last]
+        source_counts = counts[sources]
+        source_starts = np.cumsum(source_counts) - source_counts
+        positions = np.repeat(indptr[sources] - source_starts, source_counts) + np.arange(source_counts.sum())
+
+        products = np.repeat(op_coefficients[first:last], source_counts) * values[positions]
+
+        # sum per (row, influence), keyed over the influences this block uses
+        product_columns = columns[positions]
+        used = np.flatnonzero(np.bincount(product_columns, minlength=num_columns))
+        lookup = np.zeros(num_columns, dtype=np.int64)
+        lookup[used] = np.arange(len(used))
+
+        entry_keys = np.repeat(np.arange(stop - start) * len(used), np.diff(op_indptr[start:stop + 1]))
+        sums = np.bincount(np.repeat(entry_keys, source_counts) + lookup[product_columns], products,
+                           minlength=(stop - start) * len(used))
+        stored = np.flatnonzero(sums)
+        block_rows, block_columns = np.divmod(stored, max(len(used), 1))
+
+        result_rows.append(block_rows + start)
+        result_columns.append(used[block_columns])
+        result_values.append(sums[stored])
+
+    result_indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(np.concatenate(result_rows), minlength=num_rows), out=result_indptr[1:])
+
+    return result_indptr, np.concatenate(result_columns), np.concatenate(result_values)
+
+def _replace_rows(indptr, columns, values, rows, row_indptr, row_columns, row_values):
+    """
+    Replaces some rows of CSR arrays.
+
+    Args:
+        indptr (np.ndarray): The row pointers.
+        columns (np.ndarray): The column of every stored value.
+        values (np.ndarray): The stored values.
+        rows (np.ndarray): The sorted rows to replace.
+        row_indptr (np.ndarray): The row pointers of the new rows.
+        row_columns (np.ndarray): The columns of the new rows.
+        row_values (np.ndarray): The values of the new rows.
+
+    Returns:
+        tuple: The (indptr, columns, values) arrays.
+    """
+    counts = np.diff(indptr)
+    if len(rows) == len(counts):
+        return row_indptr, row_columns, row_values
+
+    new_counts = counts.copy()
+    new_counts[rows] = np.diff(row_indptr)
+    new_indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(new_counts, out=new_indptr[1:])
+
+    new_columns = np.empty(new_indptr[-1], dtype=columns.dtype)
+    new_values = np.empty(new_indptr[-1], dtype=values.dtype)
+
+    # untouched rows keep their values, moved to their new start
+    entry_rows = np.repeat(np.arange(len(counts)), counts)
+    kept = np.ones(len(counts), dtype=bool)
+    kept[rows] = False
+    kept = kept[entry_rows]
+    targets = (new_indptr[:-1] - indptr[:-1])[entry_rows][kept] + np.flatnonzero(kept)
+    new_columns[targets] = columns[kept]
+    new_values[targets] = values[kept]
+
+    targets = np.repeat(new_indptr[rows] - row_indptr[:-1], np.diff(row_indptr)) + np.arange(row_indptr[-1])
+    new_columns[targets] = row_columns
+    new_values[targets] = row_values
+
+    return new_indptr, new_columns, new_values
+
+def smooth_weights(weights, indptr, indices, iterations=1, strength=0.5, mask=None, locked=None):
+    """
+    Relaxes skin weights towards the average of their neighbours.
+
+    Every iteration blends each vertex's weights with the mean of its neighbours'
+    weights from the previous iteration. The weights are kept as sparse rows and every
+    iteration is one sparse product with the averaging operator, so only the non-zero
+    influences of every vertex and its neighbours are touched, however many influences
+    the skincluster has.
+
+    Locked influences keep their weights; the free influences of every vertex are
+    rescaled to fill the remainder, so rows keep their sum.
+
+    Args:
+        weights (np.ndarray): The (num_vertices, num_influences) weight matrix.
+        indptr (np.ndarray): The adjacency row pointers, see mesh_adjacency.
+        indices (np.ndarray): The adjacency neighbour ids, see mesh_adjacency.
+        iterations (int, optional): The number of smoothing iterations. Defaults to 1.
+        strength (float, optional): How far every iteration moves towards the neighbour
+            average, between 0 and 1. Defaults to 0.5.
+        mask (np.ndarray, optional): A per-vertex factor between 0 and 1 scaling the strength,
+            or a boolean array of the vertices to smooth. Defaults to None, which smooths
+            every vertex.
+        locked (np.ndarray, optional): The indices of influence columns that keep their
+            weights. Defaults to None.
+
+    Returns:
+        np.ndarray: The smoothed float64 weight matrix.
+    """
+    weights = np.array(weights, dtype=np.float64)
+    num_vertices = weights.shape[0]
+    indptr = np.asarray(indptr)
+    indices = np.asarray(indices)
+
+    vertex_strength = np.full(num_vertices, float(strength))
+    if mask is not None:
+        vertex_strength *= np.asarray(mask, dtype=np.float64)
+
+    # vertices without neighbours have nothing to average with
+    degrees = np.diff(indptr)
+    rows = np.flatnonzero((vertex_strength > 0.0) & (degrees > 0))
+    if not len(rows) or iterations < 1:
+        return weights
+
+    locked_columns = np.zeros(weights.shape[1], dtype=bool)
+    if locked is not None:
+        locked_columns[np.asarray(locked, dtype=np.intp)] = True
+
+    # the free weights as sparse rows, the only pass over the dense matrix
+    stored = np.flatnonzero(weights.ravel() != 0.0)
+    stored_rows, stored_columns = np.divmod(stored, weights.shape[1])
+    stored_free = ~locked_columns[stored_columns]
+    stored_rows, stored_columns = stored_rows[stored_free], stored_columns[stored_free]
+
+    free = np.flatnonzero(np.bincount(stored_columns, minlength=weights.shape[1]))
+    free_lookup = np.zeros(weights.shape[1], dtype=np.int64)
+    free_lookup[free] = np.arange(len(free))
+
+    weight_columns = free_lookup[stored_columns]
+    weight_values = weights.ravel()[stored[stored_free]]
+    weight_indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(stored_rows, minlength=num_vertices), out=weight_indptr[1:])
+    available = np.bincount(stored_rows, weight_values, minlength=num_vertices)[rows]
+
+    operator = _smoothing_operator(indptr, indices, rows, vertex_strength)
+
+    for _ in range(iterations):
+        smoothed = _multiply_csr(*operator, weight_indptr, weight_columns, weight_values, len(free))
+        weight_indptr, weight_columns, weight_values = _replace_rows(weight_indptr, weight_columns, weight_values,
+                                                                     rows, *smoothed)
+
+    # hand every vertex's free weights the share the locked influences leave over
+    smoothed_indptr, smoothed_columns, smoothed_values = smoothed
+    smoothed_rows = np.repeat(np.arange(len(rows)), np.diff(smoothed_indptr))
+
+    free_total = np.bincount(smoothed_rows, smoothed_values, minlength=len(rows))
+    scale = np.divide(available, free_total, out=np.zeros_like(available), where=free_total > 0.0)
+
+    # clear the free weights of the smoothed vertices, then write their new ones
+    cleared = np.zeros(num_vertices, dtype=bool)
+    cleared[rows] = True
+    cleared = cleared[stored_rows]
+    weights[stored_rows[cleared], stored_columns[cleared]] = 0.0
+    weights[rows[smoothed_rows], free[smoothed_columns]] = smoothed_values * scale[smoothed_rows]
+
+    return weights
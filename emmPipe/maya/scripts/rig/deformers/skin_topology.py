@@ -0,0 +1,215 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+
+from rig.deformers.skin_file import FILE_EXTENSION, SkinFile, shape_entries
+
+
+def topology_fingerprint(num_vertices, face_counts=None, face_vertices=None):
+    """
+    Returns a fingerprint identifying the topology of a shape.
+
+    The connectivity hash covers the vertex count of every face and the vertex ids of
+    all faces, so two meshes match only if they are built from the same polygons in the
+    same order. Point positions are not part of it, so a sculpted revision of a model
+    keeps its fingerprint.
+
+    Args:
+        num_vertices (int): The number of vertices, or CVs for curves and surfaces.
+        face_counts (np.ndarray, optional): The number of vertices of every face. Defaults to None.
+        face_vertices (np.ndarray, optional): The vertex ids of all faces. Defaults to None.
+
+    Returns:
+        dict: The num_vertices, num_faces, num_face_vertices and connectivity_hash.
+    """
+    face_counts = np.ascontiguousarray(face_counts if face_counts is not None else [], dtype=np.int32)
+    face_vertices = np.ascontiguousarray(face_vertices if face_vertices is not None else [], dtype=np.int32)
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(np.int64(num_vertices).tobytes())
+    hasher.update(face_counts.tobytes())
+    hasher.update(face_vertices.tobytes())
+
+    return {'num_vertices': int(num_vertices),
+            'num_faces': len(face_counts),
+            'num_face_vertices': len(face_vertices),
+            'connectivity_hash': hasher.hexdigest()}
+
+def bounding_box(points):
+    """
+    Returns the bounding box of a set of points.
+
+    Args:
+        points (np.ndarray): The (num_points, 3) points.
+
+    Returns:
+        list: The minimum and maximum corner, as lists of three floats.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if not len(points):
+        return [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+
+    return [points.min(axis=0).tolist(), points.max(axis=0).tolist()]
+
+def compare_topology(saved, live):
+    """
+    Lists the differences between a saved and a live topology fingerprint.
+
+    Saved data from before fingerprints were recorded only holds a vertex count, so
+    only the fields present on both sides are compared.
+
+    Args:
+        saved (dict): The saved fingerprint.
+        live (dict): The fingerprint of the target shape.
+
+    Returns:
+        list: A description of every mismatch, empty if the topologies match.
+    """
+    mismatches = []
+    for key in ('num_vertices', 'num_faces', 'num_face_vertices', 'connectivity_hash'):
+        if key in saved and key in live and saved[key] != live[key]:
+            mismatches.append('{}: saved {}, target {}'.format(key, saved[key], live[key]))
+
+    return mismatches
+
+
+class TopologyIndex:
+    """
+    A JSON index from topology fingerprints to the skin files holding that topology.
+
+    One index per show lets assets that share a base mesh find each other's weights.
+    Entries only store file paths, shape names and bounding boxes, so the index can be
+    rebuilt at any time from the skin file headers.
+
+    Properties:
+        path (str): The path of the index file.
+        hashes (list): The connectivity hashes in the index.
+    """
+    def __init__(self, path):
+        """
+        Initializes a new instance of the TopologyIndex class.
+
+        Args:
+            path (str): The path of the index file. It is created on the first save.
+        """
+        self._path = path
+        self._entries = {}
+
+        if os.path.exists(path):
+            with open(path, 'r') as file_obj:
+                self._entries = json.load(file_obj)
+
+    #... Public Methods ...#
+    def add_skin_file(self, full_path):
+        """
+        Adds every shape of a skin file that carries a fingerprint to the index.
+
+        Only the header of the file is read.
+
+        Args:
+            full_path (str): The path of the skin file.
+
+        Returns:
+            int: The number of shapes added.
+        """
+        full_path = os.path.abspath(full_path)
+        self.remove_skin_file(full_path)
+
+        added = 0
+        for metadata, _ in shape_entries(SkinFile(full_path)):
+            topology = metadata.get('topology')
+            if not topology:
+                continue
+
+            self._entries.setdefault(topology['connectivity_hash'], []).append(
+                {'file': full_path,
+                 'shape': metadata.get('shape'),
+                 'num_vertices': topology['num_vertices'],
+                 'bounding_box': metadata.get('bounding_box')})
+            added += 1
+
+        return added
+
+    def remove_skin_file(self, full_path):
+        """
+        Removes every entry of a skin file from the index.
+
+        Args:
+            full_path (str): The path of the skin file.
+
+        Returns:
+            None
+        """
+        full_path = os.path.abspath(full_path)
+
+        for connectivity_hash in list(self._entries):
+            entries = [entry for entry in self._entries[connectivity_hash] if entry['file'] != full_path]
+            if entries:
+                self._entries[connectivity_hash] = entries
+            else:
+                del self._entries[connectivity_hash]
+
+    def find(self, fingerprint):
+        """
+        Returns the indexed shapes sharing a topology.
+
+        Args:
+            fingerprint (dict or str): A fingerprint or its connectivity hash.
+
+        Returns:
+            list: The entries of matching shapes, each holding the file, shape,
+                num_vertices and bounding_box.
+        """
+        connectivity_hash = fingerprint['connectivity_hash'] if isinstance(fingerprint, dict) else fingerprint
+
+        return [entry for entry in self._entries.get(connectivity_hash, []) if os.path.exists(entry['file'])]
+
+    def rebuild(self, root):
+        """
+        Rebuilds the index from every skin file below a directory.
+
+        Args:
+            root (str): The directory to search, e.g. the show root.
+
+        Returns:
+            int: The number of indexed shapes.
+        """
+        self._entries = {}
+
+        added = 0
+        for directory, _, file_names in os.walk(root):
+            for file_name in file_names:
+                if file_name.endswith(FILE_EXTENSION):
+                    try:
+                        added += self.add_skin_file(os.path.join(directory, file_name))
+                    except ValueError:
+                        continue
+
+        return added
+
+    def save(self):
+        """
+        Writes the index to disk.
+
+        Returns:
+            None
+        """
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+
+        temp_path = '{}.tmp'.format(self._path)
+        with open(temp_path, 'w') as file_obj:
+            json.dump(self._entries, file_obj, indent=1)
+
+        os.replace(temp_path, self._path)
+
+    #... Properties ...#
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def hashes(self):
+        return list(self._entries)
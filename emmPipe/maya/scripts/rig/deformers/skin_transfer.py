@@ -0,0 +1,562 @@
+import itertools
+
+import numpy as np
+
+from rig.deformers.skin_weights import normalize_rows
+from rig.deformers.skin_file import read_skincluster_data, decode_shape_weights
+from rig.deformers.skin_topology import bounding_box
+
+TRANSFER_MODES = ('closest_point', 'barycentric')
+
+
+class UniformGrid:
+    """
+    A uniform grid over a point cloud for vectorized nearest point queries.
+
+    Points are bucketed into cubic cells, sorted by cell key, so every query is a handful
+    of table lookups and masked distance updates over all targets at once.
+
+    Properties:
+        points (np.ndarray): The (num_points, 3) indexed points.
+        cell_size (float): The edge length of a cell.
+    """
+    def __init__(self, points, points_per_cell=2.0):
+        """
+        Initializes a new instance of the UniformGrid class.
+
+        Args:
+            points (np.ndarray): The (num_points, 3) points to index.
+            points_per_cell (float, optional): The average number of points per occupied
+                cell the cell size is chosen for. Defaults to 2.0.
+
+        Raises:
+            ValueError: If no points are given.
+        """
+        self._points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        if not len(self._points):
+            raise ValueError('Cannot build a grid without points')
+
+        self._min = self._points.min(axis=0)
+        self._max = self._points.max(axis=0)
+        self._cell_size = self._get_cell_size(points_per_cell)
+        self._dims = np.floor((self._max - self._min) / self._cell_size).astype(np.int64) + 1
+
+        # the cell size keeps the number of cells close to the number of points, so a
+        # dense start/count table per cell is affordable and avoids any search on lookup
+        keys = self._cell_keys(self._cells(self._points))
+        self._order = np.argsort(keys, kind='stable')
+        self._counts = np.bincount(keys, minlength=int(np.prod(self._dims)))
+        self._starts = np.cumsum(self._counts) - self._counts
+
+    #... Public Methods ...#
+    def query(self, targets):
+        """
+        Finds the nearest indexed point for every target.
+
+        Cells are searched in growing Chebyshev shells around each target's cell. A target
+        is finished once its best distance is within the radius that every unsearched
+        cell is guaranteed to be outside of.
+
+        Args:
+            targets (np.ndarray): The (num_targets, 3) query points.
+
+        Returns:
+            tuple: The (distances, indices) of the nearest point of every target.
+        """
+        targets = np.ascontiguousarray(targets, dtype=np.float64).reshape(-1, 3)
+
+        # Every indexed point lies in the grid box, so for a target t clamped onto the
+        # box at t', |t - p|^2 >= |t - t'|^2 + |t' - p|^2 holds for any indexed point p.
+        clamped = np.clip(targets, self._min, self._max)
+        outside_distances = np.einsum('ij,ij->i', targets - clamped, targets - clamped)
+        target_cells = self._cells(clamped)
+
+        # walking the targets in cell order keeps the gathers below cache friendly
+        pending = np.argsort(self._cell_keys(target_cells), kind='stable')
+
+        best_distances = np.full(len(targets), np.inf)
+        best_indices = np.full(len(targets), -1, dtype=np.int64)
+
+        radius = 0
+        while len(pending):
+            pending_targets = np.take(targets, pending, axis=0)
+            pending_cells = np.take(target_cells, pending, axis=0)
+            pending_keys = self._cell_keys(pending_cells)
+
+            for offset in self._shell_offsets(radius):
+                self._search_cell(pending, pending_targets, pending_cells, pending_keys, offset,
+                                  best_distances, best_indices)
+
+            bound = outside_distances[pending] + (radius * self._cell_size) ** 2
+            done = best_distances[pending] <= bound
+            pending = pending[~done]
+            radius += 1
+
+            if radius > self._dims.max():
+                break
+
+        return np.sqrt(best_distances), best_indices
+
+    #... Private Methods ...#
+    def _get_cell_size(self, points_per_cell):
+        """
+        Picks a cell size that gives roughly points_per_cell points per occupied cell.
+
+        Flat or thin point clouds are handled by not letting any axis count for less
+        than one cell, which a plain volume based estimate would get wrong.
+
+        Args:
+            points_per_cell (float): The target average occupancy.
+
+        Returns:
+            float: The cell size.
+        """
+        extent = self._max - self._min
+        target_cells = max(len(self._points) / points_per_cell, 1.0)
+
+        low, high = 1e-9, max(extent.max(), 1e-6)
+        for _ in range(50):
+            cell_size = 0.5 * (low + high)
+            if np.prod(np.maximum(extent / cell_size, 1.0)) > target_cells:
+                low = cell_size
+            else:
+                high = cell_size
+
+        return high
+
+    def _cells(self, points):
+        """
+        Returns the integer cell coordinates of points inside the grid box.
+        """
+        cells = np.floor((points - self._min) / self._cell_size).astype(np.int64)
+
+        return np.minimum(cells, self._dims - 1)
+
+    def _cell_keys(self, cells):
+        """
+        Returns the flat key of integer cell coordinates.
+        """
+        return (cells[:, 0] * self._dims[1] + cells[:, 1]) * self._dims[2] + cells[:, 2]
+
+    def _shell_offsets(self, radius):
+        """
+        Returns the cell offsets with a Chebyshev distance of exactly radius.
+
+        Unsearched cells are then at least radius cells away, so every point in them is
+        further than radius * cell_size from a target inside the grid box.
+        """
+        if radius == 0:
+            return [(0, 0, 0)]
+
+        # offsets that leave the grid on an axis can never hit a cell
+        steps = [range(-min(radius, dim - 1), min(radius, dim - 1) + 1) for dim in self._dims]
+
+        return [offset for offset in itertools.product(*steps) if max(map(abs, offset)) == radius]
+
+    def _search_cell(self, pending, pending_targets, pending_cells, pending_keys, offset, best_distances, best_indices):
+        """
+        Updates the best matches of pending targets with the points of one neighbouring cell.
+        """
+        inside = np.ones(len(pending), dtype=bool)
+        for axis, step in enumerate(offset):
+            if step:
+                inside &= (pending_cells[:, axis] + step >= 0) & (pending_cells[:, axis] + step < self._dims[axis])
+
+        subset = np.flatnonzero(inside)
+        keys = pending_keys[subset] + int((offset[0] * self._dims[1] + offset[1]) * self._dims[2] + offset[2])
+
+        counts = self._counts[keys]
+        hit = counts > 0
+
+        subset = subset[hit]
+        starts = self._starts[keys[hit]]
+        counts = counts[hit]
+        if not len(subset):
+            return
+
+        # expand every (target, point in cell) pair, then reduce per target
+        group_starts = np.cumsum(counts) - counts
+        within = np.arange(counts.sum()) - np.repeat(group_starts, counts)
+        candidates = self._order[np.repeat(starts, counts) + within]
+        offsets = np.repeat(np.take(pending_targets, subset, axis=0), counts, axis=0) - np.take(self._points, candidates, axis=0)
+        distances = np.einsum('ij,ij->i', offsets, offsets)
+
+        group_min = np.minimum.reduceat(distances, group_starts)
+        first_min = np.flatnonzero(distances == np.repeat(group_min, counts))
+        _, first_of_group = np.unique(np.repeat(np.arange(len(subset)), counts)[first_min], return_index=True)
+        nearest = candidates[first_min[first_of_group]]
+
+        subset = pending[subset]
+        better = group_min < best_distances[subset]
+        best_distances[subset[better]] = group_min[better]
+        best_indices[subset[better]] = nearest[better]
+
+    #... Properties ...#
+    @property
+    def points(self):
+        return self._points
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+
+class TriangleGrid:
+    """
+    A uniform grid over the triangles of a mesh for vectorized closest triangle queries.
+
+    Every triangle is bucketed into each cell its bounding box overlaps, so a long, thin
+    triangle is found from anywhere along its length, not only near its corners.
+
+    Properties:
+        points (np.ndarray): The (num_points, 3) mesh points.
+        triangles (np.ndarray): The (num_triangles, 3) indexed triangles.
+        cell_size (float): The edge length of a cell.
+    """
+    def __init__(self, points, triangles, cell_size):
+        """
+        Initializes a new instance of the TriangleGrid class.
+
+        Args:
+            points (np.ndarray): The (num_points, 3) mesh points.
+            triangles (np.ndarray): The (num_triangles, 3) triangles indexing the points.
+            cell_size (float): The edge length of a cell, e.g. UniformGrid.cell_size.
+
+        Raises:
+            ValueError: If no triangles are given.
+        """
+        self._points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        self._triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        if not len(self._triangles):
+            raise ValueError('Cannot build a grid without triangles')
+
+        self._min = self._points.min(axis=0)
+        self._cell_size = float(cell_size)
+        self._dims = np.floor((self._points.max(axis=0) - self._min) / self._cell_size).astype(np.int64) + 1
+
+        corners = self._points[self._triangles]
+        owners, keys = self._expand_boxes(self._cells(corners.min(axis=1)), self._cells(corners.max(axis=1)))
+        self._order = owners[np.argsort(keys, kind='stable')]
+        self._counts = np.bincount(keys, minlength=int(np.prod(self._dims)))
+        self._starts = np.cumsum(self._counts) - self._counts
+
+    #... Public Methods ...#
+    def query(self, targets, radii, block_size=4096):
+        """
+        Finds the closest triangle of every target among the triangles within its radius.
+
+        The cells overlapping the bounding box of each target's search sphere are gathered,
+        so every triangle that comes closer than the radius is tested.
+
+        Args:
+            targets (np.ndarray): The (num_targets, 3) query points.
+            radii (np.ndarray): The (num_targets,) search radius of every target.
+            block_size (int, optional): The number of targets expanded at once, bounding
+                the size of the candidate arrays. Defaults to 4096.
+
+        Returns:
+            tuple: The (num_targets,) triangle indices, (num_targets, 3) barycentric
+                coordinates and (num_targets,) squared distances. Targets without any
+                triangle in range get -1 and an infinite distance.
+        """
+        targets = np.ascontiguousarray(targets, dtype=np.float64).reshape(-1, 3)
+        # a little slack keeps triangles exactly on the radius from rounding out of range
+        radii = np.asarray(radii, dtype=np.float64)[:, None] * (1.0 + 1e-9) + 1e-12
+
+        best_triangles = np.full(len(targets), -1, dtype=np.int64)
+        best_coords = np.tile([1.0, 0.0, 0.0], (len(targets), 1))
+        best_distances = np.full(len(targets), np.inf)
+
+        for start in range(0, len(targets), block_size):
+            block = slice(start, start + block_size)
+            owners, keys = self._expand_boxes(self._cells(targets[block] - radii[block]),
+                                              self._cells(targets[block] + radii[block]))
+
+            # expand every (target, triangle in cell) pair, then reduce per target
+            counts = self._counts[keys]
+            group_starts = np.cumsum(counts) - counts
+            within = np.arange(counts.sum()) - np.repeat(group_starts, counts)
+            candidates = self._order[np.repeat(self._starts[keys], counts) + within]
+            pair_targets = np.repeat(owners, counts) + start
+            if not len(candidates):
+                continue
+
+            corners = self._triangles[candidates]
+            coords, distances = closest_points_on_triangles(targets[pair_targets],
+                                                            self._points[corners[:, 0]],
+                                                            self._points[corners[:, 1]],
+                                                            self._points[corners[:, 2]])
+
+            order = np.lexsort((distances, pair_targets))
+            hit, first = np.unique(pair_targets[order], return_index=True)
+            nearest = order[first]
+
+            best_triangles[hit] = candidates[nearest]
+            best_coords[hit] = coords[nearest]
+            best_distances[hit] = distances[nearest]
+
+        return best_triangles, best_coords, best_distances
+
+    #... Private Methods ...#
+    def _cells(self, points):
+        """
+        Returns the integer cell coordinates of points, clamped onto the grid.
+        """
+        cells = np.floor((points - self._min) / self._cell_size).astype(np.int64)
+
+        return np.clip(cells, 0, self._dims - 1)
+
+    def _expand_boxes(self, low, high):
+        """
+        Lists every cell of a set of inclusive cell boxes.
+
+        Args:
+            low (np.ndarray): The (num_boxes, 3) lowest cell of every box.
+            high (np.ndarray): The (num_boxes, 3) highest cell of every box.
+
+        Returns:
+            tuple: The box index and flat cell key of every (box, cell) pair, grouped by box.
+        """
+        spans = high - low + 1
+        sizes = spans.prod(axis=1)
+
+        owners = np.repeat(np.arange(len(low)), sizes)
+        within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        spans = spans[owners]
+        low = low[owners]
+
+        x = low[:, 0] + within // (spans[:, 1] * spans[:, 2])
+        y = low[:, 1] + (within // spans[:, 2]) % spans[:, 1]
+        z = low[:, 2] + within % spans[:, 2]
+
+        return owners, (x * self._dims[1] + y) * self._dims[2] + z
+
+    #... Properties ...#
+    @property
+    def points(self):
+        return self._points
+
+    @property
+    def triangles(self):
+        return self._triangles
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+
+def closest_points_on_triangles(targets, a, b, c):
+    """
+    Computes the closest point on a triangle for every target, as barycentric coordinates.
+
+    This is the region test from Ericson's Real-Time Collision Detection, evaluated for
+    all targets at once. Degenerate triangles fall back to their first corner.
+
+    Args:
+        targets (np.ndarray): The (N, 3) query points.
+        a (np.ndarray): The (N, 3) first corners.
+        b (np.ndarray): The (N, 3) second corners.
+        c (np.ndarray): The (N, 3) third corners.
+
+    Returns:
+        tuple: The (N, 3) barycentric coordinates and the (N,) squared distances.
+    """
+    def dot(x, y):
+        return np.einsum('...j,...j->...', x, y)
+
+    ab = b - a
+    ac = c - a
+    ap = targets - a
+    bp = targets - b
+    cp = targets - c
+
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = va + vb + vc
+        v = vb / denom
+        w = vc / denom
+        coords = np.stack([1.0 - v - w, v, w], axis=-1)
+
+        # Regions are applied from the lowest to the highest priority, so the
+        # first matching test in Ericson's order wins.
+        edge_bc = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        coords[edge_bc] = np.stack([np.zeros_like(t), 1.0 - t, t], axis=-1)[edge_bc]
+
+        edge_ac = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        t = d2 / (d2 - d6)
+        coords[edge_ac] = np.stack([1.0 - t, np.zeros_like(t), t], axis=-1)[edge_ac]
+
+        coords[(d6 >= 0) & (d5 <= d6)] = (0.0, 0.0, 1.0)
+
+        edge_ab = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        t = d1 / (d1 - d3)
+        coords[edge_ab] = np.stack([1.0 - t, t, np.zeros_like(t)], axis=-1)[edge_ab]
+
+        coords[(d3 >= 0) & (d4 <= d3)] = (0.0, 1.0, 0.0)
+        coords[(d1 <= 0) & (d2 <= 0)] = (1.0, 0.0, 0.0)
+
+    coords[~np.all(np.isfinite(coords), axis=-1)] = (1.0, 0.0, 0.0)
+
+    closest = coords[..., 0:1] * a + coords[..., 1:2] * b + coords[..., 2:3] * c
+    offsets = targets - closest
+
+    return coords, dot(offsets, offsets)
+
+def compute_transfer(source_points, target_points, source_triangles=None, mode='closest_point'):
+    """
+    Computes how every target vertex samples the source vertices.
+
+    'closest_point' samples the nearest source vertex. 'barycentric' projects the target
+    onto the closest source triangle and interpolates its corners.
+
+    Args:
+        source_points (np.ndarray): The (num_source, 3) source rest points.
+        target_points (np.ndarray): The (num_target, 3) target points.
+        source_triangles (np.ndarray, optional): The (num_triangles, 3) source triangles,
+            required for 'barycentric'. Defaults to None.
+        mode (str, optional): One of TRANSFER_MODES. Defaults to 'closest_point'.
+
+    Returns:
+        tuple: The (num_target, k) source indices and matching interpolation coefficients.
+
+    Raises:
+        ValueError: If the mode is unknown or 'barycentric' is requested without triangles.
+    """
+    if mode not in TRANSFER_MODES:
+        raise ValueError('Unknown transfer mode {}, expected one of {}'.format(mode, TRANSFER_MODES))
+
+    source_points = np.asarray(source_points, dtype=np.float64).reshape(-1, 3)
+    target_points = np.asarray(target_points, dtype=np.float64).reshape(-1, 3)
+
+    grid = UniformGrid(source_points)
+    nearest_distances, nearest = grid.query(target_points)
+
+    if mode == 'closest_point':
+        return nearest[:, None], np.ones((len(nearest), 1))
+
+    if source_triangles is None or not len(source_triangles):
+        raise ValueError('Barycentric transfer needs the source triangles')
+
+    # The closest point on the surface is never further than the nearest vertex, so only
+    # triangles reaching into that sphere can win. A target whose nearest vertex belongs
+    # to no triangle keeps sampling that vertex unless a triangle comes closer.
+    triangle_grid = TriangleGrid(source_points, source_triangles, grid.cell_size)
+    hit, hit_coords, hit_distances = triangle_grid.query(target_points, nearest_distances)
+
+    best_triangles = np.stack([nearest, nearest, nearest], axis=1)
+    best_coords = np.tile([1.0, 0.0, 0.0], (len(nearest), 1))
+
+    better = hit_distances < nearest_distances ** 2
+    best_triangles[better] = triangle_grid.triangles[hit[better]]
+    best_coords[better] = hit_coords[better]
+
+    return best_triangles, best_coords
+
+def apply_transfer(values, indices, coefficients):
+    """
+    Samples per-vertex source values for the target vertices.
+
+    Args:
+        values (np.ndarray): The (num_source, ...) per-vertex values, e.g. weights.
+        indices (np.ndarray): The (num_target, k) source indices from compute_transfer.
+        coefficients (np.ndarray): The (num_target, k) coefficients from compute_transfer.
+
+    Returns:
+        np.ndarray: The (num_target, ...) interpolated values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    sampled = values[indices]
+
+    return np.einsum('tk,tk...->t...', coefficients, sampled)
+
+def transfer_weights(source_points, source_weights, target_points, source_triangles=None, mode='closest_point'):
+    """
+    Transfers a weight matrix from source vertices onto target points.
+
+    Args:
+        source_points (np.ndarray): The (num_source, 3) source rest points.
+        source_weights (np.ndarray): The (num_source, num_influences) weights.
+        target_points (np.ndarray): The (num_target, 3) target points.
+        source_triangles (np.ndarray, optional): The source triangles, see compute_transfer.
+        mode (str, optional): One of TRANSFER_MODES. Defaults to 'closest_point'.
+
+    Returns:
+        np.ndarray: The normalized (num_target, num_influences) weights.
+    """
+    indices, coefficients = compute_transfer(source_points, target_points, source_triangles, mode)
+
+    return normalize_rows(apply_transfer(source_weights, indices, coefficients))
+
+def transfer_shape_data(data, target_points, mode='closest_point', source_matrix=None, target_topology=None):
+    """
+    Resamples the weights and blend weights of one shape's skin data onto target points.
+
+    Args:
+        data (dict): Shape data as returned by read_skincluster_data, holding rest points
+            and optionally triangles.
+        target_points (np.ndarray): The (num_target, 3) target points, in the object space
+            of the shape unless source_matrix is given.
+        mode (str, optional): One of TRANSFER_MODES. Defaults to 'closest_point'.
+        source_matrix (np.ndarray, optional): A 4x4 row-major matrix moving the rest points
+            into the space of the target points. Defaults to None.
+        target_topology (dict, optional): The topology fingerprint of the target shape,
+            see skin_topology.topology_fingerprint. Defaults to None, which leaves the
+            fingerprint out so only the vertex count is checked on load.
+
+    Returns:
+        dict: A copy of the shape data with dense 'weights' and 'blend_weights', and the
+            bounding box and topology of the target points.
+
+    Raises:
+        ValueError: If the shape data has no rest points.
+    """
+    if 'rest_points' not in data:
+        raise ValueError('The skin data of {} has no rest points to transfer from'.format(data.get('shape')))
+
+    source_points = np.asarray(data['rest_points'], dtype=np.float64)
+    if source_matrix is not None:
+        source_matrix = np.asarray(source_matrix, dtype=np.float64)
+        source_points = source_points @ source_matrix[:3, :3] + source_matrix[3, :3]
+
+    indices, coefficients = compute_transfer(source_points, target_points, data.get('triangles'), mode)
+    weights = normalize_rows(apply_transfer(decode_shape_weights(data), indices, coefficients))
+
+    transferred = {name: value for name, value in data.items()
+                   if not name.startswith('weights') and name not in ('triangles', 'topology')}
+    transferred['rest_points'] = np.asarray(target_points, dtype=np.float64)
+    transferred['bounding_box'] = bounding_box(transferred['rest_points'])
+    if target_topology is not None:
+        transferred['topology'] = target_topology
+    transferred['weights'] = weights
+    transferred['blend_weights'] = apply_transfer(data['blend_weights'], indices, coefficients)
+    transferred['num_vertices'] = len(weights)
+
+    return transferred
+
+def transfer_skin_file(full_path, target_points, shape_index=0, mode='closest_point'):
+    """
+    Transfers the weights of a saved shape onto target points, without Maya.
+
+    This allows re-skinning a revised model from the skin file of the previous model,
+    without having the previous model in the scene.
+
+    Args:
+        full_path (str): The path of the saved skin file.
+        target_points (np.ndarray): The (num_target, 3) target points in the object space
+            of the saved shape.
+        shape_index (int, optional): The saved shape to transfer from. Defaults to 0.
+        mode (str, optional): One of TRANSFER_MODES. Defaults to 'closest_point'.
+
+    Returns:
+        dict: The saved shape data with weights and blend weights resampled for the
+            target points.
+    """
+    return transfer_shape_data(read_skincluster_data(full_path)[shape_index], target_points, mode)
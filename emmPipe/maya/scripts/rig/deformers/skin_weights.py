@@ -0,0 +1,392 @@
+import numpy as np
+
+
+def dense_to_csr(weights, threshold=0.0, dtype=np.float32):
+    """
+    Compresses a dense weight matrix into CSR arrays.
+
+    Only weights above the threshold are kept. Row pointers and influence indices use
+    the smallest integer dtype the vertex and influence counts allow, values are stored
+    as float32 by default.
+
+    Args:
+        weights (np.ndarray): The (num_vertices, num_influences) weight matrix.
+        threshold (float, optional): Weights at or below this value are dropped. Defaults to 0.0.
+        dtype (np.dtype, optional): The dtype of the values. Defaults to np.float32.
+
+    Returns:
+        tuple: The (indptr, indices, values) arrays.
+    """
+    weights = np.asarray(weights)
+    if weights.ndim != 2:
+        raise ValueError('Expected a (num_vertices, num_influences) weight matrix, got shape {}'.format(weights.shape))
+
+    mask = weights > threshold
+    counts = np.count_nonzero(mask, axis=1)
+
+    indptr_dtype = np.int32 if counts.sum() <= np.iinfo(np.int32).max else np.int64
+    indptr = np.zeros(weights.shape[0] + 1, dtype=indptr_dtype)
+    np.cumsum(counts, out=indptr[1:])
+
+    if weights.shape[1] <= np.iinfo(np.uint8).max + 1:
+        index_dtype = np.uint8
+    elif weights.shape[1] <= np.iinfo(np.uint16).max + 1:
+        index_dtype = np.uint16
+    else:
+        index_dtype = np.int32
+    indices = np.nonzero(mask)[1].astype(index_dtype)
+    values = weights[mask].astype(dtype)
+
+    return indptr, indices, values
+
+def csr_to_dense(indptr, indices, values, num_influences, out=None):
+    """
+    Expands CSR weight arrays into a dense weight matrix.
+
+    Args:
+        indptr (np.ndarray): The row pointer array, one entry per vertex plus one.
+        indices (np.ndarray): The influence index of every stored weight.
+        values (np.ndarray): The stored weight values.
+        num_influences (int): The number of influence columns.
+        out (np.ndarray, optional): A float64 array to fill in place. Defaults to None.
+
+    Returns:
+        np.ndarray: The (num_vertices, num_influences) weight matrix.
+    """
+    indptr = np.asarray(indptr)
+    num_vertices = len(indptr) - 1
+
+    if out is None:
+        out = np.zeros((num_vertices, num_influences), dtype=np.float64)
+    else:
+        out[:] = 0.0
+
+    rows = np.repeat(np.arange(num_vertices), np.diff(indptr))
+    out[rows, np.asarray(indices, dtype=np.intp)] = values
+
+    return out
+
+def build_influence_map(saved_names, live_names, fallbacks=None):
+    """
+    Maps saved influence columns to live influence columns by name.
+
+    Names are compared without their DAG path, so '|root|spine_c_00' matches 'spine_c_00'.
+
+    Args:
+        saved_names (list): The influence names in saved column order.
+        live_names (list): The influence names in live column order.
+        fallbacks (dict, optional): Saved influence names mapped to the live influence
+            that receives their weights when they are missing. Defaults to None.
+
+    Returns:
+        np.ndarray: The live column of every saved column, or -1 if the column is dropped.
+    """
+    live_columns = {name.split('|')[-1]: column for column, name in enumerate(live_names)}
+    fallbacks = fallbacks or {}
+
+    column_map = np.full(len(saved_names), -1, dtype=np.intp)
+    for column, name in enumerate(saved_names):
+        target = name if name.split('|')[-1] in live_columns else fallbacks.get(name)
+        if target is not None:
+            column_map[column] = live_columns.get(target.split('|')[-1], -1)
+
+    return column_map
+
+def remap_influences(weights, column_map, num_influences):
+    """
+    Permutes and merges weight columns according to an influence map.
+
+    Columns mapped to the same live influence are summed, columns mapped to -1 are dropped.
+    The whole remap is a single column gather followed by one grouped reduction.
+
+    Args:
+        weights (np.ndarray): The (num_vertices, num_saved_influences) weight matrix.
+        column_map (np.ndarray): The live column of every saved column, see build_influence_map.
+        num_influences (int): The number of live influences.
+
+    Returns:
+        np.ndarray: The (num_vertices, num_influences) weight matrix.
+    """
+    column_map = np.asarray(column_map)
+    weights = np.asarray(weights)
+
+    remapped = np.zeros((weights.shape[0], num_influences), dtype=np.float64)
+
+    valid = np.flatnonzero(column_map >= 0)
+    if not len(valid):
+        return remapped
+
+    order = valid[np.argsort(column_map[valid], kind='stable')]
+    targets, starts = np.unique(column_map[order], return_index=True)
+    remapped[:, targets] = np.add.reduceat(weights[:, order], starts, axis=1)
+
+    return remapped
+
+def prune_weights(weights, threshold):
+    """
+    Zeroes weights below a threshold, in place.
+
+    The largest weight of every vertex is always kept, so no vertex loses all of its
+    influences.
+
+    Args:
+        weights (np.ndarray): The float (num_vertices, num_influences) weight matrix.
+        threshold (float): Weights below this value are set to zero.
+
+    Returns:
+        np.ndarray: The pruned weight matrix.
+    """
+    if weights.size:
+        pruned = weights < threshold
+        pruned &= weights < weights.max(axis=1, keepdims=True)
+        weights[pruned] = 0.0
+
+    return weights
+
+def limit_influences(weights, max_influences):
+    """
+    Keeps only the largest weights of every vertex, in place.
+
+    Args:
+        weights (np.ndarray): The float (num_vertices, num_influences) weight matrix.
+        max_influences (int): The number of influences kept per vertex, e.g. 4 or 8.
+
+    Returns:
+        np.ndarray: The limited weight matrix.
+
+    Raises:
+        ValueError: If max_influences is smaller than one.
+    """
+    if max_influences < 1:
+        raise ValueError('max_influences must be at least 1, got {}'.format(max_influences))
+
+    num_dropped = weights.shape[1] - max_influences
+    if num_dropped > 0 and weights.shape[0]:
+        dropped = np.argpartition(weights, num_dropped - 1, axis=1)[:, :num_dropped]
+        np.put_along_axis(weights, dropped, 0.0, axis=1)
+
+    return weights
+
+def normalize_rows(weights):
+    """
+    Scales every row of a weight matrix to sum to one, in place. Empty rows are left at zero.
+
+    Args:
+        weights (np.ndarray): The float (num_vertices, num_influences) weight matrix.
+
+    Returns:
+        np.ndarray: The normalized weight matrix.
+    """
+    totals = weights.sum(axis=1, keepdims=True)
+    np.divide(weights, totals, out=weights, where=totals > 0)
+
+    return weights
+
+def condition_weights(weights, prune_threshold=0.0, max_influences=None, normalize=True):
+    """
+    Prunes, limits and normalizes a weight matrix in one pass over a single copy.
+
+    The result is ready to be handed to MFnSkinCluster.setWeights without asking Maya
+    to normalize afterwards.
+
+    Args:
+        weights (np.ndarray): The (num_vertices, num_influences) weight matrix.
+        prune_threshold (float, optional): Weights below this value are dropped, see
+            prune_weights. Defaults to 0.0.
+        max_influences (int, optional): The number of influences kept per vertex.
+            Defaults to None, which keeps all influences.
+        normalize (bool, optional): Whether rows are scaled to sum to one. Defaults to True.
+
+    Returns:
+        np.ndarray: The conditioned float64 weight matrix.
+    """
+    weights = np.array(weights, dtype=np.float64)
+
+    if prune_threshold > 0.0:
+        prune_weights(weights, prune_threshold)
+
+    if max_influences is not None:
+        limit_influences(weights, max_influences)
+
+    if normalize:
+        normalize_rows(weights)
+
+    return weights
+
+def _row_ids(indptr):
+    """
+    Returns the row of every stored CSR value.
+
+    Args:
+        indptr (np.ndarray): The row pointer array.
+
+    Returns:
+        np.ndarray: The row index of every value.
+    """
+    return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+def _quantize_fixed_point(indptr, values, dtype):
+    """
+    Rounds CSR weight values to fixed point, keeping the sum of every row exact.
+
+    Every value is rounded down, then the rows hand the units lost to rounding back to
+    their values with the largest remainders. Each value is therefore off by less than
+    one step, and rows that summed to one still sum to exactly one.
+
+    Args:
+        indptr (np.ndarray): The row pointer array.
+        values (np.ndarray): The stored weight values.
+        dtype (np.dtype): The unsigned integer dtype to round to.
+
+    Returns:
+        np.ndarray: The fixed point values, where the dtype's maximum stands for 1.0.
+    """
+    scale = np.iinfo(dtype).max
+    rows = _row_ids(indptr)
+
+    scaled = np.clip(np.asarray(values, dtype=np.float64), 0.0, 1.0) * scale
+    quantized = np.floor(scaled)
+    remainders = scaled - quantized
+
+    # bincount leaves rows without values at zero, wherever they are
+    num_rows = len(indptr) - 1
+    targets = np.rint(np.bincount(rows, scaled, minlength=num_rows))
+    floors = np.bincount(rows, quantized, minlength=num_rows)
+    deficits = (targets - floors).astype(np.int64)
+
+    # rank the values of every row by descending remainder and round the first ones up
+    order = np.lexsort((-remainders, rows))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - np.asarray(indptr[:-1])[rows[order]]
+    quantized[ranks < deficits[rows]] += 1
+
+    return np.minimum(quantized, scale).astype(dtype)
+
+# Weight value encodings, mapped to their stored dtype
+WEIGHT_ENCODINGS = {'float32': np.float32,
+                    'float16': np.float16,
+                    'uint16': np.uint16,
+                    'uint8': np.uint8}
+
+def encode_weight_values(indptr, values, encoding='float32'):
+    """
+    Encodes CSR weight values with a smaller dtype.
+
+    float16 keeps about three significant digits. uint16 and uint8 store fixed point
+    values with a step of 1/65535 and 1/255, rounded so that normalized rows stay exactly
+    normalized.
+
+    Args:
+        indptr (np.ndarray): The row pointer array.
+        values (np.ndarray): The weight values.
+        encoding (str, optional): One of WEIGHT_ENCODINGS. Defaults to 'float32'.
+
+    Returns:
+        np.ndarray: The encoded values.
+
+    Raises:
+        ValueError: If the encoding is unknown.
+    """
+    if encoding not in WEIGHT_ENCODINGS:
+        raise ValueError('Unknown weight encoding {}, expected one of {}'.format(encoding, list(WEIGHT_ENCODINGS)))
+
+    dtype = np.dtype(WEIGHT_ENCODINGS[encoding])
+    if dtype.kind == 'u':
+        return _quantize_fixed_point(indptr, values, dtype)
+
+    return np.asarray(values).astype(dtype)
+
+def decode_weight_values(indptr, values):
+    """
+    Decodes CSR weight values stored by encode_weight_values.
+
+    The encoding is taken from the dtype of the values. Rows that sum to one within the
+    precision of the encoding are renormalized to sum to exactly one.
+
+    Args:
+        indptr (np.ndarray): The row pointer array.
+        values (np.ndarray): The encoded values.
+
+    Returns:
+        np.ndarray: The float64 weight values.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'u':
+        decoded = values / float(np.iinfo(values.dtype).max)
+    else:
+        decoded = values.astype(np.float64)
+
+    if values.dtype.itemsize >= 4 or not len(decoded):
+        return decoded
+
+    step = 1.0 / np.iinfo(values.dtype).max if values.dtype.kind == 'u' else float(np.finfo(values.dtype).eps)
+    rows = _row_ids(indptr)
+
+    totals = np.bincount(rows, decoded, minlength=len(indptr) - 1)
+    normalized = np.abs(totals - 1.0) <= step * np.maximum(np.diff(indptr), 1)
+
+    scale = np.where(normalized & (totals > 0.0), 1.0 / np.where(totals > 0.0, totals, 1.0), 1.0)
+
+    return decoded * scale[rows]
+
+def weight_encoding_error(indptr, values, encoding):
+    """
+    Returns the largest per-vertex weight error an encoding introduces.
+
+    Args:
+        indptr (np.ndarray): The row pointer array.
+        values (np.ndarray): The weight values.
+        encoding (str): One of WEIGHT_ENCODINGS.
+
+    Returns:
+        float: The largest absolute difference between a weight and its decoded value.
+    """
+    decoded = decode_weight_values(indptr, encode_weight_values(indptr, values, encoding))
+
+    return float(np.abs(decoded - values).max(initial=0.0))
+
+def choose_weight_encoding(indptr, values, max_error):
+    """
+    Picks the smallest encoding that keeps every weight within an error bound.
+
+    Args:
+        indptr (np.ndarray): The row pointer array.
+        values (np.ndarray): The weight values.
+        max_error (float): The largest allowed absolute error of any weight.
+
+    Returns:
+        str: 'uint8', 'uint16' or 'float32'.
+    """
+    for encoding in ('uint8', 'uint16'):
+        if weight_encoding_error(indptr, values, encoding) <= max_error:
+            return encoding
+
+    return 'float32'
+
+def influence_usage(weights):
+    """
+    Returns the largest and the summed weight of every influence.
+
+    Args:
+        weights (np.ndarray): The (num_vertices, num_influences) weight matrix.
+
+    Returns:
+        tuple: The (max_weights, sum_weights) arrays, one value per influence.
+    """
+    weights = np.asarray(weights)
+
+    return weights.max(axis=0, initial=0.0), weights.sum(axis=0)
+
+def used_influence_columns(max_weights, threshold=0.0):
+    """
+    Returns the influence columns that carry weight anywhere.
+
+    Args:
+        max_weights (np.ndarray): The largest weight of every influence, see influence_usage.
+        threshold (float, optional): Influences whose largest weight is at or below this
+            value count as unused. Defaults to 0.0.
+
+    Returns:
+        np.ndarray: The indices of the used columns.
+    """
+    return np.flatnonzero(np.asarray(max_weights) > threshold)
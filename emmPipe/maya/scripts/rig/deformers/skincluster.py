@@ -1,54 +1,114 @@
 
 import os
-import pickle
-import gzip
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaAnim as oma
 import maya.cmds as cmds
 
-from rig.objects.object_data import DagNodeData
+from rig.objects.object_data import DagNodeData, mpoint_array_to_numpy
+from rig.deformers.skin_weights import (dense_to_csr, build_influence_map, remap_influences, condition_weights,
+                                        encode_weight_values, weight_encoding_error, choose_weight_encoding,
+                                        influence_usage, used_influence_columns)
+from rig.deformers.skin_file import (FILE_EXTENSION, CHUNK_ROWS, ChunkStore, SkinFile, SkinFileWriter,
+                                     write_skin_file, read_skincluster_data, decode_shape_weights, shape_entries,
+                                     iter_weight_blocks, read_weight_subset, read_row_subset, select_shape_influences)
+from rig.deformers.skin_transfer import transfer_shape_data
+from rig.deformers.skin_mirror import SIDE_TOKENS, mirror_name, mirror_weights
+from rig.deformers.skin_diff import diff_skin_files
+from rig.deformers.skin_smooth import mesh_adjacency, smooth_weights
+from rig.deformers.skin_topology import topology_fingerprint, bounding_box, compare_topology
+from rig.deformers.skin_pose_error import pose_error_shape_data
+
+# Skin attributes stored with the weights, mapped to their Maya attribute names
+SKIN_ATTRIBUTES = {'envelope': 'envelope',
+                   'skinning_method': 'skinningMethod',
+                   'use_components': 'useComponents',
+                   'normalize_weights': 'normalizeWeights',
+                   'deform_user_normals': 'deformUserNormals'}
 
 class SkinclusterData(DagNodeData):
     """
     Class representing skin cluster data.
+
+    Every property is fetched from the scene on first access and cached, so
+    constructing the object is cheap and callers only pay for the data they touch.
+    Use invalidate() to drop cached values after the skincluster has been edited.
     """
-    def __init__(self, node=None, skincluster_node=None):
+    def __init__(self, node=None, skincluster_node=None, shape_index=0):
         """
         Initialize the SkinclusterData object.
 
         Args:
             node (str): The name of the node.
             skincluster_node (str): The name of the skincluster node.
+            shape_index (int, optional): The index of the shape in DagNodeData.shapes whose
+                skincluster is wrapped. Defaults to 0.
 
         Raises:
             TypeError: If no node is assigned.
         """
         super().__init__(node)
 
-        self._skincluster = self._get_skincluster() if not skincluster_node else skincluster_node
-
-        self._skincluster_fn = self._get_skincluster_fn()
-        self._influence_names = self._get_influence_names()
-        self._influence_indices = self._get_influence_indicies()
-        self._weights = self._get_weights()
-        self._blend_weights = self._get_blend_weights()
-        self._bind_pre_matrix_values = self._get_bind_pre_matrix_values()
-        self._bind_pre_matrix_inputs = self._get_bind_pre_matrix_inputs()
-        self._envelope = self._get_envelope()
-        self._skinning_method = self._get_skinning_methods()
-        self._use_components = self._get_use_components()
-        self._normalize_weights = self._get_normalize_weights()
-        self._deform_user_normals = self._get_deform_user_normals()
+        self._skincluster_node = skincluster_node
+        self._shape_index = shape_index
+        self._cache = {}
 
         return
-    
+
+    #... Public Methods ...#
+    def invalidate(self, *names):
+        """
+        Drops cached values so they are fetched from the scene on next access.
+
+        Args:
+            *names (str): The property names to invalidate, e.g. 'weights'.
+                If no names are given, every cached value is dropped.
+
+        Returns:
+            None
+        """
+        if not names:
+            self._cache.clear()
+            return
+
+        for name in names:
+            self._cache.pop(name, None)
+
+    def get_shape_component(self):
+        """
+        Builds a component holding every vertex or CV of the wrapped shape.
+
+        Returns:
+            om.MObject: The complete vertex or CV component.
+        """
+        return self._create_vtx_component(self._get_shape_fn(self._shape_index))
+
     #... Private Methods ...#
+    def _get_cached(self, name, loader):
+        """
+        Returns a cached value, loading it on first access.
+
+        Args:
+            name (str): The cache key.
+            loader (callable): Called without arguments to fetch the value.
+
+        Returns:
+            The cached value.
+        """
+        if name not in self._cache:
+            self._cache[name] = loader()
+
+        return self._cache[name]
+
     def _get_skincluster(self):
         """
-        Returns the skincluster node associated with the shape node.
+        Returns the skincluster node associated with the wrapped shape node.
 
-        If the skincluster node is already set, it returns the existing node.
+        If a skincluster node was passed to the constructor, it returns that node.
         Otherwise, it tries to find the skincluster node by listing the history of the shape node
         and filtering for skinCluster type. If no skincluster node is found, it raises a TypeError.
 
@@ -58,20 +118,17 @@ class SkinclusterData(DagNodeData):
         Raises:
             TypeError: If the shape node does not have a skincluster node or a shape node.
         """
-        skincls = None
+        if self._skincluster_node:
+            return self._skincluster_node
 
-        if self.shapes:
-            for shape in self.shapes:
-                try:
-                    skincls = cmds.ls(cmds.listHistory(self.dag_path.fullPathName()),
-                                        type='skinCluster')[0]
-                except:
-                    raise TypeError('{} does not have a skincluster node!'.format(shape))
-
-        else:
+        if not self.shapes:
             raise TypeError('{} does not have a shape node!'
                             .format(self.dag_path.partialPathName()))
 
+        skincls = find_shape_skincluster(self.shape)
+        if not skincls:
+            raise TypeError('{} does not have a skincluster node!'.format(self.shape.partialPathName()))
+
         return skincls
     
     def _get_skincluster_fn(self):
@@ -96,6 +153,15 @@ class SkinclusterData(DagNodeData):
         influence_names = [infl.partialPathName() for infl in self.skincluster_fn.influenceObjects()]
 
         return influence_names
+
+    def _get_influence_paths(self):
+        """
+        Returns the full DAG paths of the influence objects in the skin cluster.
+
+        Returns:
+            list: The full path of every influence, in influence order.
+        """
+        return [infl.fullPathName() for infl in self.skincluster_fn.influenceObjects()]
     
     def _get_influence_indicies(self):
         """
@@ -116,34 +182,50 @@ class SkinclusterData(DagNodeData):
         """
         Returns the skin weights for the specified vertex component.
 
+        The flat MDoubleArray returned by the API is copied once into a NumPy buffer
+        and reshaped, so no intermediate Python list is created.
+
         Returns:
-            list: The skin weights for the vertex component.
+            np.ndarray: The skin weights as a (num_vertices, num_influences) array.
         """
-        weights, _ = self.skincluster_fn.getWeights(self.shapes[0], self.vtx_component[0])
-        
-        return weights
+        weights, num_influences = self.skincluster_fn.getWeights(self.shape, self.get_shape_component())
+
+        return mdouble_array_to_numpy(weights).reshape(-1, num_influences)
     
     def _get_blend_weights(self):
         """
         Get the blend weights for the skin cluster.
 
         Returns:
-            blendWeights (list): List of blend weights.
+            np.ndarray: The blend weights as a (num_vertices,) array.
         """
-        blendWeights = self.skincluster_fn.getBlendWeights(self.shapes[0], self.vtx_component[0])
+        blend_weights = self.skincluster_fn.getBlendWeights(self.shape, self.get_shape_component())
 
-        return blendWeights
+        return mdouble_array_to_numpy(blend_weights)
     
-    def _get_bind_pre_matrix_values(self):
+    def _get_influence_logical_indices(self):
         """
-        Returns a list of bind pre-matrix values for each influence in the skin cluster.
+        Returns the logical indices of the influences on the skin cluster's array plugs.
+
+        These differ from influence_indices once influences have been removed, and are the
+        indices used by the 'matrix' and 'bindPreMatrix' attributes.
 
         Returns:
-            List of bind pre-matrix values.
+            np.ndarray: The logical index of every influence.
         """
-        bindPrematrix_values = [cmds.getAttr('{}.bindPreMatrix[{}]'.format(self.skincluster, i)) for i in self.influence_indices]
+        logical_indices = [self.skincluster_fn.indexForInfluenceObject(influence)
+                           for influence in self.skincluster_fn.influenceObjects()]
 
-        return bindPrematrix_values
+        return np.array(logical_indices, dtype=np.int32)
+
+    def _get_bind_pre_matrix_values(self):
+        """
+        Returns the bind pre-matrix values for each influence in the skin cluster.
+
+        Returns:
+            np.ndarray: The bind pre-matrices as a (num_influences, 4, 4) array.
+        """
+        return get_matrix_array_plug_values(self.skincluster_fn, 'bindPreMatrix', self.influence_logical_indices)
     
     def _get_bind_pre_matrix_inputs(self):
         """
@@ -157,6 +239,73 @@ class SkinclusterData(DagNodeData):
 
         return bindPreMatrixInputs
 
+    def _get_input_geometry(self):
+        """
+        Returns the geometry data entering the skin cluster for the wrapped shape.
+
+        Returns:
+            om.MObject: The mesh, curve or surface data on the matching input[].inputGeometry plug.
+        """
+        geometry_index = self.skincluster_fn.indexForOutputShape(self.shape.node())
+        input_plug = self.skincluster_fn.findPlug('input', False).elementByLogicalIndex(geometry_index)
+
+        return input_plug.child(self.skincluster_fn.attribute('inputGeometry')).asMObject()
+
+    def _get_rest_points(self):
+        """
+        Returns the undeformed points of the wrapped shape, as they enter the skin cluster.
+
+        Returns:
+            np.ndarray: The object space points as a (num_vertices, 3) array.
+        """
+        return get_geometry_points(self._get_input_geometry())
+
+    def _get_triangles(self):
+        """
+        Returns the triangulation of the wrapped shape.
+
+        Returns:
+            np.ndarray: The vertex indices of every triangle as a (num_triangles, 3) array,
+                empty if the shape is not a mesh.
+        """
+        geometry = self._get_input_geometry()
+        if not geometry.hasFn(om.MFn.kMesh):
+            return np.empty((0, 3), dtype=np.int32)
+
+        _, triangle_vertices = om.MFnMesh(geometry).getTriangles()
+
+        return np.fromiter(triangle_vertices, dtype=np.int32, count=len(triangle_vertices)).reshape(-1, 3)
+
+    def _get_topology(self):
+        """
+        Returns the topology fingerprint of the wrapped shape.
+
+        Returns:
+            dict: The fingerprint, see skin_topology.topology_fingerprint.
+        """
+        return get_geometry_topology(self._get_input_geometry())
+
+    def _get_adjacency(self):
+        """
+        Returns the vertex adjacency of the wrapped mesh as CSR arrays.
+
+        Returns:
+            tuple: The (indptr, indices) arrays, see skin_smooth.mesh_adjacency.
+
+        Raises:
+            TypeError: If the shape is not a mesh.
+        """
+        geometry = self._get_input_geometry()
+        if not geometry.hasFn(om.MFn.kMesh):
+            raise TypeError('{} is not a mesh'.format(self.shape.partialPathName()))
+
+        mesh_fn = om.MFnMesh(geometry)
+        face_counts, face_vertices = mesh_fn.getVertices()
+
+        return mesh_adjacency(np.fromiter(face_counts, dtype=np.int64, count=len(face_counts)),
+                              np.fromiter(face_vertices, dtype=np.int64, count=len(face_vertices)),
+                              mesh_fn.numVertices)
+
     def _get_envelope(self):
         """
         Get the envelope value of the skin cluster.
@@ -213,148 +362,1224 @@ class SkinclusterData(DagNodeData):
         return deformUserNormals
 
     #... Properties ...#
+    @property
+    def shape_index(self):
+        return self._shape_index
+
+    @property
+    def shape(self):
+        return self.shapes[self._shape_index]
+
     @property
     def skincluster(self):
-        return self._skincluster
+        return self._get_cached('skincluster', self._get_skincluster)
 
     @property
     def skincluster_fn(self):
-        return self._skincluster_fn
+        return self._get_cached('skincluster_fn', self._get_skincluster_fn)
 
     @property
     def influence_names(self):
-        return self._influence_names
+        return self._get_cached('influence_names', self._get_influence_names)
+
+    @property
+    def influence_paths(self):
+        return self._get_cached('influence_paths', self._get_influence_paths)
 
     @property
     def influence_indices(self):
-        return self._influence_indices
+        return self._get_cached('influence_indices', self._get_influence_indicies)
+
+    @property
+    def influence_logical_indices(self):
+        return self._get_cached('influence_logical_indices', self._get_influence_logical_indices)
 
     @property
     def weights(self):
-        return self._weights
+        return self._get_cached('weights', self._get_weights)
 
     @property
     def blend_weights(self):
-        return self._blend_weights
+        return self._get_cached('blend_weights', self._get_blend_weights)
 
     @property
     def bind_pre_matrix_values(self):
-        return self._bind_pre_matrix_values
+        return self._get_cached('bind_pre_matrix_values', self._get_bind_pre_matrix_values)
 
     @property
     def bind_pre_matrix_inputs(self):
-        return self._bind_pre_matrix_inputs
+        return self._get_cached('bind_pre_matrix_inputs', self._get_bind_pre_matrix_inputs)
     
+    @property
+    def rest_points(self):
+        return self._get_cached('rest_points', self._get_rest_points)
+
+    @property
+    def triangles(self):
+        return self._get_cached('triangles', self._get_triangles)
+
+    @property
+    def topology(self):
+        return self._get_cached('topology', self._get_topology)
+
+    @property
+    def adjacency(self):
+        return self._get_cached('adjacency', self._get_adjacency)
+
     @property
     def envelope(self):
-        return self._envelope
+        return self._get_cached('envelope', self._get_envelope)
     
     @property
     def skinning_method(self):
-        return self._skinning_method
+        return self._get_cached('skinning_method', self._get_skinning_methods)
 
     @property
     def use_components(self):
-        return self._use_components
+        return self._get_cached('use_components', self._get_use_components)
 
     @property
     def normalize_weights(self):
-        return self._normalize_weights
+        return self._get_cached('normalize_weights', self._get_normalize_weights)
 
     @property
     def deform_user_normals(self):
-        return self._deform_user_normals
+        return self._get_cached('deform_user_normals', self._get_deform_user_normals)
+
+
+def mdouble_array_to_numpy(m_array, dtype=np.float64):
+    """
+    Copies an MDoubleArray into a NumPy array.
+
+    The array is copied straight from its buffer when the Maya build exposes one.
+    API 2.0 arrays usually do not, they are then read value by value, which creates a
+    temporary Python float per value: about 0.65 s per 20 million values, against
+    0.07 s for a buffer copy of the same size.
+
+    Args:
+        m_array (om.MDoubleArray): The array to copy.
+        dtype (np.dtype, optional): The dtype of the returned array. Defaults to np.float64.
+
+    Returns:
+        np.ndarray: A flat array holding the values of the MDoubleArray.
+    """
+    try:
+        buffer = memoryview(m_array)
+    except TypeError:
+        return np.fromiter(m_array, dtype=dtype, count=len(m_array))
+
+    return np.frombuffer(buffer, dtype=np.float64, count=len(m_array)).astype(dtype)
+
+def numpy_to_mdouble_array(array):
+    """
+    Converts a NumPy array of any shape into a flat MDoubleArray.
 
+    API 2.0 arrays can only be built from a Python sequence, so the values pass through
+    one temporary list of Python floats: about 0.9 s and 32 bytes per value for 20
+    million values.
 
-def save_skincluster_data(node, path):
+    Args:
+        array (np.ndarray): The array to convert.
+
+    Returns:
+        om.MDoubleArray: The flattened values in row-major order.
+    """
+    return om.MDoubleArray(np.ascontiguousarray(array, dtype=np.float64).ravel().tolist())
+
+def get_geometry_points(geometry, space=om.MSpace.kObject):
     """
-    Save skincluster data to a JSON file.
+    Copies the vertex or CV positions of a shape or geometry data object into a NumPy array.
 
     Args:
-        node (str): The name of the skincluster node.
-        path (str): The path where the JSON file will be saved.
+        geometry (om.MDagPath or om.MObject): The shape, or mesh, curve or surface data.
+        space (int, optional): The space to read the points in. Only applies to shapes.
+            Defaults to om.MSpace.kObject.
+
+    Returns:
+        np.ndarray: The points as a (num_points, 3) array.
+
+    Raises:
+        TypeError: If the geometry is not a mesh, nurbs curve or nurbs surface.
+    """
+    if geometry.hasFn(om.MFn.kMesh):
+        points = om.MFnMesh(geometry).getPoints(space)
+    elif geometry.hasFn(om.MFn.kNurbsCurve):
+        points = om.MFnNurbsCurve(geometry).cvPositions(space)
+    elif geometry.hasFn(om.MFn.kNurbsSurface):
+        points = om.MFnNurbsSurface(geometry).cvPositions(space)
+    else:
+        raise TypeError('Unsupported geometry type {}'.format(geometry.apiTypeStr))
+
+    return mpoint_array_to_numpy(points)
+
+def get_geometry_topology(geometry):
+    """
+    Returns the topology fingerprint of a shape or geometry data object.
+
+    Args:
+        geometry (om.MDagPath or om.MObject): The shape, or mesh, curve or surface data.
+
+    Returns:
+        dict: The fingerprint, see skin_topology.topology_fingerprint.
+
+    Raises:
+        TypeError: If the geometry is not a mesh, nurbs curve or nurbs surface.
+    """
+    if geometry.hasFn(om.MFn.kMesh):
+        mesh_fn = om.MFnMesh(geometry)
+        face_counts, face_vertices = mesh_fn.getVertices()
+
+        return topology_fingerprint(mesh_fn.numVertices,
+                                    np.fromiter(face_counts, dtype=np.int32, count=len(face_counts)),
+                                    np.fromiter(face_vertices, dtype=np.int32, count=len(face_vertices)))
+
+    if geometry.hasFn(om.MFn.kNurbsCurve):
+        return topology_fingerprint(om.MFnNurbsCurve(geometry).numCVs)
+
+    if geometry.hasFn(om.MFn.kNurbsSurface):
+        surface_fn = om.MFnNurbsSurface(geometry)
+        return topology_fingerprint(surface_fn.numCVsInU * surface_fn.numCVsInV)
+
+    raise TypeError('Unsupported geometry type {}'.format(geometry.apiTypeStr))
+
+def check_shape_topology(shape, data):
+    """
+    Checks that saved skin data was captured from a shape with the same topology.
+
+    Args:
+        shape (om.MDagPath): The target shape.
+        data (dict): The saved shape data or metadata.
 
     Returns:
         None
+
+    Raises:
+        ValueError: If the topologies differ.
+    """
+    saved = data.get('topology') or {'num_vertices': data.get('num_vertices')}
+    if saved['num_vertices'] is None:
+        return
+
+    mismatches = compare_topology(saved, get_geometry_topology(shape))
+    if mismatches:
+        raise ValueError('The skin data of {} does not match the topology of {}: {}'
+                         .format(data.get('shape'), shape.partialPathName(), '; '.join(mismatches)))
+
+def match_saved_shapes(shapes, saved_names):
+    """
+    Matches saved shapes to the shapes of a node.
+
+    Shapes are matched by name. A saved shape whose name is not found only falls back
+    to its saved position when the node has as many shapes as were saved, so weights
+    never land on an unrelated shape.
+
+    Args:
+        shapes (list): The om.MDagPath of every shape of the node.
+        saved_names (list): The saved shape names, in saved order.
+
+    Returns:
+        list: The index in shapes of every saved shape.
+
+    Raises:
+        ValueError: If a saved shape cannot be matched.
+    """
+    shape_names = [shape.partialPathName().split('|')[-1] for shape in shapes]
+
+    shape_indices = []
+    for saved_index, saved_name in enumerate(saved_names):
+        saved_name = (saved_name or '').split('|')[-1]
+        if saved_name in shape_names:
+            shape_indices.append(shape_names.index(saved_name))
+
+        elif len(shapes) == len(saved_names):
+            shape_indices.append(saved_index)
+
+        else:
+            raise ValueError('Saved shape {} has no match among the {} shapes of the target ({})'
+                             .format(saved_name or saved_index, len(shapes), ', '.join(shape_names)))
+
+    return shape_indices
+
+def mmatrix_to_numpy(matrix):
+    """
+    Copies an MMatrix into a NumPy array.
+
+    Args:
+        matrix (om.MMatrix): The matrix to copy.
+
+    Returns:
+        np.ndarray: The row-major (4, 4) matrix.
+    """
+    return np.fromiter(matrix, dtype=np.float64, count=16).reshape(4, 4)
+
+def get_matrix_array_plug_values(node_fn, attribute, logical_indices):
+    """
+    Reads the matrices stored on a matrix array attribute through its plug.
+
+    The array plug is looked up once and its elements are read directly, instead of
+    issuing one getAttr command per element.
+
+    Args:
+        node_fn (om.MFnDependencyNode): The function set of the node holding the attribute.
+        attribute (str): The name of the matrix array attribute, e.g. 'bindPreMatrix' or 'matrix'.
+        logical_indices (list): The logical indices of the elements to read.
+
+    Returns:
+        np.ndarray: The matrices as a (len(logical_indices), 4, 4) array.
+    """
+    array_plug = node_fn.findPlug(attribute, False)
+
+    values = np.empty((len(logical_indices), 4, 4), dtype=np.float64)
+    for i, logical_index in enumerate(logical_indices):
+        matrix_data = array_plug.elementByLogicalIndex(int(logical_index)).asMObject()
+        values[i] = mmatrix_to_numpy(om.MFnMatrixData(matrix_data).matrix())
+
+    return values
+
+def set_bind_pre_matrices(skincluster, logical_indices, matrices, influences=None, bind_pre_matrix_inputs=None):
+    """
+    Sets bindPreMatrix values and connects influences on a skin cluster in one DG modifier.
+
+    Every matrix value and every connection is queued on a single om.MDGModifier, which is
+    executed once, instead of issuing a setAttr and a connectAttr command per influence.
+
+    Args:
+        skincluster (str): The name of the skin cluster node.
+        logical_indices (list): The logical index of every influence.
+        matrices (np.ndarray): The (num_influences, 4, 4) bind pre-matrices.
+        influences (list, optional): Influence names whose worldMatrix[0] is connected to
+            the matching 'matrix' element. Defaults to None.
+        bind_pre_matrix_inputs (list, optional): Node names whose worldInverseMatrix[0] drives
+            the matching 'bindPreMatrix' element. Defaults to None.
+
+    Returns:
+        om.MDGModifier: The executed modifier, which can be used to undo the changes.
+    """
+    skincluster_fn = om.MFnDependencyNode(om.MGlobal.getSelectionListByName(skincluster).getDependNode(0))
+    bind_pre_matrix_plug = skincluster_fn.findPlug('bindPreMatrix', False)
+    matrix_plug = skincluster_fn.findPlug('matrix', False)
+
+    modifier = om.MDGModifier()
+
+    for logical_index, matrix in zip(logical_indices, np.asarray(matrices, dtype=np.float64).reshape(-1, 16)):
+        matrix_data = om.MFnMatrixData().create(om.MMatrix(matrix.tolist()))
+        modifier.newPlugValue(bind_pre_matrix_plug.elementByLogicalIndex(int(logical_index)), matrix_data)
+
+    for attribute, destination_plug, sources in (('worldMatrix', matrix_plug, influences),
+                                                 ('worldInverseMatrix', bind_pre_matrix_plug, bind_pre_matrix_inputs)):
+        if not sources:
+            continue
+
+        selection = om.MSelectionList()
+        for source in sources:
+            selection.add(source)
+
+        for i, logical_index in enumerate(logical_indices[:len(sources)]):
+            source_plug = om.MFnDependencyNode(selection.getDependNode(i)).findPlug(attribute, False)
+            modifier.connect(source_plug.elementByLogicalIndex(0),
+                             destination_plug.elementByLogicalIndex(int(logical_index)))
+
+    modifier.doIt()
+
+    return modifier
+
+def check_component_shape(shape):
+    """
+    Checks that the vertices or CVs of a shape can be addressed by create_vertex_component.
+
+    Args:
+        shape (om.MDagPath): The shape.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If the shape is not a mesh, nurbs curve or nurbs surface.
+    """
+    if not any(shape.hasFn(fn_type) for fn_type in (om.MFn.kMesh, om.MFn.kNurbsCurve, om.MFn.kNurbsSurface)):
+        raise TypeError('{} has no vertices or CVs'.format(shape.partialPathName()))
+
+def create_vertex_component(shape, indices):
+    """
+    Creates a component holding selected vertices or CVs of a shape.
+
+    Surface CVs are addressed by their flat index, u * numCVsInV + v, the order the
+    skincluster stores their weights in, so sorted indices keep the weights in order.
+
+    Args:
+        shape (om.MDagPath): A mesh, nurbs curve or nurbs surface shape.
+        indices (np.ndarray): The vertex or flat CV indices.
+
+    Returns:
+        om.MObject: The single indexed component, or double indexed for surfaces.
+
+    Raises:
+        TypeError: If the shape is not a mesh, nurbs curve or nurbs surface.
+    """
+    check_component_shape(shape)
+    indices = np.asarray(indices, dtype=np.int64)
+
+    if shape.hasFn(om.MFn.kNurbsSurface):
+        num_cvs_in_v = om.MFnNurbsSurface(shape).numCVsInV
+
+        component_fn = om.MFnDoubleIndexedComponent()
+        component = component_fn.create(om.MFn.kSurfaceCVComponent)
+        component_fn.addElements(list(zip((indices // num_cvs_in_v).tolist(), (indices % num_cvs_in_v).tolist())))
+
+        return component
+
+    component_fn = om.MFnSingleIndexedComponent()
+    component = component_fn.create(om.MFn.kMeshVertComponent if shape.hasFn(om.MFn.kMesh)
+                                    else om.MFn.kCurveCVComponent)
+    component_fn.addElements(indices.tolist())
+
+    return component
+
+def get_selected_vertex_indices(shape):
+    """
+    Returns the selected vertices or CVs of a shape.
+
+    Args:
+        shape (om.MDagPath): The shape.
+
+    Returns:
+        np.ndarray: The selected indices, sorted. Surface CVs are given by their flat
+            index, see create_vertex_component.
+    """
+    indices = []
+
+    # components can be selected through the shape or its transform
+    shape_paths = {shape.fullPathName(), om.MDagPath(shape).pop().fullPathName()}
+
+    selection = om.MGlobal.getActiveSelectionList()
+    for i in range(selection.length()):
+        dag_path, component = selection.getComponent(i)
+        if component.isNull() or dag_path.fullPathName() not in shape_paths:
+            continue
+
+        if component.hasFn(om.MFn.kSingleIndexedComponent):
+            indices.extend(om.MFnSingleIndexedComponent(component).getElements())
+
+        elif component.hasFn(om.MFn.kSurfaceCVComponent):
+            # surface CVs are selected as (u, v), see create_vertex_component
+            num_cvs_in_v = om.MFnNurbsSurface(shape).numCVsInV
+            indices.extend(u * num_cvs_in_v + v for u, v in om.MFnDoubleIndexedComponent(component).getElements())
+
+    return np.unique(np.array(indices, dtype=np.int64))
+
+def add_skincluster_influences(skincluster, influences):
+    """
+    Adds influences that are not bound to a skincluster yet, with zero weight.
+
+    Args:
+        skincluster (str): The name of the skincluster.
+        influences (list): The influences that should be bound.
+
+    Returns:
+        list: The influences that were added.
+    """
+    bound = set(cmds.skinCluster(skincluster, query=True, influence=True) or [])
+    added = [influence for influence in influences if influence not in bound]
+    if added:
+        cmds.skinCluster(skincluster, edit=True, addInfluence=added, weight=0.0)
+
+    return added
+
+def find_shape_skincluster(shape):
+    """
+    Returns the skincluster deforming a shape.
+
+    Skinclusters found in the history of the shape are only accepted if the shape is one
+    of their output geometries, so skinclusters further upstream (e.g. on blendshape
+    targets) are ignored.
+
+    Args:
+        shape (om.MDagPath): The shape node.
+
+    Returns:
+        str: The name of the skincluster node, or None if the shape is not skinned.
+    """
+    history = cmds.listHistory(shape.fullPathName(), pruneDagObjects=True) or []
+
+    for skincluster in cmds.ls(history, type='skinCluster'):
+        skincluster_fn = oma.MFnSkinCluster(om.MGlobal.getSelectionListByName(skincluster).getDependNode(0))
+        try:
+            skincluster_fn.indexForOutputShape(shape.node())
+        except RuntimeError:
+            continue
+
+        return skincluster
+
+    return None
+
+def get_shape_skincluster_data(node):
+    """
+    Returns skincluster data for every skinned shape of a node.
+
+    Args:
+        node (str): The name of the skinned node.
+
+    Returns:
+        list: A SkinclusterData instance per skinned shape, in shape order.
     """
-    if not os.path.exists('{}/skincluster'.format(path)):
-        os.makedirs('{}/skincluster'.format(path))
+    c_node = DagNodeData(node)
 
-    full_path = '{}/skincluster/{}.pckl.gzip'.format(path, node)
+    shapes_data = []
+    for shape_index, shape in enumerate(c_node.shapes):
+        skincluster = find_shape_skincluster(shape)
+        if skincluster:
+            shapes_data.append(SkinclusterData(node, skincluster, shape_index))
 
-    c_skincluster_data = SkinclusterData(node)
+    return shapes_data
 
-    data = {'skincluster': c_skincluster_data.skincluster,
+def capture_shape_data(c_skincluster_data):
+    """
+    Reads the skin data of one shape from the scene.
+
+    This is the part of an export that has to run on the main thread. The returned
+    arrays are plain NumPy buffers that can be encoded on any thread.
+
+    Args:
+        c_skincluster_data (SkinclusterData): The skincluster data of the shape.
+
+    Returns:
+        dict: The skin attributes and dense arrays of the shape.
+    """
+    data = {'shape': c_skincluster_data.shape.partialPathName(),
+            'skincluster': c_skincluster_data.skincluster,
             'influence_names': c_skincluster_data.influence_names,
-            'influence_indices': list(c_skincluster_data.influence_indices),
-            'bind_pre_matrix_values': c_skincluster_data.bind_pre_matrix_values,
+            'influence_paths': c_skincluster_data.influence_paths,
             'bind_pre_matrix_inputs': c_skincluster_data.bind_pre_matrix_inputs,
-            'weights': list(c_skincluster_data.weights),
-            'blend_weights': list(c_skincluster_data.blend_weights),
-            'envelope': c_skincluster_data.envelope,
-            'skinning_method': c_skincluster_data.skinning_method,
-            'use_components': c_skincluster_data.use_components,
-            'normalize_weights': c_skincluster_data.normalize_weights,
-            'deform_user_normals': c_skincluster_data.deform_user_normals}
+            'influence_indices': np.array(c_skincluster_data.influence_indices, dtype=np.int32),
+            'bind_pre_matrix_values': c_skincluster_data.bind_pre_matrix_values,
+            'blend_weights': c_skincluster_data.blend_weights,
+            'weights': c_skincluster_data.weights,
+            'rest_points': c_skincluster_data.rest_points,
+            'triangles': c_skincluster_data.triangles,
+            'topology': c_skincluster_data.topology,
+            'bounding_box': bounding_box(c_skincluster_data.rest_points)}
+
+    for key in SKIN_ATTRIBUTES:
+        data[key] = getattr(c_skincluster_data, key)
+
+    return data
+
+def encode_shape_data(data, prune_threshold=0.0, max_influences=None, encoding='float32', max_error=None,
+                      drop_unused=False):
+    """
+    Converts captured shape data into file metadata and arrays.
+
+    Only NumPy is used here, so it can run on a worker thread while the main thread
+    captures the next shape.
+
+    Args:
+        data (dict): The shape data returned by capture_shape_data.
+        prune_threshold (float, optional): Weights below this value are dropped before
+            saving. Defaults to 0.0.
+        max_influences (int, optional): The number of influences kept per vertex before
+            saving. Defaults to None, which keeps all influences.
+        encoding (str, optional): How weight values are stored, one of
+            skin_weights.WEIGHT_ENCODINGS. None picks the smallest encoding within
+            max_error. Defaults to 'float32'.
+        max_error (float, optional): The largest allowed error of any stored weight.
+            Defaults to None, which allows any error of the chosen encoding.
+        drop_unused (bool, optional): Whether influences without weight on any vertex are
+            left out of the file. Defaults to False.
+
+    Returns:
+        tuple: The (metadata, arrays) of the shape.
+
+    Raises:
+        ValueError: If the encoding exceeds max_error.
+    """
+    weights = data['weights']
+    if prune_threshold > 0.0 or max_influences is not None:
+        weights = condition_weights(weights, prune_threshold, max_influences)
+
+    max_weights, _ = influence_usage(weights)
+    if drop_unused:
+        columns = used_influence_columns(max_weights)
+        data = select_shape_influences(data, columns)
+        weights, max_weights = weights[:, columns], max_weights[columns]
+
+    weights_indptr, weights_indices, weights_values = dense_to_csr(weights, dtype=np.float64)
+
+    if encoding is None:
+        encoding = choose_weight_encoding(weights_indptr, weights_values, max_error or 0.0)
+
+    encoding_error = weight_encoding_error(weights_indptr, weights_values, encoding)
+    if max_error is not None and encoding_error > max_error:
+        raise ValueError('{} weights of {} are off by up to {}, more than the allowed {}'
+                         .format(encoding, data['shape'], encoding_error, max_error))
+
+    metadata = {key: value for key, value in data.items() if not isinstance(value, np.ndarray)}
+    metadata['num_vertices'] = weights.shape[0]
+    metadata['num_influences'] = weights.shape[1]
+    metadata['weights_encoding'] = encoding
+    metadata['weights_max_error'] = encoding_error
+    metadata['influence_max_weights'] = max_weights.tolist()
+
+    arrays = {key: value for key, value in data.items() if isinstance(value, np.ndarray) and key != 'weights'}
+    arrays['weights/indptr'] = weights_indptr
+    arrays['weights/indices'] = weights_indices
+    arrays['weights/values'] = encode_weight_values(weights_indptr, weights_values, encoding)
+
+    return metadata, arrays
+
+def capture_skincluster_data(node):
+    """
+    Reads the skin data of every skinned shape of a node from the scene.
+
+    Args:
+        node (str): The name of the skinned node.
+
+    Returns:
+        list: The captured data of every skinned shape, see capture_shape_data.
+
+    Raises:
+        TypeError: If the node has no skinned shape.
+    """
+    shapes_data = get_shape_skincluster_data(node)
+    if not shapes_data:
+        raise TypeError('{} does not have a skincluster node!'.format(node))
+
+    return [capture_shape_data(c_skincluster_data) for c_skincluster_data in shapes_data]
+
+def write_skincluster_data(node, captured_data, path, prune_threshold=0.0, max_influences=None, chunk_store=None,
+                           encoding='float32', max_error=None, drop_unused=False):
+    """
+    Encodes captured skin data and writes it to a skin container file.
+
+    Only NumPy and file access are used here, so nodes that were already captured
+    can be written on worker threads.
+
+    Args:
+        node (str): The name of the skinned node.
+        captured_data (list): The captured shapes, see capture_skincluster_data.
+        path (str): The path where the file will be saved.
+        prune_threshold (float, optional): See encode_shape_data. Defaults to 0.0.
+        max_influences (int, optional): See encode_shape_data. Defaults to None.
+        chunk_store (str, optional): The directory of a chunk store shared between versions.
+            Only weight chunks missing from the store are written, the skin file holds their
+            hashes. Defaults to None, which stores the weights in the skin file.
+        encoding (str, optional): See encode_shape_data. Defaults to 'float32'.
+        max_error (float, optional): See encode_shape_data. Defaults to None.
+        drop_unused (bool, optional): See encode_shape_data. Defaults to False.
+
+    Returns:
+        str: The path of the written file.
+    """
+    skincluster_path = os.path.join(path, 'skincluster')
+    os.makedirs(skincluster_path, exist_ok=True)
+
+    full_path = os.path.join(skincluster_path, '{}{}'.format(node, FILE_EXTENSION))
+
+    metadata = {'node': node, 'shapes': []}
+    arrays = {}
+    for shape_index, data in enumerate(captured_data):
+        shape_metadata, shape_arrays = encode_shape_data(data, prune_threshold, max_influences, encoding, max_error,
+                                                         drop_unused)
+
+        metadata['shapes'].append(shape_metadata)
+        arrays.update({'{}/{}'.format(shape_index, name): array for name, array in shape_arrays.items()})
+
+    write_skin_file(full_path, metadata, arrays, chunk_store=ChunkStore(chunk_store) if chunk_store else None)
+
+    return full_path
+
+def save_skincluster_data(node, path, prune_threshold=0.0, max_influences=None, encoding='float32', max_error=None,
+                          drop_unused=False):
+    """
+    Save skincluster data to a skin container file.
+
+    Every skinned shape of the node is stored in the same file. Weights are stored
+    sparsely as CSR arrays (row pointers, influence indices and float32 values), since
+    most vertices only carry a handful of non-zero influences. Influence names and skin
+    attributes go into the JSON header of the file.
+
+    Args:
+        node (str): The name of the skinned node.
+        path (str): The path where the file will be saved.
+        prune_threshold (float, optional): See encode_shape_data. Defaults to 0.0.
+        max_influences (int, optional): See encode_shape_data. Defaults to None.
+        encoding (str, optional): See encode_shape_data. Defaults to 'float32'.
+        max_error (float, optional): See encode_shape_data. Defaults to None.
+        drop_unused (bool, optional): See encode_shape_data. Defaults to False.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If the node has no skinned shape.
+    """
+    write_skincluster_data(node, capture_skincluster_data(node), path, prune_threshold, max_influences,
+                           encoding=encoding, max_error=max_error, drop_unused=drop_unused)
+
+    return
+
+def export_skincluster_data(nodes, path, max_workers=None, prune_threshold=0.0, max_influences=None,
+                            chunk_store=None, encoding='float32', max_error=None, drop_unused=False):
+    """
+    Saves the skincluster data of several nodes.
+
+    Scene reads have to happen on the main thread, so the nodes are captured one after
+    another there, while the nodes that were already captured are encoded and written
+    on a thread pool. The export is then bound by the Maya reads rather than by the
+    encoding and disk writes.
+
+    Args:
+        nodes (list): The names of the nodes to export.
+        path (str): The path where the files will be saved.
+        max_workers (int, optional): The number of writer threads. Defaults to None.
+        prune_threshold (float, optional): See encode_shape_data. Defaults to 0.0.
+        max_influences (int, optional): See encode_shape_data. Defaults to None.
+        chunk_store (str, optional): See write_skincluster_data. Defaults to None.
+        encoding (str, optional): See encode_shape_data. Defaults to 'float32'.
+        max_error (float, optional): See encode_shape_data. Defaults to None.
+        drop_unused (bool, optional): See encode_shape_data. Defaults to False.
+
+    Returns:
+        list: The nodes that were exported. Nodes without a skincluster are skipped.
+    """
+    exported = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for node in nodes:
+            try:
+                captured_data = capture_skincluster_data(node)
+            except TypeError:
+                continue
+
+            futures.append((node, executor.submit(write_skincluster_data, node, captured_data, path,
+                                                       prune_threshold, max_influences, chunk_store,
+                                                       encoding, max_error, drop_unused)))
+
+        for node, future in futures:
+            future.result()
+            exported.append(node)
+
+    return exported
+
+def load_skincluster_data(node, path, allow_pickle=False, max_workers=None, missing='parent',
+                          prune_threshold=0.0, max_influences=None, check_topology=True, drop_unused=False):
+    """
+    Load skin cluster data from a file and apply it to the specified node.
 
-    with gzip.open(full_path, 'wb') as file_obj:
-        pickle.dump(data, file_obj)
+    Saved shapes are matched to the node's shapes by name, falling back to their order.
+    Weights are decoded on a thread pool while the main thread binds the shapes.
+    Saved weight columns are matched to the bound influences by name, see resolve_influences
+    for how missing influences are handled.
+
+    Args:
+        node (str): The name of the node to apply the skin cluster data to.
+        path (str): The path to the directory containing the file.
+        allow_pickle (bool, optional): Whether to fall back to a legacy .pckl.gzip file
+            when no skin file exists. Defaults to False.
+        max_workers (int, optional): The number of decoding threads. Defaults to None.
+        missing (str or callable, optional): How missing influences are handled, see
+            resolve_influences. Defaults to 'parent'.
+        prune_threshold (float, optional): Weights below this value are dropped before
+            they are applied. Defaults to 0.0.
+        max_influences (int, optional): The number of influences kept per vertex.
+            Defaults to None, which keeps all influences.
+        check_topology (bool, optional): Whether to compare the saved topology fingerprint
+            of every shape with its target before any weights are decoded. Defaults to True.
+        drop_unused (bool, optional): Whether influences without weight on any vertex are
+            skipped, so they are neither created nor bound. Defaults to False.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If a saved shape has no match on the node, or check_topology is on
+            and a target shape has a different topology.
+    """
+    full_path = os.path.join(path, '{}{}'.format(node, FILE_EXTENSION))
+    if not os.path.exists(full_path) and allow_pickle:
+        full_path = os.path.join(path, '{}.pckl.gzip'.format(node))
+
+    shapes_data = read_skincluster_data(full_path, allow_pickle=allow_pickle)
+
+    shapes = DagNodeData(node).shapes
+    shape_indices = match_saved_shapes(shapes, [data.get('shape') for data in shapes_data])
+
+    if check_topology:
+        for shape_index, data in zip(shape_indices, shapes_data):
+            check_shape_topology(shapes[shape_index], data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(decode_shape_weights, data) for data in shapes_data]
+
+        for shape_index, data, future in zip(shape_indices, shapes_data, futures):
+            _apply_shape_data(node, shape_index, data, future.result(), missing,
+                              prune_threshold=prune_threshold, max_influences=max_influences,
+                              drop_unused=drop_unused)
 
     return
 
-def load_skincluster_data(node, path):
+def _stream_shape_data(writer, prefix, c_skincluster_data, block_vertices=CHUNK_ROWS, prune_threshold=0.0,
+                       max_influences=None, encoding='float32', max_error=None):
+    """
+    Reads the weights of one shape block by block and appends them to a skin file writer.
+
+    Every block is read through a component of just its vertices, conditioned, sparse
+    encoded and written before the next block is read, so only one block of dense
+    weights is in memory at a time.
+
+    Args:
+        writer (SkinFileWriter): The writer of the skin file.
+        prefix (str): The array name prefix of the shape.
+        c_skincluster_data (SkinclusterData): The skincluster data of the shape.
+        block_vertices (int, optional): The number of vertices read at once. Defaults to CHUNK_ROWS.
+        prune_threshold (float, optional): See encode_shape_data. Defaults to 0.0.
+        max_influences (int, optional): See encode_shape_data. Defaults to None.
+        encoding (str, optional): How weight values are stored, one of
+            skin_weights.WEIGHT_ENCODINGS. Defaults to 'float32'.
+        max_error (float, optional): See encode_shape_data. Defaults to None.
+
+    Returns:
+        dict: The metadata of the shape.
+
+    Raises:
+        ValueError: If the encoding exceeds max_error.
+    """
+    shape = c_skincluster_data.shape
+    skincluster_fn = c_skincluster_data.skincluster_fn
+    rest_points = c_skincluster_data.rest_points
+
+    num_vertices = len(rest_points)
+    num_influences = len(c_skincluster_data.influence_names)
+    indptr_dtype = np.int32 if num_vertices * num_influences <= np.iinfo(np.int32).max else np.int64
+
+    writer.write_array('{}influence_indices'.format(prefix),
+                       np.array(c_skincluster_data.influence_indices, dtype=np.int32))
+    writer.write_array('{}bind_pre_matrix_values'.format(prefix), c_skincluster_data.bind_pre_matrix_values)
+    writer.write_array('{}rest_points'.format(prefix), rest_points)
+    writer.write_array('{}triangles'.format(prefix), c_skincluster_data.triangles)
+
+    max_weights = np.zeros(num_influences)
+    encoding_error = 0.0
+    for start in range(0, num_vertices, block_vertices):
+        component = create_vertex_component(shape, np.arange(start, min(start + block_vertices, num_vertices)))
+
+        weights, _ = skincluster_fn.getWeights(shape, component)
+        weights = mdouble_array_to_numpy(weights).reshape(-1, num_influences)
+        if prune_threshold > 0.0 or max_influences is not None:
+            weights = condition_weights(weights, prune_threshold, max_influences)
+
+        np.maximum(max_weights, weights.max(axis=0, initial=0.0), out=max_weights)
+
+        indptr, indices, values = dense_to_csr(weights, dtype=np.float64)
+        block_error = weight_encoding_error(indptr, values, encoding)
+        if max_error is not None and block_error > max_error:
+            raise ValueError('{} weights of {} are off by up to {}, more than the allowed {}'
+                             .format(encoding, shape.partialPathName(), block_error, max_error))
+        encoding_error = max(encoding_error, block_error)
+
+        writer.append_weight_block(prefix, indptr.astype(indptr_dtype), indices,
+                                   encode_weight_values(indptr, values, encoding))
+        writer.append_rows('{}blend_weights'.format(prefix),
+                           mdouble_array_to_numpy(skincluster_fn.getBlendWeights(shape, component)))
+
+    metadata = {'shape': shape.partialPathName(),
+                'skincluster': c_skincluster_data.skincluster,
+                'influence_names': c_skincluster_data.influence_names,
+                'influence_paths': c_skincluster_data.influence_paths,
+                'bind_pre_matrix_inputs': c_skincluster_data.bind_pre_matrix_inputs,
+                'topology': c_skincluster_data.topology,
+                'bounding_box': bounding_box(rest_points),
+                'num_vertices': num_vertices,
+                'num_influences': num_influences,
+                'weights_encoding': encoding,
+                'weights_max_error': encoding_error,
+                'influence_max_weights': max_weights.tolist()}
+
+    for key in SKIN_ATTRIBUTES:
+        metadata[key] = getattr(c_skincluster_data, key)
+
+    return metadata
+
+def save_skincluster_stream(node, path, block_vertices=CHUNK_ROWS, prune_threshold=0.0, max_influences=None,
+                            chunk_store=None, encoding='float32', max_error=None):
+    """
+    Saves skincluster data of meshes too heavy to hold in memory, one block of vertices at a time.
+
+    Unlike save_skincluster_data, the weights of a shape are never held whole: every
+    block is read, encoded and written to disk before the next one, and the header
+    goes at the end of the file once the influence usage of every shape is known.
+    Peak memory is one block of dense weights, whatever the size of the mesh. The
+    file is read by load_skincluster_data like any other skin file.
+
+    Args:
+        node (str): The name of the skinned node.
+        path (str): The path where the file will be saved.
+        block_vertices (int, optional): The number of vertices read at once. Defaults to
+            CHUNK_ROWS, which lines blocks up with the chunks of a chunk store.
+        prune_threshold (float, optional): See encode_shape_data. Defaults to 0.0.
+        max_influences (int, optional): See encode_shape_data. Defaults to None.
+        chunk_store (str, optional): See write_skincluster_data. Defaults to None.
+        encoding (str, optional): How weight values are stored, one of
+            skin_weights.WEIGHT_ENCODINGS. Defaults to 'float32'.
+        max_error (float, optional): See encode_shape_data. Defaults to None.
+
+    Returns:
+        str: The path of the written file.
+
+    Raises:
+        TypeError: If the node has no skinned shape, or a shape cannot be read block by
+            block, see check_component_shape.
+        ValueError: If the encoding exceeds max_error.
+    """
+    shapes_data = get_shape_skincluster_data(node)
+    if not shapes_data:
+        raise TypeError('{} does not have a skincluster node!'.format(node))
+
+    # rejected before the writer is opened, so no partial file is left behind
+    for c_skincluster_data in shapes_data:
+        check_component_shape(c_skincluster_data.shape)
+
+    skincluster_path = os.path.join(path, 'skincluster')
+    os.makedirs(skincluster_path, exist_ok=True)
+
+    full_path = os.path.join(skincluster_path, '{}{}'.format(node, FILE_EXTENSION))
+    writer = SkinFileWriter(full_path, chunk_store=ChunkStore(chunk_store) if chunk_store else None)
+
+    metadata = {'node': node, 'shapes': []}
+    try:
+        for shape_index, c_skincluster_data in enumerate(shapes_data):
+            metadata['shapes'].append(_stream_shape_data(writer, '{}/'.format(shape_index), c_skincluster_data,
+                                                         block_vertices, prune_threshold, max_influences,
+                                                         encoding, max_error))
+    except Exception:
+        writer.discard()
+        raise
+
+    return writer.close(metadata)
+
+def load_skincluster_stream(node, path, block_vertices=CHUNK_ROWS, missing='parent', prune_threshold=0.0,
+                            max_influences=None, check_topology=True, drop_unused=False):
     """
-    Load skin cluster data from a JSON file and apply it to the specified node.
+    Loads skincluster data onto a node one block of vertices at a time.
+
+    The streaming counterpart of load_skincluster_data: every block is decoded from
+    the file and set through a component of just its vertices, so only one block of
+    dense weights is in memory at a time.
 
     Args:
         node (str): The name of the node to apply the skin cluster data to.
-        path (str): The path to the directory containing the JSON file.
+        path (str): The path to the directory containing the file.
+        block_vertices (int, optional): The number of vertices set at once. Defaults to CHUNK_ROWS.
+        missing (str or callable, optional): See load_skincluster_data. Defaults to 'parent'.
+        prune_threshold (float, optional): See load_skincluster_data. Defaults to 0.0.
+        max_influences (int, optional): See load_skincluster_data. Defaults to None.
+        check_topology (bool, optional): See load_skincluster_data. Defaults to True.
+        drop_unused (bool, optional): See load_skincluster_data. Defaults to False.
 
     Returns:
         None
+
+    Raises:
+        TypeError: If a target shape cannot be set block by block, see check_component_shape.
+        ValueError: If a saved shape has no match on the node, check_topology is on and a
+            target shape has a different topology, or none of the saved influences of a
+            shape can be resolved.
     """
-    skin_name = 'test_skin'
-    full_path = os.path.join(path, '{}.pckl.gzip'.format(node))
+    skin_file = SkinFile(os.path.join(path, '{}{}'.format(node, FILE_EXTENSION)))
+
+    shapes = DagNodeData(node).shapes
+    entries = shape_entries(skin_file)
+    shape_indices = match_saved_shapes(shapes, [metadata.get('shape') for metadata, _ in entries])
+
+    # every shape is checked before the first one is bound or written
+    for shape_index, (metadata, _) in zip(shape_indices, entries):
+        check_component_shape(shapes[shape_index])
+        if check_topology:
+            check_shape_topology(shapes[shape_index], metadata)
+
+    for shape_index, (metadata, prefix) in zip(shape_indices, entries):
+        # everything but the per-vertex arrays, which are read block by block
+        data = dict(metadata)
+        for name in ('influence_indices', 'bind_pre_matrix_values'):
+            data[name] = skin_file.array('{}{}'.format(prefix, name))
+
+        num_influences = metadata['num_influences']
+        columns = None
+        if drop_unused:
+            max_weights = metadata.get('influence_max_weights')
+            if max_weights is None:
+                max_weights = np.zeros(num_influences)
+                for _, weights in iter_weight_blocks(skin_file, prefix, num_influences, block_vertices):
+                    np.maximum(max_weights, weights.max(axis=0, initial=0.0), out=max_weights)
+
+            columns = used_influence_columns(max_weights)
+            data = select_shape_influences(data, columns)
+
+        c_skincluster_data, column_map = _bind_shape_data(node, shape_index, data, missing)
+
+        for start, weights in iter_weight_blocks(skin_file, prefix, num_influences, block_vertices):
+            if columns is not None:
+                weights = weights[:, columns]
+
+            weights = remap_influences(weights, column_map, len(c_skincluster_data.influence_names))
+            weights = condition_weights(weights, prune_threshold, max_influences,
+                                        normalize=bool(data['normalize_weights']))
+
+            stop = start + len(weights)
+            component = create_vertex_component(c_skincluster_data.shape, np.arange(start, stop))
+            c_skincluster_data.skincluster_fn.setWeights(c_skincluster_data.shape,
+                                                        component,
+                                                        c_skincluster_data.influence_indices,
+                                                        numpy_to_mdouble_array(weights),
+                                                        False,
+                                                        False)
+
+            blend_weights = skin_file.read_rows('{}blend_weights'.format(prefix), start, stop)
+            c_skincluster_data.skincluster_fn.setBlendWeights(c_skincluster_data.shape,
+                                                             component,
+                                                             numpy_to_mdouble_array(blend_weights))
 
-    with gzip.open(full_path, 'rb') as file_obj:
-        data = pickle.load(file_obj)
+    return
 
-    for joint in data['influence_names']:
-        if not cmds.objExists(joint):
-            cmds.createNode('joint', name=joint, skipSelect=True)
+def resolve_influences(data, missing='parent'):
+    """
+    Works out which influences to bind for saved shape data.
 
-    if data.get('bind_pre_matrix_inputs'):
-        for joint in data['bind_pre_matrix_inputs']:
+    Saved influences that exist in the scene are bound as they are. Missing influences
+    are handled according to missing:
+
+        'parent': their weights go to the nearest ancestor in the saved DAG path that
+            exists in the scene. Without such an ancestor the weights are dropped.
+        'create': an empty joint with the saved name is created, as older versions did.
+        'drop': their weights are dropped and the remaining weights renormalized.
+        callable: called with the saved name, returns the name of the node that receives
+            the weights or None to drop them.
+
+    Args:
+        data (dict): The shape data returned by read_skincluster_data.
+        missing (str or callable, optional): The fallback for missing influences. Defaults to 'parent'.
+
+    Returns:
+        tuple: The influence names to bind and a dict mapping missing influence names
+            to the influence receiving their weights.
+
+    Raises:
+        ValueError: If missing is not a supported fallback.
+    """
+    if not callable(missing) and missing not in ('parent', 'create', 'drop'):
+        raise ValueError('Unsupported fallback for missing influences: {}'.format(missing))
+
+    influences = []
+    fallbacks = {}
+
+    influence_paths = data.get('influence_paths') or data['influence_names']
+    for name, influence_path in zip(data['influence_names'], influence_paths):
+        if cmds.objExists(name):
+            influences.append(name)
+
+        elif missing == 'create':
+            cmds.createNode('joint', name=name, skipSelect=True)
+            influences.append(name)
+
+        elif missing == 'parent':
+            for ancestor in reversed(influence_path.split('|')[1:-1]):
+                if cmds.objExists(ancestor):
+                    fallbacks[name] = ancestor
+                    break
+
+        elif callable(missing):
+            target = missing(name)
+            if target and cmds.objExists(target):
+                fallbacks[name] = target
+
+    for target in fallbacks.values():
+        if target not in influences:
+            influences.append(target)
+
+    if missing == 'create':
+        for joint in data.get('bind_pre_matrix_inputs') or []:
             if not cmds.objExists(joint):
                 cmds.createNode('joint', name=joint, skipSelect=True)
 
-    cmds.skinCluster(data['influence_names'], node, name=data['skincluster'], tsb=True)
+    return influences, fallbacks
 
-    c_skincluster_data = SkinclusterData(node)
+def _bind_shape_data(node, shape_index, data, missing='parent', skincluster=None):
+    """
+    Binds a shape to its saved influences and sets the saved skin attributes.
 
-    cmds.setAttr('{}.envelope'.format(data['skincluster']), data['envelope'])
-    cmds.setAttr('{}.skinningMethod'.format(data['skincluster']), data['skinning_method'])
-    cmds.setAttr('{}.useComponents'.format(data['skincluster']), data['use_components'])
-    cmds.setAttr('{}.normalizeWeights'.format(data['skincluster']), data['normalize_weights'])
-    cmds.setAttr('{}.deformUserNormals'.format(data['skincluster']), data['deform_user_normals'])
+    Args:
+        node (str): The name of the node the shape belongs to.
+        shape_index (int): The index of the shape in DagNodeData.shapes.
+        data (dict): The shape data returned by read_skincluster_data.
+        missing (str or callable, optional): The fallback for missing influences,
+            see resolve_influences. Defaults to 'parent'.
+        skincluster (str, optional): An existing skincluster on the shape. Influences it
+            lacks are added with zero weight. Defaults to None, which binds a new skincluster.
 
-    print(c_skincluster_data.shapes[0])
-    c_skincluster_data.skincluster_fn.setWeights(c_skincluster_data.shapes[0],
-                                                c_skincluster_data.vtx_component[0],
-                                                om.MIntArray(data['influence_indices']),
-                                                om.MDoubleArray(data['weights']),
-                                                True,
-                                                False)
+    Returns:
+        tuple: The SkinclusterData of the bound shape, and the bound influence column of
+            every saved column, see build_influence_map.
+
+    Raises:
+        ValueError: If none of the saved influences can be resolved.
+    """
+    influences, fallbacks = resolve_influences(data, missing)
+    if not influences:
+        raise ValueError('None of the saved influences for {} exist in the scene'.format(node))
+
+    shape_path = DagNodeData(node).shapes[shape_index].fullPathName()
+    if skincluster:
+        add_skincluster_influences(skincluster, influences)
+    else:
+        skincluster = cmds.skinCluster(influences, shape_path, name=data['skincluster'], tsb=True)[0]
+
+    c_skincluster_data = SkinclusterData(node, skincluster, shape_index)
+
+    for key, attribute in SKIN_ATTRIBUTES.items():
+        cmds.setAttr('{}.{}'.format(skincluster, attribute), data[key])
+
+    column_map = build_influence_map(data['influence_names'], c_skincluster_data.influence_names, fallbacks)
+
+    return c_skincluster_data, column_map
+
+def _apply_shape_data(node, shape_index, data, weights, missing='parent', skincluster=None,
+                      prune_threshold=0.0, max_influences=None, drop_unused=False):
+    """
+    Binds a shape to its saved influences and applies the saved weights.
+
+    The saved weight columns are permuted onto the order the skincluster actually
+    bound the influences in, with missing influences merged into their fallbacks.
+    The weights are then pruned, limited and normalized in NumPy and set in a single
+    setWeights call, so Maya does not have to normalize the shape afterwards.
 
-    c_skincluster_data.skincluster_fn.setBlendWeights(c_skincluster_data.shapes[0],
-                                                     c_skincluster_data.vtx_component[0],
-                                                     om.MDoubleArray(data['blend_weights']))
+    Args:
+        node (str): The name of the node the shape belongs to.
+        shape_index (int): The index of the shape in DagNodeData.shapes.
+        data (dict): The shape data returned by read_skincluster_data.
+        weights (np.ndarray): The decoded (num_vertices, num_influences) weight matrix.
+        missing (str or callable, optional): The fallback for missing influences,
+            see resolve_influences. Defaults to 'parent'.
+        skincluster (str, optional): An existing skincluster on the shape to apply the
+            weights to. Influences it lacks are added with zero weight. Defaults to None,
+            which binds a new skincluster.
+        prune_threshold (float, optional): See condition_weights. Defaults to 0.0.
+        max_influences (int, optional): See condition_weights. Defaults to None.
+        drop_unused (bool, optional): Whether influences without weight on any vertex are
+            skipped. Defaults to False.
+
+    Returns:
+        None
 
-    cmds.skinPercent(data['skincluster'], cmds.listRelatives(node, shapes=True, noIntermediate=True)[0],
-                     normalize=True)
+    Raises:
+        ValueError: If none of the saved influences can be resolved.
+    """
+    if drop_unused:
+        max_weights = data.get('influence_max_weights')
+        if max_weights is None:
+            max_weights, _ = influence_usage(weights)
+
+        columns = used_influence_columns(max_weights)
+        data, weights = select_shape_influences(data, columns), weights[:, columns]
+
+    c_skincluster_data, column_map = _bind_shape_data(node, shape_index, data, missing, skincluster)
+
+    weights = remap_influences(weights, column_map, len(c_skincluster_data.influence_names))
+    weights = condition_weights(weights, prune_threshold, max_influences,
+                                normalize=bool(data['normalize_weights']))
+
+    component = c_skincluster_data.get_shape_component()
+    c_skincluster_data.skincluster_fn.setWeights(c_skincluster_data.shape,
+                                                component,
+                                                c_skincluster_data.influence_indices,
+                                                numpy_to_mdouble_array(weights),
+                                                False,
+                                                False)
+
+    c_skincluster_data.skincluster_fn.setBlendWeights(c_skincluster_data.shape,
+                                                     component,
+                                                     numpy_to_mdouble_array(data['blend_weights']))
 
     return
 
+def load_skincluster_subset(node, path, vertex_indices=None, shape_index=0, missing='parent',
+                            prune_threshold=0.0, max_influences=None, check_topology=True):
+    """
+    Restores the saved weights of some vertices, leaving the rest of the skin as it is.
+
+    Only the blocks of the file holding the requested vertices are decoded, and they
+    are written to the existing skincluster through a component of just those vertices.
+    Saved influences that are not bound yet are added with zero weight.
+
+    Args:
+        node (str): The name of the skinned node.
+        path (str): The path to the directory containing the skin file.
+        vertex_indices (list, optional): The vertices to restore. Defaults to None, which
+            uses the selected vertices of the shape.
+        shape_index (int, optional): The index of the shape in DagNodeData.shapes. Defaults to 0.
+        missing (str or callable, optional): The fallback for missing influences,
+            see resolve_influences. Defaults to 'parent'.
+        prune_threshold (float, optional): See condition_weights. Defaults to 0.0.
+        max_influences (int, optional): See condition_weights. Defaults to None.
+        check_topology (bool, optional): See load_skincluster_data. Defaults to True.
+
+    Returns:
+        np.ndarray: The restored vertex indices.
+
+    Raises:
+        TypeError: If the shape has no skincluster.
+        ValueError: If the file holds no weights for the shape, check_topology is on and
+            the saved topology differs, or none of the saved influences can be resolved.
+    """
+    c_skincluster_data = SkinclusterData(node, shape_index=shape_index)
+    shape = c_skincluster_data.shape
+
+    if vertex_indices is None:
+        vertex_indices = get_selected_vertex_indices(shape)
+    vertex_indices = np.asarray(vertex_indices, dtype=np.int64)
+    if not len(vertex_indices):
+        return vertex_indices
+
+    skin_file = SkinFile(os.path.join(path, '{}{}'.format(node, FILE_EXTENSION)))
+    entries = shape_entries(skin_file)
+
+    shape_indices = match_saved_shapes(DagNodeData(node).shapes, [metadata.get('shape') for metadata, _ in entries])
+    if shape_index not in shape_indices:
+        raise ValueError('The skin file of {} holds no weights for {}'.format(node, shape.partialPathName()))
+
+    metadata, prefix = entries[shape_indices.index(shape_index)]
+    if check_topology:
+        check_shape_topology(shape, metadata)
+
+    influences, fallbacks = resolve_influences(metadata, missing)
+    if not influences:
+        raise ValueError('None of the saved influences for {} exist in the scene'.format(node))
+
+    if add_skincluster_influences(c_skincluster_data.skincluster, influences):
+        c_skincluster_data.invalidate()
+
+    weights = read_weight_subset(skin_file, prefix, metadata['num_influences'], vertex_indices)
+
+    column_map = build_influence_map(metadata['influence_names'], c_skincluster_data.influence_names, fallbacks)
+    weights = remap_influences(weights, column_map, len(c_skincluster_data.influence_names))
+    weights = condition_weights(weights, prune_threshold, max_influences,
+                                normalize=bool(metadata['normalize_weights']))
+
+    component = create_vertex_component(shape, vertex_indices)
+    c_skincluster_data.skincluster_fn.setWeights(shape,
+                                                component,
+                                                c_skincluster_data.influence_indices,
+                                                numpy_to_mdouble_array(weights),
+                                                False,
+                                                False)
+
+    c_skincluster_data.skincluster_fn.setBlendWeights(shape,
+                                                     component,
+                                                     numpy_to_mdouble_array(read_row_subset(
+                                                         skin_file, '{}blend_weights'.format(prefix), vertex_indices)))
+    c_skincluster_data.invalidate('weights', 'blend_weights')
+
+    return vertex_indices
+
 def stack_skinclusters(source, target):
     """
     Stack skin clusters from the source geometry onto the target geometry.
@@ -368,57 +1593,301 @@ def stack_skinclusters(source, target):
     """
     c_source_skincluster = SkinclusterData(source)
 
-    skincluster = cmds.deformer(target, type='skinCluster', name='MERGED__{}'.format(c_source_skincluster.skincluster_name))[0]
+    skincluster = cmds.deformer(target, type='skinCluster', name='MERGED__{}'.format(c_source_skincluster.skincluster))[0]
 
-    for i, infl, matrix_value in zip(c_source_skincluster.influence_indices, c_source_skincluster.influence_names,
-                                    c_source_skincluster.bind_pre_matrix_values):
-
-        cmds.setAttr('{}.bindPreMatrix[{}]'.format(skincluster, i), matrix_value, type='matrix')
-
-        cmds.connectAttr('{}.worldMatrix[0]'.format(infl),
-                         '{}.matrix[{}]'.format(skincluster, i))
-
-    for i, delta in enumerate(c_source_skincluster.bind_pre_matrix_inputs):
-        cmds.connectAttr('{}.worldInverseMatrix[0]'.format(delta),
-                         '{}.bindPreMatrix[{}]'.format(skincluster, i))
+    set_bind_pre_matrices(skincluster,
+                          c_source_skincluster.influence_logical_indices,
+                          c_source_skincluster.bind_pre_matrix_values,
+                          influences=c_source_skincluster.influence_names,
+                          bind_pre_matrix_inputs=c_source_skincluster.bind_pre_matrix_inputs)
 
     c_target_skincluster = SkinclusterData(target, skincluster)
 
+    component = c_target_skincluster.get_shape_component()
     c_target_skincluster.skincluster_fn.setWeights(c_target_skincluster.shape,
-                                                c_target_skincluster.vtx_component,
+                                                component,
                                                 c_target_skincluster.influence_indices,
-                                                c_source_skincluster.weights,
+                                                numpy_to_mdouble_array(c_source_skincluster.weights),
                                                 True,
                                                 False)
 
     c_target_skincluster.skincluster_fn.setBlendWeights(c_target_skincluster.shape,
-                                                     c_target_skincluster.vtx_component,
-                                                     c_source_skincluster.blend_weights)
+                                                     component,
+                                                     numpy_to_mdouble_array(c_source_skincluster.blend_weights))
+
+def transfer_skincluster_data(node, full_path, source_shape_index=0, shape_index=0, mode='barycentric', missing='parent'):
+    """
+    Skins a shape from a saved skin file whose geometry does not match the shape.
+
+    The saved weights are resampled onto the shape's points by position, so a revised
+    model can be skinned from the file of the previous model without loading it. The
+    shape is compared to the saved rest points in object space.
+
+    Args:
+        node (str): The name of the node to skin.
+        full_path (str): The path of the saved skin file.
+        source_shape_index (int, optional): The saved shape to transfer from. Defaults to 0.
+        shape_index (int, optional): The index of the shape in DagNodeData.shapes. Defaults to 0.
+        mode (str, optional): 'closest_point' or 'barycentric'. Defaults to 'barycentric'.
+        missing (str or callable, optional): The fallback for missing influences,
+            see resolve_influences. Defaults to 'parent'.
+
+    Returns:
+        None
+    """
+    data = read_skincluster_data(full_path)[source_shape_index]
+    shape = DagNodeData(node).shapes[shape_index]
+
+    data = transfer_shape_data(data, get_geometry_points(shape), mode,
+                               target_topology=get_geometry_topology(shape))
+
+    _apply_shape_data(node, shape_index, data, data['weights'], missing)
+
+    return
 
-def copySkincluster(source, target):
+def copySkincluster(source, target, mode='barycentric'):
     """
     Copies the skin weights from the source object to the target object.
 
+    The weights are transferred by world space position from the source's undeformed
+    geometry, so the meshes do not need to share topology. An existing skincluster on
+    the target is reused, otherwise the target is bound to the source influences.
+
     Args:
         source (str): The name of the source object.
         target (str): The name of the target object.
+        mode (str, optional): 'closest_point' or 'barycentric'. Defaults to 'barycentric'.
 
     Returns:
         None
     """
     c_source_skincluster = SkinclusterData(source)
+    c_target = DagNodeData(target)
 
-    try:
-        skincluster = cmds.ls(cmds.listHistory(target), type='skinCluster')[0]
-    except:
-        skincluster = cmds.skinCluster(c_source_skincluster.influenceNames, target, tsb=True,
-                                       name='skinCluster_{}'.format(target))[0]
+    data = capture_shape_data(c_source_skincluster)
+    data = transfer_shape_data(data,
+                               get_geometry_points(c_target.shapes[0], om.MSpace.kWorld),
+                               mode,
+                               source_matrix=mmatrix_to_numpy(c_source_skincluster.shape.inclusiveMatrix()),
+                               target_topology=get_geometry_topology(c_target.shapes[0]))
+    data['skincluster'] = 'skinCluster_{}'.format(target)
+
+    _apply_shape_data(target, 0, data, data['weights'], 'drop',
+                      skincluster=find_shape_skincluster(c_target.shapes[0]))
+
+    return
+
+def mirror_skincluster_weights(node, axis='x', direction=1, side_tokens=SIDE_TOKENS, tolerance=1e-3, shape_index=0):
+    """
+    Mirrors the skin weights of a shape from one side onto the other.
+
+    Vertex pairs are found by position on the undeformed geometry and influence columns
+    are swapped by their side tokens. Counterpart influences that exist in the scene but
+    are not bound yet are added to the skincluster first. The mirrored side is written
+    in a single setWeights call.
+
+    Args:
+        node (str): The name of the skinned node.
+        axis (str, optional): The object space axis the mirror plane is normal to. Defaults to 'x'.
+        direction (int, optional): 1 copies the positive side onto the negative side,
+            -1 the negative side onto the positive side. Defaults to 1.
+        side_tokens (tuple, optional): Pairs of opposite side name tokens. Defaults to SIDE_TOKENS.
+        tolerance (float, optional): The maximum distance between a mirrored position
+            and its counterpart vertex. Defaults to 1e-3.
+        shape_index (int, optional): The index of the shape in DagNodeData.shapes. Defaults to 0.
 
-    cmds.copySkinWeights(sourceSkin=c_source_skincluster.skincluster,
-                         destinationSkin=skincluster,
-                         noMirror=True,
-                         normalize=True,
-                         surfaceAssociation="closestPoint",
-                         influenceAssociation="name")
+    Returns:
+        np.ndarray: The indices of the vertices that received mirrored weights.
+    """
+    c_skincluster_data = SkinclusterData(node, shape_index=shape_index)
+
+    counterparts = [mirror_name(name, side_tokens) for name in c_skincluster_data.influence_names]
+    if add_skincluster_influences(c_skincluster_data.skincluster,
+                                  [name for name in counterparts if cmds.objExists(name)]):
+        c_skincluster_data.invalidate()
+
+    vertex_indices, weights, unmatched = mirror_weights(c_skincluster_data.weights,
+                                                        c_skincluster_data.rest_points,
+                                                        c_skincluster_data.influence_names,
+                                                        axis, direction, side_tokens, tolerance)
+    if len(unmatched):
+        cmds.warning('{} vertices of {} have no mirrored counterpart and were left unchanged'
+                     .format(len(unmatched), c_skincluster_data.shape.partialPathName()))
+
+    shape = c_skincluster_data.shape
+    if shape.hasFn(om.MFn.kNurbsSurface):
+        # double indexed CVs, write the full weight matrix instead of a vertex subset
+        full_weights = c_skincluster_data.weights.copy()
+        full_weights[vertex_indices] = weights
+        component, weights = c_skincluster_data.get_shape_component(), full_weights
+    else:
+        component = create_vertex_component(shape, vertex_indices)
+
+    c_skincluster_data.skincluster_fn.setWeights(shape,
+                                                component,
+                                                c_skincluster_data.influence_indices,
+                                                numpy_to_mdouble_array(weights),
+                                                False,
+                                                False)
+    c_skincluster_data.invalidate('weights')
+
+    return vertex_indices
+
+def diff_skincluster_data(node, full_path, tolerance=1e-4):
+    """
+    Compares the current skin weights of a node against a saved skin file.
+
+    The scene weights are written to a temporary skin file first, so the comparison
+    streams both sides block by block like diff_skin_files.
+
+    Args:
+        node (str): The name of the skinned node.
+        full_path (str): The path of the saved skin file.
+        tolerance (float, optional): The smallest weight delta counted as a change. Defaults to 1e-4.
+
+    Returns:
+        dict: The report, see skin_diff.diff_skin_files. The saved file is the old side.
+    """
+    with tempfile.TemporaryDirectory() as temp_path:
+        scene_path = write_skincluster_data(node, capture_skincluster_data(node), temp_path)
+
+        return diff_skin_files(full_path, scene_path, tolerance)
+
+def smooth_skincluster_weights(node, iterations=1, strength=0.5, vertex_indices=None, locked_influences=None,
+                               shape_index=0):
+    """
+    Smooths the skin weights of a mesh in one batch.
+
+    The mesh adjacency is read once, the smoothing runs in NumPy and the result is
+    written back with a single setWeights call.
+
+    Args:
+        node (str): The name of the skinned node.
+        iterations (int, optional): The number of smoothing iterations. Defaults to 1.
+        strength (float, optional): How far every iteration moves towards the neighbour
+            average, between 0 and 1. Defaults to 0.5.
+        vertex_indices (list, optional): The vertices to smooth. An empty list smooths
+            nothing. Defaults to None, which smooths the selected vertices, or every vertex
+            if none are selected.
+        locked_influences (list, optional): The influences that keep their weights.
+            Defaults to None, which uses the lockInfluenceWeights attribute of the influences.
+        shape_index (int, optional): The index of the shape in DagNodeData.shapes. Defaults to 0.
+
+    Returns:
+        np.ndarray: The smoothed vertex indices.
+    """
+    c_skincluster_data = SkinclusterData(node, shape_index=shape_index)
+    shape = c_skincluster_data.shape
+    influence_names = c_skincluster_data.influence_names
+
+    if vertex_indices is None:
+        vertex_indices = get_selected_vertex_indices(shape)
+        if not len(vertex_indices):
+            vertex_indices = np.arange(len(c_skincluster_data.weights))
+
+    vertex_indices = np.asarray(vertex_indices, dtype=np.int64)
+    if not len(vertex_indices):
+        return vertex_indices
+
+    if locked_influences is None:
+        locked_influences = [name for name in influence_names
+                             if cmds.attributeQuery('lockInfluenceWeights', node=name, exists=True)
+                             and cmds.getAttr('{}.lockInfluenceWeights'.format(name))]
+
+    locked = [influence_names.index(name) for name in locked_influences if name in influence_names]
+
+    mask = np.zeros(len(c_skincluster_data.weights), dtype=bool)
+    mask[vertex_indices] = True
+
+    indptr, indices = c_skincluster_data.adjacency
+    weights = smooth_weights(c_skincluster_data.weights, indptr, indices, iterations, strength, mask, locked)
+
+    c_skincluster_data.skincluster_fn.setWeights(shape,
+                                                create_vertex_component(shape, vertex_indices),
+                                                c_skincluster_data.influence_indices,
+                                                numpy_to_mdouble_array(weights[vertex_indices]),
+                                                False,
+                                                False)
+    c_skincluster_data.invalidate('weights')
+
+    return vertex_indices
+
+def find_unused_influences(node, threshold=0.0, shape_index=0):
+    """
+    Returns the influences of a skincluster that carry no weight on any vertex.
+
+    Args:
+        node (str): The name of the skinned node.
+        threshold (float, optional): Influences whose largest weight is at or below this
+            value count as unused. Defaults to 0.0.
+        shape_index (int, optional): The index of the shape in DagNodeData.shapes. Defaults to 0.
+
+    Returns:
+        list: The names of the unused influences.
+    """
+    c_skincluster_data = SkinclusterData(node, shape_index=shape_index)
+
+    max_weights, _ = influence_usage(c_skincluster_data.weights)
+    used = set(used_influence_columns(max_weights, threshold).tolist())
+
+    return [name for column, name in enumerate(c_skincluster_data.influence_names) if column not in used]
+
+def get_influence_world_matrices(influences, times=None):
+    """
+    Samples the world matrices of influences, e.g. to build a pose set for skin_pose_error.
+
+    The worldMatrix[0] plugs are looked up once and evaluated under one om.MDGContext per
+    frame, instead of issuing a getAttr command per influence and frame.
+
+    Args:
+        influences (list): The influence names or DAG paths.
+        times (list, optional): The frames to sample. Defaults to None, which samples the
+            current frame only.
+
+    Returns:
+        np.ndarray: The (num_times, num_influences, 4, 4) world matrices.
+    """
+    if times is None:
+        times = [cmds.currentTime(query=True)]
+
+    selection = om.MSelectionList()
+    for influence in influences:
+        selection.add(influence)
+
+    plugs = [om.MFnDependencyNode(selection.getDependNode(i)).findPlug('worldMatrix', False).elementByLogicalIndex(0)
+             for i in range(len(influences))]
+
+    matrices = np.empty((len(times), len(influences), 4, 4), dtype=np.float64)
+    for i, time in enumerate(times):
+        previous_context = om.MDGContext(om.MTime(time, om.MTime.uiUnit())).makeCurrent()
+        try:
+            for j, plug in enumerate(plugs):
+                matrices[i, j] = mmatrix_to_numpy(om.MFnMatrixData(plug.asMObject()).matrix())
+        finally:
+            previous_context.makeCurrent()
+
+    return matrices
+
+def pose_error_skincluster_data(node, full_path, times, shape_index=0):
+    """
+    Measures how differently the current and the saved skin weights deform a node over a range of frames.
+
+    The scene skincluster is the reference: its rest points, bindPreMatrix values and
+    skinning method deform both weight sets, posed by the scene influences at every frame.
+
+    Args:
+        node (str): The name of the skinned node.
+        full_path (str): The path of the saved skin file.
+        times (list): The frames to sample the influence world matrices at.
+        shape_index (int, optional): The index of the shape in DagNodeData.shapes and in
+            the saved file. Defaults to 0.
+
+    Returns:
+        dict: The error report, see skin_pose_error.pose_error_shape_data.
+    """
+    scene_data = capture_shape_data(SkinclusterData(node, shape_index=shape_index))
+    saved_data = read_skincluster_data(full_path)[shape_index]
 
+    world_matrices = get_influence_world_matrices(scene_data['influence_paths'], times)
 
+    return pose_error_shape_data(scene_data, saved_data, world_matrices)
@@ -1,29 +1,57 @@
+from typing import Any, Callable, Union
 
+import numpy as np
+
+import maya.api.OpenMaya as om
 import maya.api.OpenMayaAnim as oma
 
 from rig.objects.object_data import DagNodeData
+from rig.deformers.skin_file import SkinFileWriter
+
+SKIN_ATTRIBUTES: dict
 
 class SkinclusterData(DagNodeData):
 
-    def __init__(self, node: str, skincluster_node: str) -> None: ...
+    def __init__(self, node: str, skincluster_node: str, shape_index: int = 0) -> None: ...
+
+    #... Public Methods ...#
+    def invalidate(self, *names: str) -> None: ...
+
+    def get_shape_component(self) -> om.MObject: ...
     
     #... Private Methods ...#
+    def _get_cached(self, name: str, loader: Callable) -> Any: ...
+
     def _get_skincluster(self) -> str: ...
     
     def _get_skincluster_fn(self) -> oma.MFnSkinCluster: ...
 
     def _get_influence_names(self) -> list: ...
     
+    def _get_influence_paths(self) -> list: ...
+
     def _get_influence_indicies(self) -> list: ...
     
-    def _get_weights(self) -> list: ...
+    def _get_weights(self) -> np.ndarray: ...
     
-    def _get_blend_weights(self) -> list: ...
+    def _get_blend_weights(self) -> np.ndarray: ...
     
-    def _get_bind_pre_matrix_values(self) -> list: ...
+    def _get_influence_logical_indices(self) -> np.ndarray: ...
+
+    def _get_bind_pre_matrix_values(self) -> np.ndarray: ...
     
     def _get_bind_pre_matrix_inputs(self) -> list: ...
 
+    def _get_input_geometry(self) -> om.MObject: ...
+
+    def _get_rest_points(self) -> np.ndarray: ...
+
+    def _get_triangles(self) -> np.ndarray: ...
+
+    def _get_topology(self) -> dict: ...
+
+    def _get_adjacency(self) -> tuple: ...
+
     def _get_envelope(self) -> float: ...
     
     def _get_skinning_methods(self) -> int: ...
@@ -35,6 +63,12 @@ class SkinclusterData(DagNodeData):
     def _get_deform_user_normals(self) -> int: ...
 
     #... Properties ...#
+    @property
+    def shape_index(self) -> int: ...
+
+    @property
+    def shape(self) -> om.MDagPath: ...
+
     @property
     def skincluster(self) -> str: ...
 
@@ -44,21 +78,39 @@ class SkinclusterData(DagNodeData):
     @property
     def influence_names(self) -> list: ...
 
+    @property
+    def influence_paths(self) -> list: ...
+
     @property
     def influence_indices(self) -> list: ...
 
     @property
-    def weights(self) -> list: ...
+    def influence_logical_indices(self) -> np.ndarray: ...
+
+    @property
+    def weights(self) -> np.ndarray: ...
 
     @property
-    def blend_weights(self) -> list: ...
+    def blend_weights(self) -> np.ndarray: ...
 
     @property
-    def bind_pre_matrix_values(self) -> list: ...
+    def bind_pre_matrix_values(self) -> np.ndarray: ...
 
     @property
     def bind_pre_matrix_inputs(self) -> list: ...
     
+    @property
+    def rest_points(self) -> np.ndarray: ...
+
+    @property
+    def triangles(self) -> np.ndarray: ...
+
+    @property
+    def topology(self) -> dict: ...
+
+    @property
+    def adjacency(self) -> tuple: ...
+
     @property
     def envelope(self) -> float: ...
     
@@ -75,10 +127,103 @@ class SkinclusterData(DagNodeData):
     def deform_user_normals(self) -> int: ...
 
 
-def save_skincluster_data(node: str, path: str) -> None: ...
+def mdouble_array_to_numpy(m_array: om.MDoubleArray, dtype: np.dtype = np.float64) -> np.ndarray: ...
+
+def numpy_to_mdouble_array(array: np.ndarray) -> om.MDoubleArray: ...
+
+def get_geometry_points(geometry: Union[om.MDagPath, om.MObject], space: int = om.MSpace.kObject) -> np.ndarray: ...
+
+def get_geometry_topology(geometry: Union[om.MDagPath, om.MObject]) -> dict: ...
 
-def load_skincluster_data(node: str, path: str) -> None: ...
+def check_shape_topology(shape: om.MDagPath, data: dict) -> None: ...
+
+def match_saved_shapes(shapes: list, saved_names: list) -> list: ...
+
+def mmatrix_to_numpy(matrix: om.MMatrix) -> np.ndarray: ...
+
+def get_matrix_array_plug_values(node_fn: om.MFnDependencyNode, attribute: str, logical_indices: list) -> np.ndarray: ...
+
+def set_bind_pre_matrices(skincluster: str, logical_indices: list, matrices: np.ndarray, influences: list = None,
+                          bind_pre_matrix_inputs: list = None) -> om.MDGModifier: ...
+
+def check_component_shape(shape: om.MDagPath) -> None: ...
+
+def create_vertex_component(shape: om.MDagPath, indices: np.ndarray) -> om.MObject: ...
+
+def get_selected_vertex_indices(shape: om.MDagPath) -> np.ndarray: ...
+
+def add_skincluster_influences(skincluster: str, influences: list) -> list: ...
+
+def find_shape_skincluster(shape: om.MDagPath) -> str: ...
+
+def get_shape_skincluster_data(node: str) -> list: ...
+
+def capture_shape_data(c_skincluster_data: SkinclusterData) -> dict: ...
+
+def encode_shape_data(data: dict, prune_threshold: float = 0.0, max_influences: int = None,
+                      encoding: str = 'float32', max_error: float = None, drop_unused: bool = False) -> tuple: ...
+
+def capture_skincluster_data(node: str) -> list: ...
+
+def write_skincluster_data(node: str, captured_data: list, path: str, prune_threshold: float = 0.0,
+                           max_influences: int = None, chunk_store: str = None, encoding: str = 'float32',
+                           max_error: float = None, drop_unused: bool = False) -> str: ...
+
+def save_skincluster_data(node: str, path: str, prune_threshold: float = 0.0, max_influences: int = None,
+                          encoding: str = 'float32', max_error: float = None, drop_unused: bool = False) -> None: ...
+
+def export_skincluster_data(nodes: list, path: str, max_workers: int = None, prune_threshold: float = 0.0,
+                            max_influences: int = None, chunk_store: str = None, encoding: str = 'float32',
+                            max_error: float = None, drop_unused: bool = False) -> list: ...
+
+def load_skincluster_data(node: str, path: str, allow_pickle: bool = False, max_workers: int = None,
+                          missing: Union[str, Callable] = 'parent', prune_threshold: float = 0.0,
+                          max_influences: int = None, check_topology: bool = True,
+                          drop_unused: bool = False) -> None: ...
+
+def _stream_shape_data(writer: SkinFileWriter, prefix: str, c_skincluster_data: SkinclusterData,
+                       block_vertices: int = ..., prune_threshold: float = 0.0, max_influences: int = None,
+                       encoding: str = 'float32', max_error: float = None) -> dict: ...
+
+def save_skincluster_stream(node: str, path: str, block_vertices: int = ..., prune_threshold: float = 0.0,
+                            max_influences: int = None, chunk_store: str = None, encoding: str = 'float32',
+                            max_error: float = None) -> str: ...
+
+def load_skincluster_stream(node: str, path: str, block_vertices: int = ..., missing: Union[str, Callable] = 'parent',
+                            prune_threshold: float = 0.0, max_influences: int = None, check_topology: bool = True,
+                            drop_unused: bool = False) -> None: ...
+
+def resolve_influences(data: dict, missing: Union[str, Callable] = 'parent') -> tuple: ...
+
+def _bind_shape_data(node: str, shape_index: int, data: dict, missing: Union[str, Callable] = 'parent',
+                     skincluster: str = None) -> tuple: ...
+
+def _apply_shape_data(node: str, shape_index: int, data: dict, weights: np.ndarray,
+                      missing: Union[str, Callable] = 'parent', skincluster: str = None,
+                      prune_threshold: float = 0.0, max_influences: int = None,
+                      drop_unused: bool = False) -> None: ...
+
+def load_skincluster_subset(node: str, path: str, vertex_indices: list = None, shape_index: int = 0,
+                            missing: Union[str, Callable] = 'parent', prune_threshold: float = 0.0,
+                            max_influences: int = None, check_topology: bool = True) -> np.ndarray: ...
 
 def stack_skinclusters(source: str, target: str) -> None: ...
 
-def copySkincluster(source: str, target: str) -> None: ...
+def transfer_skincluster_data(node: str, full_path: str, source_shape_index: int = 0, shape_index: int = 0,
+                              mode: str = 'barycentric', missing: Union[str, Callable] = 'parent') -> None: ...
+
+def copySkincluster(source: str, target: str, mode: str = 'barycentric') -> None: ...
+
+def mirror_skincluster_weights(node: str, axis: str = 'x', direction: int = 1, side_tokens: tuple = ...,
+                               tolerance: float = 1e-3, shape_index: int = 0) -> np.ndarray: ...
+
+def diff_skincluster_data(node: str, full_path: str, tolerance: float = 1e-4) -> dict: ...
+
+def smooth_skincluster_weights(node: str, iterations: int = 1, strength: float = 0.5, vertex_indices: list = None,
+                               locked_influences: list = None, shape_index: int = 0) -> np.ndarray: ...
+
+def find_unused_influences(node: str, threshold: float = 0.0, shape_index: int = 0) -> list: ...
+
+def get_influence_world_matrices(influences: list, times: list = None) -> np.ndarray: ...
+
+def pose_error_skincluster_data(node: str, full_path: str, times: list, shape_index: int = 0) -> dict: ...
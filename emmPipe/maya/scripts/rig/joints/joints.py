@@ -84,7 +84,7 @@ class Joints:
         """
         Create the joints.
         """
-        self._joints = [DagNodeData(cmds.createNode('joint', \
+        self._joints = [DagNodeData.get(cmds.createNode('joint', \
             name=f'{self._combined_name}_{str(i).zfill(2)}')) \
             for i in range(self.num_joints)]
 
@@ -69,10 +69,9 @@ class RigContrainer(BaseObject):
         super().from_data(meta_node, data)
         
         cls.instance.type = data['type']
-        cls.instance.top_node = DagNodeData(data['top_node'])
-        cls.instance.geometry = DagNodeData(data['geometry'])
-        cls.instance.controls = DagNodeData(data['controls'])
-        cls.instance.modules = DagNodeData(data['modules'])
+        (cls.instance.top_node, cls.instance.geometry,
+         cls.instance.controls, cls.instance.modules) = DagNodeData.from_many(
+            [data[key] for key in ('top_node', 'geometry', 'controls', 'modules')])
 
         return cls.instance
     
@@ -274,9 +273,8 @@ class RigModule(BaseObject):
     def from_data(cls, meta_node, data):
         super().from_data(meta_node, data)
         
-        cls.instance.module = DagNodeData(data['module'])
-        cls.instance.systems = DagNodeData(data['systems'])
-        cls.instance.constraints = DagNodeData(data['constraints'])
+        cls.instance.module, cls.instance.systems, cls.instance.constraints = DagNodeData.from_many(
+            [data[key] for key in ('module', 'systems', 'constraints')])
 
         return cls.instance
 
@@ -63,7 +63,7 @@ class BaseObject:
         Returns:
             DagNodeData: The created module.
         """
-        module = DagNodeData(cmds.createNode('transform', name=f'{name}'))
+        module = DagNodeData.get(cmds.createNode('transform', name=f'{name}'))
 
         if parent:
             cmds.parent(module.dag_path, parent.dag_path)
@@ -102,7 +102,7 @@ class BaseObject:
         Returns:
             None
         """
-        self._meta_node = DependencyNodeData(MetaNode(name, self.data).name)
+        self._meta_node = DependencyNodeData.get(MetaNode(name, self.data).name)
         self._meta_node_name = self._meta_node.dependnode_fn.name()
 
     #... PROPERTIES ...#
@@ -1,12 +1,145 @@
 
+import re
+
+import numpy as np
+
 import maya.api.OpenMaya as om
 import maya.cmds as cmds
 
 
+# Marks a lazily computed property that has not been fetched yet, None is a valid value
+_UNSET = object()
+_UUID_PATTERN = re.compile(r'^[0-9A-Fa-f]{8}(-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12}$')
+
+
+def resolve_node(node):
+    """
+    Looks up the MObject of a node.
+
+    Args:
+        node (str or om.MObject or om.MDagPath): The node name, DAG path, UUID or MObject.
+
+    Returns:
+        om.MObject: The node.
+
+    Raises:
+        TypeError: If no node is assigned.
+        ValueError: If the node does not exist.
+    """
+    if isinstance(node, om.MObject):
+        if node.isNull():
+            raise TypeError('No node assigned')
+        return node
+
+    if not node:
+        raise TypeError('No node assigned')
+
+    item = om.MUuid(node) if isinstance(node, str) and _UUID_PATTERN.match(node) else node
+    try:
+        return om.MSelectionList().add(item).getDependNode(0)
+    except RuntimeError:
+        raise ValueError(f'No valid node found for {node}')
+
+def resolve_nodes(nodes):
+    """
+    Looks up the MObjects of many nodes through a single selection list.
+
+    Names and UUIDs are added to one om.MSelectionList instead of one list per node.
+    MObjects and DAG paths need no lookup and are passed through, DAG paths found on
+    the way are returned as well so wrappers do not have to search for them again.
+
+    Args:
+        nodes (list): The node names, DAG paths, UUIDs or MObjects.
+
+    Returns:
+        tuple: The om.MObject of every node, None where it does not exist, the om.MDagPath
+            of every node, None where it is unknown or not a DAG node, and the list of
+            missing nodes in input order.
+    """
+    m_objs = [None] * len(nodes)
+    dag_paths = [None] * len(nodes)
+    missing = []
+
+    selection = om.MSelectionList()
+    added = []
+    for index, node in enumerate(nodes):
+        if isinstance(node, om.MDagPath):
+            m_objs[index] = node.node()
+            dag_paths[index] = node
+            continue
+
+        if isinstance(node, om.MObject):
+            if node.isNull():
+                missing.append(node)
+            else:
+                m_objs[index] = node
+            continue
+
+        if not node:
+            missing.append(node)
+            continue
+
+        item = om.MUuid(node) if isinstance(node, str) and _UUID_PATTERN.match(node) else node
+        length = selection.length()
+        try:
+            selection.add(item)
+        except RuntimeError:
+            missing.append(node)
+            continue
+
+        if selection.length() == length + 1:
+            added.append((index, length))
+        else:
+            # Merged into an existing item or matched several nodes, resolve on its own
+            try:
+                m_objs[index] = resolve_node(node)
+            except ValueError:
+                missing.append(node)
+
+    for index, selection_index in added:
+        m_objs[index] = selection.getDependNode(selection_index)
+        if m_objs[index].hasFn(om.MFn.kDagNode):
+            dag_paths[index] = selection.getDagPath(selection_index)
+
+    return m_objs, dag_paths, missing
+
+
+def mpoint_array_to_numpy(points):
+    """
+    Copies an MPointArray or MFloatVectorArray into a NumPy array.
+
+    Args:
+        points (om.MPointArray or om.MFloatVectorArray): The array to copy.
+
+    Returns:
+        np.ndarray: The x, y and z values as a (len(points), 3) array.
+    """
+    if not len(points):
+        return np.empty((0, 3), dtype=np.float64)
+
+    return np.array(points, dtype=np.float64)[:, :3]
+
+def numpy_to_mpoint_array(points):
+    """
+    Converts a NumPy array of points into an MPointArray.
+
+    Args:
+        points (np.ndarray): The (num_points, 3) positions.
+
+    Returns:
+        om.MPointArray: The points.
+    """
+    return om.MPointArray(np.asarray(points, dtype=np.float64).reshape(-1, 3).tolist())
+
+
 class DependencyNodeData:
     """
     A class that represents a dependency node in Maya.
 
+    Wrapping a node only looks up its MObject. Function sets are created on first
+    access and cached, and instances use __slots__, so rigs can wrap hundreds of
+    nodes cheaply.
+
     Properties:
         m_obj (om.MObject): The MObject associated with the selected object.
         dependnode_fn (om.MFnDependencyNode): The MFnDependencyNode object associated with the current object.
@@ -15,25 +148,99 @@ class DependencyNodeData:
         TypeError: If no node is assigned.
         ValueError: If the node is a DAG node.
     """
+    __slots__ = ('_m_obj', '_dependnode_fn')
+
     def __init__(self, node=None):
         """
         Initializes a new instance of the DependencyNodeData class.
 
         Args:
-            node (str): The name of the node to assign.
+            node (str or om.MObject or om.MDagPath): The name, DAG path, UUID or MObject
+                of the node to assign.
 
         Raises:
             TypeError: If no node is assigned.
         """
-        if not node:
-            raise TypeError('No node assigned')
+        self._m_obj = resolve_node(node)
+        self._dependnode_fn = None
 
-        try:
-            self._m_obj = om.MSelectionList().add(node).getDependNode(0)
-        except RuntimeError:
-            raise ValueError(f'No valid node found for {node}')
+    #... Public Methods ...#
+    @classmethod
+    def get(cls, node):
+        """
+        Returns the shared wrapper of a node from NODE_DATA_CACHE, wrapping it on first use.
+
+        Rebuilding rigs from metadata wraps the same nodes over and over, this returns
+        the existing wrapper with everything it has cached instead.
+
+        Args:
+            node (str or om.MObject or om.MDagPath): The name, DAG path, UUID or MObject of the node.
+
+        Returns:
+            DependencyNodeData: The wrapper, an instance of cls.
+
+        Raises:
+            TypeError: If no node is assigned.
+            ValueError: If the node does not exist.
+        """
+        return NODE_DATA_CACHE.get(cls, node)
+
+    @classmethod
+    def from_many(cls, nodes, ignore_missing=False):
+        """
+        Returns the shared wrappers of many nodes, resolved in one bulk lookup.
 
-        self._dependnode_fn = om.MFnDependencyNode(self._m_obj)
+        All names and UUIDs go through a single selection list and the wrappers come
+        from NODE_DATA_CACHE, so nodes wrapped before keep their cached function sets.
+        Every missing or invalid node is reported at once.
+
+        Args:
+            nodes (list): The names, DAG paths, UUIDs or MObjects of the nodes.
+            ignore_missing (bool, optional): If True, returns None for missing or invalid
+                nodes instead of raising. Defaults to False.
+
+        Returns:
+            list: The wrappers, instances of cls, in the order of nodes.
+
+        Raises:
+            ValueError: If any node does not exist, or cannot be wrapped by cls.
+        """
+        nodes = list(nodes)
+        m_objs, dag_paths, missing = resolve_nodes(nodes)
+        wrappers, invalid = NODE_DATA_CACHE.get_many(cls, m_objs, dag_paths)
+
+        if (missing or invalid) and not ignore_missing:
+            errors = []
+            if missing:
+                errors.append('No valid node found for: {}'.format(', '.join(str(node) for node in missing)))
+            if invalid:
+                errors.append('Cannot wrap as {}: {}'.format(cls.__name__,
+                                                             ', '.join(str(nodes[index]) for index in invalid)))
+            raise ValueError('. '.join(errors))
+
+        return wrappers
+
+    #... Private Methods ...#
+    def _reset_cache(self):
+        """
+        Drops cached function sets, so they are rebuilt on next access.
+
+        Returns:
+            None
+        """
+        self._dependnode_fn = None
+
+    def _set_dag_path(self, dag_path):
+        """
+        Stores a DAG path found while resolving the node. Dependency nodes have none.
+
+        Args:
+            dag_path (om.MDagPath): The DAG path.
+
+        Returns:
+            None
+        """
+        pass
 
     #... Properties ...#
     @property
@@ -54,6 +261,9 @@ class DependencyNodeData:
         Returns:
             om.MFnDependencyNode: The MFnDependencyNode object.
         """
+        if self._dependnode_fn is None:
+            self._dependnode_fn = om.MFnDependencyNode(self._m_obj)
+
         return self._dependnode_fn
 
 
@@ -61,25 +271,29 @@ class DagNodeData(DependencyNodeData):
     """
     A class representing data for a DAG node in Maya.
 
+    The DAG path, shapes and function sets are computed on first access and cached, so
+    wrapping a group or a joint never builds shape function sets. Vertex components, ids
+    and counts are built from the live function sets by the get_vtx_* methods on every
+    call instead, so wrappers shared through NODE_DATA_CACHE stay correct after topology
+    edits.
+
     Properties:
         shapes (list): A list of shape nodes attached to the object.
-        shapes_fn (list): A list of function sets for the shape nodes.
+        shapes_fn (list): A list of function sets for the shape nodes, None for non-geometry shapes.
         transform_fn (om.MFnTransform): The function set for the transform node.
-        vtx_component (list): A list of vertex components for the shape nodes.
-        vtx_ids (list): A list of vertex IDs for the shape nodes.
-        vtx_counts (list): A list of vertex counts for the shape nodes.
         dag_path (om.MDagPath): The MDagPath for the node.
     
     Raises:
         ValueError: If the node is a DEPENDENCY node.
     """
+    __slots__ = ('_dag_path', '_transform_fn', '_shapes', '_shapes_fn')
 
     def __init__(self, node=None):
         """
         Initialize the DagNodeData instance.
 
         Args:
-            node (str): The name of the node.
+            node (str or om.MObject or om.MDagPath): The name, DAG path, UUID or MObject of the node.
 
         Raises:
             TypeError: If no node is assigned.
@@ -89,15 +303,225 @@ class DagNodeData(DependencyNodeData):
         if not self._m_obj.hasFn(om.MFn.kDagNode):
             raise ValueError(f'{node} is a not a DAG node. Please use the DependencyNodeData class instead.')
 
-        self._dag_path = self._get_dag_path()
-        self._transform_fn = self._get_transform_fn()
-        self._shapes = self._get_shapes()
-        self._shapes_fn = self._get_shapes_fn()
-        self._vtx_component = self._get_vtx_component()
-        self._vtx_ids = self._get_vtx_ids()
-        self._vtx_counts = self._get_vtx_counts()
+        self._reset_cache()
+
+    #... Public methods ...#
+    def get_point_count(self, shape_index=0):
+        """
+        Returns the number of vertices or CVs of a shape.
+
+        Args:
+            shape_index (int, optional): The index of the shape in shapes. Defaults to 0.
+
+        Returns:
+            int: The vertex count of a mesh, or the CV count of a curve or surface.
+        """
+        return self._get_point_count(self._get_shape_fn(shape_index))
+
+    def get_points(self, shape_index=0, space=om.MSpace.kObject):
+        """
+        Returns the vertex or CV positions of a shape.
+
+        Args:
+            shape_index (int, optional): The index of the shape in shapes. Defaults to 0.
+            space (int, optional): The space to read the points in. Defaults to om.MSpace.kObject.
+
+        Returns:
+            np.ndarray: The positions as a (num_points, 3) array. Surface CVs are ordered
+                with V varying fastest, like cv[u][v].
+        """
+        shape_fn = self._get_shape_fn(shape_index)
+        if shape_fn.type() == om.MFn.kMesh:
+            return mpoint_array_to_numpy(shape_fn.getPoints(space))
+
+        return mpoint_array_to_numpy(shape_fn.cvPositions(space))
+
+    def set_points(self, points, shape_index=0, space=om.MSpace.kObject):
+        """
+        Sets all vertex or CV positions of a shape in one call.
+
+        Args:
+            points (np.ndarray): The (num_points, 3) positions, ordered like get_points.
+            shape_index (int, optional): The index of the shape in shapes. Defaults to 0.
+            space (int, optional): The space the points are in. Defaults to om.MSpace.kObject.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the number of points does not match the shape.
+        """
+        shape_fn = self._get_shape_fn(shape_index)
+
+        point_count = self._get_point_count(shape_fn)
+        if len(points) != point_count:
+            raise ValueError('{} has {} points, got {}'
+                             .format(self.shapes[shape_index].partialPathName(), point_count, len(points)))
+
+        if shape_fn.type() == om.MFn.kMesh:
+            shape_fn.setPoints(numpy_to_mpoint_array(points), space)
+            return
+
+        shape_fn.setCVPositions(numpy_to_mpoint_array(points), space)
+        if shape_fn.type() == om.MFn.kNurbsCurve:
+            shape_fn.updateCurve()
+        else:
+            shape_fn.updateSurface()
+
+    def get_normals(self, shape_index=0, space=om.MSpace.kObject, angle_weighted=False):
+        """
+        Returns the vertex normals of a mesh shape.
+
+        Args:
+            shape_index (int, optional): The index of the shape in shapes. Defaults to 0.
+            space (int, optional): The space to read the normals in. Defaults to om.MSpace.kObject.
+            angle_weighted (bool, optional): Whether face normals are weighted by the angle
+                they span at the vertex. Defaults to False.
+
+        Returns:
+            np.ndarray: The normals as a (num_vertices, 3) array.
+
+        Raises:
+            TypeError: If the shape is not a mesh.
+        """
+        shape_fn = self._get_shape_fn(shape_index)
+        if shape_fn.type() != om.MFn.kMesh:
+            raise TypeError('{} is not a mesh'.format(self.shapes[shape_index].partialPathName()))
+
+        return mpoint_array_to_numpy(shape_fn.getVertexNormals(angle_weighted, space))
+
+    def get_vtx_component(self):
+        """
+        Builds a component holding every vertex or CV of each shape.
+
+        Returns:
+            list: The complete component of every shape in shapes, None for non-geometry shapes.
+        """
+        if not self.shapes_fn:
+            return None
+
+        return [self._create_vtx_component(shape_fn) if shape_fn is not None else None
+                for shape_fn in self.shapes_fn]
+
+    def get_vtx_ids(self):
+        """
+        Returns the vertex or CV ids of each shape.
+
+        Returns:
+            list: The range of ids of every shape in shapes, None for non-geometry shapes.
+        """
+        if not self.shapes_fn:
+            return None
+
+        return [range(0, self._get_point_count(shape_fn)) if shape_fn is not None else None
+                for shape_fn in self.shapes_fn]
+
+    def get_vtx_counts(self):
+        """
+        Returns the vertex or CV count of each shape.
+
+        Returns:
+            list: The count of every shape in shapes, None for non-geometry shapes.
+        """
+        if not self.shapes_fn:
+            return None
+
+        return [self._get_point_count(shape_fn) if shape_fn is not None else None
+                for shape_fn in self.shapes_fn]
 
     #... Private methods ...#
+    def _reset_cache(self):
+        """
+        Drops the cached DAG path, shapes and function sets, so they are rebuilt on next access.
+
+        Returns:
+            None
+        """
+        super()._reset_cache()
+
+        self._dag_path = _UNSET
+        self._transform_fn = _UNSET
+        self._shapes = _UNSET
+        self._shapes_fn = _UNSET
+
+    def _set_dag_path(self, dag_path):
+        """
+        Stores a DAG path found while resolving the node, unless one is cached already.
+
+        Args:
+            dag_path (om.MDagPath): The DAG path.
+
+        Returns:
+            None
+        """
+        if self._dag_path is _UNSET:
+            self._dag_path = om.MDagPath(dag_path)
+
+    def _get_shape_fn(self, shape_index):
+        """
+        Returns the function set of a shape.
+
+        Args:
+            shape_index (int): The index of the shape in shapes.
+
+        Returns:
+            om.MFnMesh or om.MFnNurbsCurve or om.MFnNurbsSurface: The function set.
+
+        Raises:
+            TypeError: If the node has no mesh, curve or surface shape at that index.
+        """
+        if not self.shapes_fn or shape_index >= len(self.shapes_fn) or self.shapes_fn[shape_index] is None:
+            raise TypeError('{} has no geometry shape at index {}'.format(self.dag_path.partialPathName(),
+                                                                          shape_index))
+
+        return self.shapes_fn[shape_index]
+
+    @staticmethod
+    def _get_point_count(shape_fn):
+        """
+        Returns the number of vertices or CVs of a shape function set.
+
+        Args:
+            shape_fn (om.MFnMesh or om.MFnNurbsCurve or om.MFnNurbsSurface): The function set.
+
+        Returns:
+            int: The vertex or CV count.
+        """
+        if shape_fn.type() == om.MFn.kMesh:
+            return shape_fn.numVertices
+
+        if shape_fn.type() == om.MFn.kNurbsCurve:
+            return shape_fn.numCVs
+
+        return shape_fn.numCVsInU * shape_fn.numCVsInV
+
+    @staticmethod
+    def _create_vtx_component(shape_fn):
+        """
+        Creates a component holding every vertex or CV of a shape function set.
+
+        Args:
+            shape_fn (om.MFnMesh or om.MFnNurbsCurve or om.MFnNurbsSurface): The function set.
+
+        Returns:
+            om.MObject: The complete vertex or CV component.
+        """
+        if shape_fn.type() == om.MFn.kNurbsSurface:
+            comp = om.MFnDoubleIndexedComponent()
+            vtx_component = comp.create(om.MFn.kSurfaceCVComponent)
+            comp.setCompleteData(shape_fn.numCVsInU, shape_fn.numCVsInV)
+
+            return vtx_component
+
+        comp = om.MFnSingleIndexedComponent()
+        if shape_fn.type() == om.MFn.kMesh:
+            vtx_component = comp.create(om.MFn.kMeshVertComponent)
+        else:
+            vtx_component = comp.create(om.MFn.kCurveCVComponent)
+        comp.setCompleteData(DagNodeData._get_point_count(shape_fn))
+
+        return vtx_component
+
     def _get_dag_path(self):
         """
         Retrieves the MDagPath for the node.
@@ -114,7 +538,7 @@ class DagNodeData(DependencyNodeData):
         Returns:
             om.MFnTransform: The MFnTransform for the node.
         """
-        return om.MFnTransform(self._dag_path) if self._dag_path.apiType() == om.MFn.kTransform else None
+        return om.MFnTransform(self.dag_path) if self.dag_path.apiType() == om.MFn.kTransform else None
 
     def _get_shapes(self):
         """
@@ -126,100 +550,42 @@ class DagNodeData(DependencyNodeData):
         Raises:
             ValueError: If the object has no shape node.
         """
-        return [
-            om.MFnDagNode(self._dag_path.child(i)).getPath()
-            for i in range(self._dag_path.childCount())
-            if self._dag_path.child(i).hasFn(om.MFn.kShape) and not om.MFnDagNode(self._dag_path.child(i)).isIntermediateObject
-        ]
+        shapes = []
+        for i in range(self.dag_path.childCount()):
+            child = self.dag_path.child(i)
+            if child.hasFn(om.MFn.kShape) and not om.MFnDagNode(child).isIntermediateObject:
+                shapes.append(om.MFnDagNode(child).getPath())
+
+        return shapes
 
     def _get_shapes_fn(self):
         """
         Retrieves the MFnMesh, MFnNurbsCurve, or MFnNurbsSurface for the shape node.
 
         Returns:
-            om.MFnMesh or om.MFnNurbsCurve or om.MFnNurbsSurface: The function set for the shape node.
+            list: The function set of every shape in shapes, None for shapes that are not
+                geometry, such as a locator next to curve shapes.
         """
         shapes_fn = []
-        if self._shapes:
-            for shape in self._shapes:
+        if self.shapes:
+            for shape in self.shapes:
                 if shape.hasFn(om.MFn.kMesh):
-                    fn_set = om.MFnMesh(self.dag_path)
+                    fn_set = om.MFnMesh(shape)
 
                 elif shape.hasFn(om.MFn.kNurbsCurve):
-                    fn_set = om.MFnNurbsCurve(self.dag_path)
+                    fn_set = om.MFnNurbsCurve(shape)
 
                 elif shape.hasFn(om.MFn.kNurbsSurface):
-                    fn_set = om.MFnNurbsSurface(self.dag_path)
+                    fn_set = om.MFnNurbsSurface(shape)
                 else:
-                    return None
-                
-                fn_set.setObject(shape)
+                    fn_set = None
+
                 shapes_fn.append(fn_set)
 
             return shapes_fn
         else:
             return None
 
-    def _get_vtx_component(self):
-        """
-        Retrieves the vertex component for the shape node.
-
-        Returns:
-            om.MObject: The vertex component for the shape node.
-        """
-        vtx_components = []
-        if self.shapes_fn:
-            for shape_fn in self._shapes_fn:
-                if shape_fn.type() == om.MFn.kMesh:
-                    comp = om.MFnSingleIndexedComponent()
-                    vtx_component = comp.create(om.MFn.kMeshVertComponent)
-                    comp.setCompleteData(shape_fn.numVertices)
-
-                if shape_fn.type() == om.MFn.kNurbsCurve:
-                    comp = om.MFnSingleIndexedComponent()
-                    vtx_component = comp.create(om.MFn.kCurveCVComponent)
-                    comp.setCompleteData(shape_fn.numCVs)
-
-                if shape_fn.type() == om.MFn.kNurbsSurface:
-                    comp = om.MFnDoubleIndexedComponent()
-                    vtx_component = comp.create(om.MFn.kSurfaceCVComponent)
-                    comp.setCompleteData(shape_fn.numCVsInU, shape_fn.numCVsInV)
-
-                vtx_components.append(vtx_component)
-
-            return vtx_components
-        
-    def _get_vtx_ids(self):
-        """
-        Retrieves the vertex IDs for the shape node.
-
-        Returns:
-            list: The vertex IDs for the shape node.
-        """
-        vtx_ids = []
-        
-        if self.shapes_fn:
-            for shape_fn in self._shapes_fn:
-                if shape_fn.type() == om.MFn.kMesh:
-                    vtx_id = range(0, len(cmds.ls('{}.vtx[*]'.format(self.dependnode_fn.name()), fl=True)))
-                else:
-                    vtx_id = range(0, len(cmds.ls('{}.cv[*]'.format(self.dependnode_fn.name()), fl=True)))
-
-                vtx_ids.append(vtx_id)
-
-            return vtx_ids
-        else:
-            return None
-        
-    def _get_vtx_counts(self):
-        """
-        Retrieves the vertex count for the shape node.
-
-        Returns:
-            int: The vertex count for the shape node.
-        """
-        return [len(vtx_id) for vtx_id in self._vtx_ids]
-
     #... Properties ...#
     @property
     def dag_path(self):
@@ -229,6 +595,9 @@ class DagNodeData(DependencyNodeData):
         Returns:
             om.MDagPath: The MDagPath for the node.
         """
+        if self._dag_path is _UNSET:
+            self._dag_path = self._get_dag_path()
+
         return self._dag_path
         
     @property
@@ -239,6 +608,9 @@ class DagNodeData(DependencyNodeData):
         Returns:
             List[om.MObject]: List of shape nodes for the node.
         """
+        if self._shapes is _UNSET:
+            self._shapes = self._get_shapes()
+
         return self._shapes
 
     @property
@@ -249,6 +621,9 @@ class DagNodeData(DependencyNodeData):
         Returns:
             om.MFnTransform: The MFnTransform for the node.
         """
+        if self._transform_fn is _UNSET:
+            self._transform_fn = self._get_transform_fn()
+
         return self._transform_fn
     
     @property
@@ -257,39 +632,320 @@ class DagNodeData(DependencyNodeData):
         Retrieves the MFnMesh, MFnNurbsCurve, or MFnNurbsSurface for the shape node.
 
         Returns:
-            om.MFnMesh or om.MFnNurbsCurve or om.MFnNurbsSurface: The function set for the shape node.
+            list: The function set of every shape in shapes, None for non-geometry shapes.
         """
+        if self._shapes_fn is _UNSET:
+            self._shapes_fn = self._get_shapes_fn()
+
         return self._shapes_fn
 
-    @property
-    def vtx_component(self):
+
+class NodeDataCache:
+    """
+    A process wide identity map returning existing node wrappers.
+
+    Wrappers are keyed by the MObjectHandle hash of their node and their class, so a
+    node wrapped as DagNodeData twice gets the same instance, and everything it has
+    cached already. Scene callbacks keep the map correct: deleted nodes are dropped,
+    renamed and reparented nodes have their cached DAG data reset, and opening or
+    creating a scene empties the map.
+
+    Use DependencyNodeData.get and DagNodeData.get rather than this class directly.
+
+    Properties:
+        stats (dict): The hits, misses, evictions, resets and current size.
+    """
+    def __init__(self):
         """
-        Retrieves the vertex component for the shape node.
+        Initializes a new instance of the NodeDataCache class.
+        """
+        self._entries = {}
+        self._callback_ids = []
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'resets': 0}
+
+    #... Public Methods ...#
+    def get(self, cls, node):
+        """
+        Returns the cached wrapper of a node, wrapping it on the first request.
+
+        Args:
+            cls (type): DependencyNodeData, DagNodeData or a subclass constructed from a node only.
+            node (str or om.MObject or om.MDagPath): The node name, DAG path, UUID or MObject.
 
         Returns:
-            om.MObject: The vertex component for the shape node.
+            DependencyNodeData: The wrapper.
+
+        Raises:
+            TypeError: If no node is assigned.
+            ValueError: If the node does not exist, or is not a DAG node for DagNodeData.
         """
-        return self._vtx_component
-    
-    @property
-    def vtx_ids(self):
+        return self.get_object(cls, resolve_node(node))
+
+    def get_object(self, cls, m_obj):
         """
-        Retrieves the vertex IDs for the shape node.
+        Returns the cached wrapper of a resolved node.
+
+        Args:
+            cls (type): The wrapper class.
+            m_obj (om.MObject): The node.
 
         Returns:
-            list: The vertex IDs for the shape node.
+            DependencyNodeData: The wrapper.
         """
-        return self._vtx_ids
-    
-    @property
-    def vtx_counts(self):
+        if not self._callback_ids:
+            self.install()
+
+        handle = om.MObjectHandle(m_obj)
+        entries = self._entries.setdefault(handle.hashCode(), [])
+
+        for entry in entries:
+            if type(entry) is cls and entry.m_obj == m_obj:
+                self._stats['hits'] += 1
+                return entry
+
+        self._stats['misses'] += 1
+
+        wrapper = cls(m_obj)
+        entries.append(wrapper)
+
+        return wrapper
+
+    def get_many(self, cls, m_objs, dag_paths=None):
+        """
+        Returns the cached wrappers of many resolved nodes.
+
+        DAG paths already known from resolving the nodes are handed to new wrappers, so
+        they do not search for one again.
+
+        Args:
+            cls (type): The wrapper class.
+            m_objs (list): The om.MObject of every node, None for nodes that were not found.
+            dag_paths (list, optional): The om.MDagPath of every node, or None. Defaults to None.
+
+        Returns:
+            tuple: The wrappers, None where m_objs is None or the node cannot be wrapped by
+                cls, and the indices of the nodes that cannot be wrapped.
+        """
+        if dag_paths is None:
+            dag_paths = [None] * len(m_objs)
+
+        wrappers = []
+        invalid = []
+        for index, (m_obj, dag_path) in enumerate(zip(m_objs, dag_paths)):
+            if m_obj is None:
+                wrappers.append(None)
+                continue
+
+            try:
+                wrapper = self.get_object(cls, m_obj)
+            except ValueError:
+                invalid.append(index)
+                wrappers.append(None)
+                continue
+
+            if dag_path is not None:
+                wrapper._set_dag_path(dag_path)
+            wrappers.append(wrapper)
+
+        return wrappers, invalid
+
+    def install(self):
+        """
+        Registers the scene callbacks keeping the map correct. Called on first use.
+
+        Returns:
+            None
+        """
+        if self._callback_ids:
+            return
+
+        self._callback_ids = [om.MDGMessage.addNodeRemovedCallback(self._on_node_removed, 'dependNode'),
+                              om.MNodeMessage.addNameChangedCallback(om.MObject(), self._on_name_changed),
+                              om.MDagMessage.addAllDagChangesCallback(self._on_dag_changed),
+                              om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeNew, self._on_scene_changed),
+                              om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, self._on_scene_changed)]
+
+    def uninstall(self):
+        """
+        Removes the scene callbacks and empties the map.
+
+        Returns:
+            None
+        """
+        if self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+        self._entries = {}
+
+    def clear(self):
+        """
+        Empties the map, keeping the callbacks and statistics.
+
+        Returns:
+            None
+        """
+        self._entries = {}
+
+    def reset_stats(self):
+        """
+        Sets all counters back to zero.
+
+        Returns:
+            None
+        """
+        self._stats = dict.fromkeys(self._stats, 0)
+
+    #... Private Methods ...#
+    def _find(self, m_obj):
+        """
+        Returns the cached wrappers of a node, of any class.
+
+        Args:
+            m_obj (om.MObject): The node.
+
+        Returns:
+            list: The wrappers.
+        """
+        entries = self._entries.get(om.MObjectHandle(m_obj).hashCode(), [])
+
+        return [entry for entry in entries if entry.m_obj == m_obj]
+
+    def _reset(self, m_obj):
+        """
+        Drops the cached function sets and DAG data of the wrappers of a node.
+
+        Args:
+            m_obj (om.MObject): The node.
+
+        Returns:
+            None
+        """
+        for entry in self._find(m_obj):
+            entry._reset_cache()
+            self._stats['resets'] += 1
+
+    def _on_node_removed(self, m_obj, client_data):
+        """
+        Drops the wrappers of a node that is being deleted.
+
+        Args:
+            m_obj (om.MObject): The deleted node.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        hash_code = om.MObjectHandle(m_obj).hashCode()
+        entries = self._entries.get(hash_code)
+        if not entries:
+            return
+
+        kept = [entry for entry in entries if entry.m_obj != m_obj]
+        self._stats['evictions'] += len(entries) - len(kept)
+
+        if kept:
+            self._entries[hash_code] = kept
+        else:
+            del self._entries[hash_code]
+
+    def _on_name_changed(self, m_obj, previous_name, client_data):
+        """
+        Resets the wrappers of a renamed node.
+
+        Args:
+            m_obj (om.MObject): The renamed node.
+            previous_name (str): The name before the change.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        self._reset(m_obj)
+
+    @staticmethod
+    def _is_below(m_obj, root):
+        """
+        Checks whether a DAG node is a node or one of its descendants, through any instance.
+
+        Args:
+            m_obj (om.MObject): The DAG node.
+            root (om.MObject): The possible ancestor.
+
+        Returns:
+            bool: True if root is m_obj or one of its ancestors.
+        """
+        pending = [m_obj]
+        while pending:
+            node = pending.pop()
+            if node == root:
+                return True
+
+            dag_fn = om.MFnDagNode(node)
+            pending.extend(dag_fn.parent(index) for index in range(dag_fn.parentCount()))
+
+        return False
+
+    def _on_dag_changed(self, message, child, parent, client_data):
         """
-        Retrieves the vertex count for the shape node.
+        Resets the wrappers of a reparented node, its descendants and both parents.
+
+        The DAG paths and shape lists cached below the node no longer describe where
+        the nodes are, and the parent gained or lost a child. Only the cached wrappers
+        are checked, walking up from each of them, so the cost follows the size of the
+        map rather than the size of the moved hierarchy.
+
+        Args:
+            message (int): The MDagMessage type.
+            child (om.MDagPath): The node that was added, removed or reparented.
+            parent (om.MDagPath): The parent involved in the change.
+            client_data: Unused.
 
         Returns:
-            int: The vertex count for the shape node.
+            None
         """
-        return self._vtx_counts
+        if not self._entries:
+            return
+
+        if parent.isValid():
+            self._reset(parent.node())
+
+        if not child.isValid():
+            return
+
+        # a moved hierarchy stays below its root, so the live DAG tells what was moved
+        child_node = child.node()
+        for entries in self._entries.values():
+            for entry in entries:
+                if entry.m_obj.hasFn(om.MFn.kDagNode) and self._is_below(entry.m_obj, child_node):
+                    entry._reset_cache()
+                    self._stats['resets'] += 1
+
+    def _on_scene_changed(self, client_data):
+        """
+        Empties the map before a new scene is created or opened.
+
+        Args:
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        self.clear()
+
+    #... Properties ...#
+    @property
+    def stats(self):
+        stats = dict(self._stats)
+        stats['size'] = sum(len(entries) for entries in self._entries.values())
+
+        requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+
+        return stats
+
+
+# The identity map shared by every DependencyNodeData.get and DagNodeData.get call
+NODE_DATA_CACHE = NodeDataCache()
 
 
 class MetaNode:
@@ -418,7 +1074,7 @@ class DeserializeMetaNode:
         Args:
             meta_node: The meta node to deserialize.
         """
-        self.meta_node = DependencyNodeData(meta_node)
+        self.meta_node = DependencyNodeData.get(meta_node)
         self._data = {}
         self._deseriazlie_data()
         self._class = self._get_class()
@@ -479,7 +1135,7 @@ class DeserializeMetaNode:
         message_plug = self.meta_node.dependnode_fn.findPlug(attr, True)
         connected_node = message_plug.connectedTo(True,False)[0].node()
 
-        connected_node = DagNodeData(om.MFnDagNode(connected_node).fullPathName())
+        connected_node = DagNodeData.get(connected_node)
 
         return connected_node.dag_path
 
@@ -1,13 +1,35 @@
+from typing import List, Optional, Tuple, Union
 
-from typing import Union
+import numpy as np
 
 import maya.api.OpenMaya as om
 
 
+def resolve_node(node: Union[str, om.MObject, om.MDagPath]) -> om.MObject: ...
+
+def resolve_nodes(nodes: list) -> Tuple[list, list, list]: ...
+
+def mpoint_array_to_numpy(points: Union[om.MPointArray, om.MFloatVectorArray]) -> np.ndarray: ...
+
+def numpy_to_mpoint_array(points: np.ndarray) -> om.MPointArray: ...
+
+
 class DependencyNodeData:
 
     def __init__(self, node=None) -> None: ...
 
+    #... Public Methods ...#
+    @classmethod
+    def get(cls, node: Union[str, om.MObject, om.MDagPath]) -> 'DependencyNodeData': ...
+
+    @classmethod
+    def from_many(cls, nodes: list, ignore_missing: bool = False) -> List['DependencyNodeData']: ...
+
+    #... Private Methods ...#
+    def _reset_cache(self) -> None: ...
+
+    def _set_dag_path(self, dag_path: om.MDagPath) -> None: ...
+
     #... Private methods ...#
     def _check_if_dag_or_depend_node(self) -> None: ...
 
@@ -26,7 +48,35 @@ class DagNodeData(DependencyNodeData):
 
     def __init__(self, node=None) -> None: ...
 
+    #... Public methods ...#
+    def get_point_count(self, shape_index: int = 0) -> int: ...
+
+    def get_points(self, shape_index: int = 0, space: int = om.MSpace.kObject) -> np.ndarray: ...
+
+    def set_points(self, points: np.ndarray, shape_index: int = 0, space: int = om.MSpace.kObject) -> None: ...
+
+    def get_normals(self, shape_index: int = 0, space: int = om.MSpace.kObject,
+                    angle_weighted: bool = False) -> np.ndarray: ...
+
+    def get_vtx_component(self) -> Optional[List[Optional[om.MObject]]]: ...
+
+    def get_vtx_ids(self) -> Optional[List[Optional[range]]]: ...
+
+    def get_vtx_counts(self) -> Optional[List[Optional[int]]]: ...
+
     #... Private methods ...#
+    def _reset_cache(self) -> None: ...
+
+    def _set_dag_path(self, dag_path: om.MDagPath) -> None: ...
+
+    def _get_shape_fn(self, shape_index: int) -> Union[om.MFnMesh, om.MFnNurbsCurve, om.MFnNurbsSurface]: ...
+
+    @staticmethod
+    def _get_point_count(shape_fn: Union[om.MFnMesh, om.MFnNurbsCurve, om.MFnNurbsSurface]) -> int: ...
+
+    @staticmethod
+    def _create_vtx_component(shape_fn: Union[om.MFnMesh, om.MFnNurbsCurve, om.MFnNurbsSurface]) -> om.MObject: ...
+
     def _check_if_dag_or_depend_node(self) -> None: ...
 
     def _get_dag_path(self) -> om.MDagPath: ...
@@ -35,13 +85,7 @@ class DagNodeData(DependencyNodeData):
         
     def _get_transform_fn(self) -> om.MFnTransform: ...
 
-    def _get_shapes_fn(self) -> Union[om.MFnMesh, om.MFnNurbsCurve, om.MFnNurbsSurface]: ...
-        
-    def _get_vtx_component(self) -> om.MObject: ...
-        
-    def _get_vtx_ids(self) -> list: ...
-        
-    def _get_vtx_counts(self) -> int: ...
+    def _get_shapes_fn(self) -> List[Optional[Union[om.MFnMesh, om.MFnNurbsCurve, om.MFnNurbsSurface]]]: ...
 
     #... Properties ...#
     @property
@@ -54,16 +98,50 @@ class DagNodeData(DependencyNodeData):
     def transform_fn(self) -> om.MFnTransform: ...
     
     @property
-    def shapes_fn(self) -> Union[om.MFnMesh, om.MFnNurbsCurve, om.MFnNurbsSurface]: ...
+    def shapes_fn(self) -> List[Optional[Union[om.MFnMesh, om.MFnNurbsCurve, om.MFnNurbsSurface]]]: ...
 
+
+class NodeDataCache:
+
+    def __init__(self) -> None: ...
+
+    #... Public Methods ...#
+    def get(self, cls: type, node: Union[str, om.MObject, om.MDagPath]) -> DependencyNodeData: ...
+
+    def get_object(self, cls: type, m_obj: om.MObject) -> DependencyNodeData: ...
+
+    def get_many(self, cls: type, m_objs: list, dag_paths: Optional[list] = None) -> Tuple[list, list]: ...
+
+    def install(self) -> None: ...
+
+    def uninstall(self) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def reset_stats(self) -> None: ...
+
+    #... Private Methods ...#
+    def _find(self, m_obj: om.MObject) -> list: ...
+
+    def _reset(self, m_obj: om.MObject) -> None: ...
+
+    def _on_node_removed(self, m_obj: om.MObject, client_data: object) -> None: ...
+
+    def _on_name_changed(self, m_obj: om.MObject, previous_name: str, client_data: object) -> None: ...
+
+    @staticmethod
+    def _is_below(m_obj: om.MObject, root: om.MObject) -> bool: ...
+
+    def _on_dag_changed(self, message: int, child: om.MDagPath, parent: om.MDagPath, client_data: object) -> None: ...
+
+    def _on_scene_changed(self, client_data: object) -> None: ...
+
+    #... Properties ...#
     @property
-    def vtx_component(self) -> om.MObject: ...
-    
-    @property
-    def vtx_ids(self) -> list: ...
-    
-    @property
-    def vtx_counts(self) -> int: ...
+    def stats(self) -> dict: ...
+
+
+NODE_DATA_CACHE: NodeDataCache
 
 
 class MetaNode:
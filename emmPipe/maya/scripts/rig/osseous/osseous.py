@@ -49,12 +49,10 @@ class OsseousBase(BaseObject):
     def from_data(cls, meta_node, data):
         super().from_data(meta_node, data)
         
-        cls.instance.joints_grp = DagNodeData(data['joints_grp'])
-        cls.instance.joints_utils = DagNodeData(data['joints_utils'])
-        cls.instance.modules_grp = DagNodeData(data['modules_grp'])
-        cls.instance.controls_grp = DagNodeData(data['controls_grp'])
-        cls.instance.root_joint = DagNodeData(data['root_joint'])
-        cls.instance.root_ctrl = DagNodeData(data['root_ctrl'])
+        (cls.instance.joints_grp, cls.instance.joints_utils,
+         cls.instance.modules_grp, cls.instance.controls_grp,
+         cls.instance.root_joint, cls.instance.root_ctrl) = DagNodeData.from_many(
+            [data[key] for key in ('joints_grp', 'joints_utils', 'modules_grp', 'controls_grp', 'root_joint', 'root_ctrl')])
 
         return cls.instance
     
@@ -220,8 +218,8 @@ class Osseous(BaseObject):
     def from_data(cls, meta_node, data):
         super().from_data(meta_node, data)
         
-        cls.instance.rig_module = DagNodeData(data['rig_module'])
-        cls.instance.end_joint = DagNodeData(data['end_joint'])
+        cls.instance.rig_module, cls.instance.end_joint = DagNodeData.from_many(
+            [data[key] for key in ('rig_module', 'end_joint')])
 
         return cls.instance
 
@@ -0,0 +1,13 @@
+"""Shared test setup for emmPipe.
+
+The rig package lives under emmPipe/maya/scripts and is imported as ``rig`` inside
+Maya. The skin weight modules under rig.deformers only need NumPy, so they are
+tested headless by putting that folder on the path.
+"""
+import os
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'emmPipe', 'maya', 'scripts')
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
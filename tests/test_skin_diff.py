@@ -0,0 +1,65 @@
+"""Tests for rig.deformers.skin_diff."""
+import numpy as np
+
+from rig.deformers.skin_weights import dense_to_csr
+from rig.deformers.skin_file import write_skin_file
+from rig.deformers.skin_diff import diff_skin_files, format_diff_report
+
+
+def _write(path, shapes):
+    metadata = {'shapes': []}
+    arrays = {}
+    for index, (name, influence_names, weights) in enumerate(shapes):
+        indptr, indices, values = dense_to_csr(weights)
+        metadata['shapes'].append({'shape': name, 'num_vertices': len(weights),
+                                   'num_influences': len(influence_names), 'influence_names': influence_names})
+        arrays.update({'{}/weights/indptr'.format(index): indptr, '{}/weights/indices'.format(index): indices,
+                       '{}/weights/values'.format(index): values})
+
+    write_skin_file(path, metadata, arrays)
+
+    return path
+
+
+def _weights(num_vertices, num_influences, seed=0):
+    weights = np.random.default_rng(seed).random((num_vertices, num_influences))
+
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def test_reordered_influences_are_not_changes(tmp_path):
+    weights = _weights(300, 3)
+    path_a = _write(str(tmp_path / 'a.skin'), [('body', ['|root|a', 'b', 'c'], weights)])
+    path_b = _write(str(tmp_path / 'b.skin'), [('body', ['c', 'a', 'b'], weights[:, [2, 0, 1]])])
+
+    report = diff_skin_files(path_a, path_b, block_vertices=64)
+    shape = report['shapes'][0]
+
+    assert not len(shape['changed_vertices'])
+    assert not shape['added_influences'] and not shape['removed_influences']
+    assert max(shape['influence_linf'].values()) < 1e-6
+
+
+def test_changed_vertices_and_influences(tmp_path):
+    weights_a = _weights(300, 3)
+    weights_b = np.hstack([weights_a, np.zeros((300, 1))])
+    weights_b[[5, 150, 299]] = [0.0, 0.0, 0.0, 1.0]
+
+    path_a = _write(str(tmp_path / 'a.skin'), [('body', ['a', 'b', 'c'], weights_a),
+                                               ('eyes', ['a'], np.ones((4, 1))),
+                                               ('tongue', ['a'], np.ones((4, 1)))])
+    path_b = _write(str(tmp_path / 'b.skin'), [('body', ['a', 'b', 'c', 'd'], weights_b),
+                                               ('tongue', ['a'], np.ones((4, 1))),
+                                               ('teeth', ['a'], np.ones((4, 1)))])
+
+    report = diff_skin_files(path_a, path_b, block_vertices=64)
+    shape = report['shapes'][0]
+
+    assert [entry['shape'] for entry in report['shapes']] == ['body', 'tongue']
+    assert report['added_shapes'] == ['teeth'] and report['removed_shapes'] == ['eyes']
+    assert shape['added_influences'] == ['d'] and shape['removed_influences'] == []
+    np.testing.assert_array_equal(shape['changed_vertices'], [5, 150, 299])
+    np.testing.assert_allclose(shape['vertex_linf'], 1.0, atol=1e-6)
+    np.testing.assert_allclose(shape['vertex_l1'], 2.0, atol=1e-6)
+    assert abs(shape['influence_l1']['d'] - 3.0) < 1e-6
+    assert 'body' in format_diff_report(report)
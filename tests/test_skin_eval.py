@@ -0,0 +1,87 @@
+"""Tests for rig.deformers.skin_eval."""
+import numpy as np
+import pytest
+
+from rig.deformers.skin_eval import (CLASSIC_LINEAR, DUAL_QUATERNION, WEIGHT_BLENDED, evaluate_skin,
+                                     bind_pose_matrices)
+
+
+def _rigid_matrix(angle, translation):
+    """Returns a row vector 4x4 matrix rotating about z, then translating."""
+    cosine, sine = np.cos(angle), np.sin(angle)
+    matrix = np.eye(4)
+    matrix[0, :2] = cosine, sine
+    matrix[1, :2] = -sine, cosine
+    matrix[3, :3] = translation
+
+    return matrix
+
+
+def _skin(num_vertices=50, num_influences=4, seed=0):
+    rng = np.random.default_rng(seed)
+    points = rng.normal(size=(num_vertices, 3))
+    weights = rng.random((num_vertices, num_influences))
+    weights /= weights.sum(axis=1, keepdims=True)
+    bind_world = np.stack([_rigid_matrix(rng.random(), rng.normal(size=3)) for _ in range(num_influences)])
+
+    return points, weights, np.linalg.inv(bind_world), bind_world
+
+
+@pytest.mark.parametrize('method', [CLASSIC_LINEAR, DUAL_QUATERNION, WEIGHT_BLENDED])
+def test_bind_pose_returns_rest_points(method):
+    points, weights, bind_pre, bind_world = _skin()
+    blend = np.linspace(0.0, 1.0, len(points))
+
+    deformed = evaluate_skin(points, weights, bind_pre, bind_world, method, blend)
+
+    assert deformed.shape == (1, len(points), 3)
+    np.testing.assert_allclose(deformed[0], points, atol=1e-10)
+    np.testing.assert_allclose(bind_pose_matrices({'bind_pre_matrix_values': bind_pre}), bind_world, atol=1e-12)
+
+
+@pytest.mark.parametrize('method', [CLASSIC_LINEAR, DUAL_QUATERNION, WEIGHT_BLENDED])
+def test_shared_rigid_transform(method):
+    points, weights, bind_pre, bind_world = _skin()
+    blend = np.linspace(0.0, 1.0, len(points))
+    transforms = np.stack([_rigid_matrix(0.7, [1.0, 2.0, 3.0]), _rigid_matrix(-1.2, [0.0, -4.0, 0.5])])
+
+    # every influence moves by the same transform in each frame
+    world = np.matmul(bind_world[None], transforms[:, None])
+    deformed = evaluate_skin(points, weights, bind_pre, world, method, blend)
+
+    homogeneous = np.hstack([points, np.ones((len(points), 1))])
+    expected = np.matmul(homogeneous[None], transforms)[..., :3]
+    np.testing.assert_allclose(deformed, expected, atol=1e-9)
+
+
+def test_linear_matches_brute_force():
+    points, weights, bind_pre, bind_world = _skin(num_vertices=20, seed=3)
+    world = np.stack([_rigid_matrix(angle, [angle, 0.0, -angle]) for angle in (0.1, 0.5, 1.0, 2.0)])
+
+    deformed = evaluate_skin(points, weights, bind_pre, world)
+
+    homogeneous = np.hstack([points, np.ones((len(points), 1))])
+    expected = sum(weights[:, [index]] * (homogeneous @ bind_pre[index] @ world[index])[:, :3]
+                   for index in range(len(world)))
+    np.testing.assert_allclose(deformed[0], expected, atol=1e-10)
+
+
+def test_max_influences_keeps_largest_weights():
+    points, weights, bind_pre, bind_world = _skin(num_vertices=10, num_influences=3, seed=4)
+    weights[:, 0] += 1.0
+    world = np.stack([_rigid_matrix(0.0, offset) for offset in np.eye(3)])
+
+    largest = np.zeros_like(weights)
+    largest[:, 0] = weights[:, 0]
+
+    np.testing.assert_allclose(evaluate_skin(points, weights, bind_pre, world, max_influences=1),
+                               evaluate_skin(points, largest, bind_pre, world), atol=1e-12)
+
+
+def test_invalid_methods_raise():
+    points, weights, bind_pre, bind_world = _skin()
+
+    with pytest.raises(ValueError):
+        evaluate_skin(points, weights, bind_pre, bind_world, skinning_method=5)
+    with pytest.raises(ValueError):
+        evaluate_skin(points, weights, bind_pre, bind_world, skinning_method=WEIGHT_BLENDED)
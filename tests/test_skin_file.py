@@ -0,0 +1,321 @@
+"""Tests for rig.deformers.skin_file."""
+import os
+import gzip
+import pickle
+import struct
+
+import numpy as np
+import pytest
+
+from rig.deformers.skin_weights import dense_to_csr, encode_weight_values
+from rig.deformers.skin_file import (MAGIC, FORMAT_VERSION, FILE_EXTENSION, ALIGNMENT, ChunkStore, SkinFile,
+                                     SkinFileWriter, write_skin_file, read_skincluster_data, decode_shape_weights,
+                                     decode_shape_weight_rows, condition_skin_file, shape_entries,
+                                     iter_weight_blocks, read_weight_rows, read_row_subset, read_weight_subset,
+                                     select_shape_influences)
+
+NUM_INFLUENCES = 6
+
+
+def _weights(num_vertices, seed=0):
+    rng = np.random.default_rng(seed)
+    weights = rng.random((num_vertices, NUM_INFLUENCES)) * (rng.random((num_vertices, NUM_INFLUENCES)) < 0.4)
+    weights[::7] = 0.0
+    weights[-1] = 0.0
+    totals = weights.sum(axis=1, keepdims=True)
+
+    return np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0)
+
+
+def _shape(weights, encoding='float32'):
+    indptr, indices, values = dense_to_csr(weights, dtype=np.float64)
+    metadata = {'shape': 'bodyShape', 'num_vertices': len(weights), 'num_influences': NUM_INFLUENCES,
+                'influence_names': ['joint_{}'.format(index) for index in range(NUM_INFLUENCES)],
+                'weights_encoding': encoding}
+    arrays = {'weights/indptr': indptr, 'weights/indices': indices,
+              'weights/values': encode_weight_values(indptr, values, encoding),
+              'rest_points': np.arange(len(weights) * 3, dtype=np.float64).reshape(-1, 3),
+              'empty': np.empty((0, 4, 4))}
+
+    return metadata, arrays
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'body{}'.format(FILE_EXTENSION))
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_write_and_read_round_trip(path, mmap):
+    metadata, arrays = _shape(_weights(1000))
+
+    write_skin_file(path, metadata, arrays)
+
+    skin_file = SkinFile(path)
+    assert skin_file.version == 1
+    assert skin_file.chunk_store is None
+    assert skin_file.metadata == metadata
+    assert sorted(skin_file.array_names) == sorted(arrays)
+    assert not os.path.exists('{}.tmp'.format(path))
+
+    for name, array in arrays.items():
+        stored = skin_file.array(name, mmap=mmap)
+        assert stored.dtype == array.dtype
+        np.testing.assert_array_equal(stored, array)
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_chunk_store_round_trip(tmp_path, path, mmap):
+    metadata, arrays = _shape(_weights(1000))
+    chunk_store = ChunkStore(str(tmp_path / 'chunks'))
+
+    write_skin_file(path, metadata, arrays, chunk_store=chunk_store, chunk_rows=128)
+
+    skin_file = SkinFile(path)
+    assert skin_file.version == 2
+    assert os.path.samefile(skin_file.chunk_store.path, chunk_store.path)
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(skin_file.array(name, mmap=mmap), array)
+
+
+def test_chunk_store_shares_unchanged_chunks(tmp_path):
+    chunk_store = ChunkStore(str(tmp_path / 'chunks'))
+    weights = _weights(1024)
+
+    write_skin_file(str(tmp_path / 'v001.skin'), *_shape(weights), chunk_store=chunk_store, chunk_rows=128)
+    num_chunks = sum(len(files) for _, _, files in os.walk(chunk_store.path))
+
+    # the same number of weights per vertex, so only the indices and values of the first block change
+    weights[:10] = np.roll(weights[:10], 1, axis=1)
+    write_skin_file(str(tmp_path / 'v002.skin'), *_shape(weights), chunk_store=chunk_store, chunk_rows=128)
+    added = sum(len(files) for _, _, files in os.walk(chunk_store.path)) - num_chunks
+
+    assert added == 2
+    np.testing.assert_allclose(decode_shape_weights(read_skincluster_data(str(tmp_path / 'v002.skin'))[0]),
+                               weights, atol=1e-7)
+
+
+@pytest.mark.parametrize('use_store', [False, True], ids=['in_file', 'chunk_store'])
+def test_read_rows_and_weight_blocks(tmp_path, path, use_store):
+    weights = _weights(1000, seed=3)
+    metadata, arrays = _shape(weights)
+    chunk_store = ChunkStore(str(tmp_path / 'chunks')) if use_store else None
+    write_skin_file(path, {'shapes': [metadata]}, {'0/{}'.format(name): array for name, array in arrays.items()},
+                    chunk_store=chunk_store, chunk_rows=128)
+
+    skin_file = SkinFile(path)
+    (shape_metadata, prefix), = shape_entries(skin_file)
+    assert prefix == '0/' and shape_metadata == metadata
+
+    for start, stop in ((0, 1), (100, 300), (127, 129), (990, 1000), (1000, 1000)):
+        np.testing.assert_array_equal(skin_file.read_rows('0/rest_points', start, stop),
+                                      arrays['rest_points'][start:stop])
+        np.testing.assert_allclose(read_weight_rows(skin_file, prefix, NUM_INFLUENCES, start, stop),
+                                   weights[start:stop], atol=1e-7)
+
+    blocks = list(iter_weight_blocks(skin_file, prefix, NUM_INFLUENCES, block_vertices=96))
+    assert [start for start, _ in blocks] == list(range(0, 1000, 96))
+    np.testing.assert_allclose(np.concatenate([block for _, block in blocks]), weights, atol=1e-7)
+
+
+@pytest.mark.parametrize('encoding', ['float16', 'uint16', 'uint8'])
+def test_encoded_weights_round_trip(tmp_path, path, encoding):
+    weights = _weights(500, seed=4)
+    write_skin_file(path, *_shape(weights, encoding), chunk_store=ChunkStore(str(tmp_path / 'chunks')),
+                    chunk_rows=64)
+
+    skin_file = SkinFile(path)
+    decoded = decode_shape_weights(read_skincluster_data(path)[0])
+
+    assert skin_file.array('weights/values').dtype == np.dtype(encoding)
+    np.testing.assert_allclose(decoded, weights, atol=1.0 / 255)
+    np.testing.assert_allclose(read_weight_rows(skin_file, '', NUM_INFLUENCES, 450, 500), decoded[450:])
+
+
+@pytest.mark.parametrize('use_store', [False, True], ids=['in_file', 'chunk_store'])
+def test_read_subsets(tmp_path, path, use_store):
+    weights = _weights(1000, seed=5)
+    metadata, arrays = _shape(weights, 'uint16')
+    chunk_store = ChunkStore(str(tmp_path / 'chunks')) if use_store else None
+    write_skin_file(path, metadata, arrays, chunk_store=chunk_store, chunk_rows=128)
+
+    skin_file = SkinFile(path)
+    subset = np.array([999, 0, 500, 128, 127, 500])
+
+    np.testing.assert_array_equal(read_row_subset(skin_file, 'rest_points', subset, block_rows=128),
+                                  arrays['rest_points'][subset])
+    np.testing.assert_allclose(read_weight_subset(skin_file, '', NUM_INFLUENCES, subset, block_vertices=128),
+                               weights[subset], atol=1.0 / 65535)
+    assert read_weight_subset(skin_file, '', NUM_INFLUENCES, np.empty(0, dtype=np.int64)).shape == (0, 6)
+
+
+@pytest.mark.parametrize('use_store', [False, True], ids=['in_file', 'chunk_store'])
+@pytest.mark.parametrize('encoding', ['float32', 'uint16', 'uint8'])
+def test_streamed_round_trip(tmp_path, path, use_store, encoding):
+    weights = _weights(1000, seed=1)
+    chunk_store = ChunkStore(str(tmp_path / 'chunks')) if use_store else None
+    metadata, _ = _shape(weights, encoding)
+
+    writer = SkinFileWriter(path, chunk_store=chunk_store, chunk_rows=128)
+    for start in range(0, len(weights), 96):
+        indptr, indices, values = dense_to_csr(weights[start:start + 96], dtype=np.float64)
+        writer.append_weight_block('0/', indptr, indices, encode_weight_values(indptr, values, encoding))
+    writer.write_array('0/rest_points', np.zeros((len(weights), 3)))
+    writer.close({'shapes': [metadata]})
+
+    skin_file = SkinFile(path)
+    assert skin_file.version == (2 if use_store else 3)
+    assert not os.path.exists('{}.tmp'.format(path))
+    assert len(skin_file.array('0/weights/indptr')) == len(weights) + 1
+
+    tolerance = 1.0 / 255 if encoding == 'uint8' else 1e-4
+    data = read_skincluster_data(path)[0]
+    np.testing.assert_allclose(decode_shape_weights(data), weights, atol=tolerance)
+
+    blocks = list(iter_weight_blocks(skin_file, '0/', NUM_INFLUENCES, block_vertices=128))
+    np.testing.assert_allclose(np.concatenate([block for _, block in blocks]), weights, atol=tolerance)
+
+    subset = np.array([999, 0, 500, 128, 127])
+    np.testing.assert_allclose(read_weight_subset(skin_file, '0/', NUM_INFLUENCES, subset, block_vertices=128),
+                               weights[subset], atol=tolerance)
+    np.testing.assert_array_equal(read_row_subset(skin_file, '0/rest_points', subset), np.zeros((5, 3)))
+
+
+def test_discarded_writer_leaves_nothing(path):
+    writer = SkinFileWriter(path)
+    writer.append_rows('values', np.arange(10))
+    writer.discard()
+
+    assert not os.path.exists(path)
+    assert not os.path.exists('{}.tmp'.format(path))
+
+
+def test_writer_rejects_mismatched_rows(path):
+    writer = SkinFileWriter(path)
+    writer.append_rows('values', np.arange(10, dtype=np.int32))
+
+    with pytest.raises(TypeError):
+        writer.append_rows('values', np.arange(10, dtype=np.float32))
+    writer.discard()
+
+
+def test_arrays_are_aligned(path):
+    write_skin_file(path, {}, {'a': np.arange(3, dtype=np.uint8), 'b': np.arange(5, dtype=np.float64)})
+
+    stored = SkinFile(path).array('b')
+    assert stored.offset % ALIGNMENT == 0
+
+
+def test_missing_array_raises(path):
+    write_skin_file(path, {}, {})
+
+    skin_file = SkinFile(path)
+    assert not skin_file.has_array('weights/values')
+    with pytest.raises(KeyError):
+        skin_file.array('weights/values')
+
+
+def test_rejects_object_arrays(path):
+    with pytest.raises(TypeError):
+        write_skin_file(path, {}, {'names': np.array(['a', 'b'], dtype=object)})
+
+
+def test_rejects_foreign_and_newer_files(path):
+    with open(path, 'wb') as file_obj:
+        file_obj.write(b'\x1f\x8b' + b'\x00' * 100)
+    with pytest.raises(ValueError):
+        SkinFile(path)
+
+    with open(path, 'wb') as file_obj:
+        file_obj.write(struct.pack('<8sI4xQQQ', MAGIC, FORMAT_VERSION + 1, 64, 2, 128).ljust(64, b'\x00') + b'{}')
+    with pytest.raises(ValueError):
+        SkinFile(path)
+
+
+def test_read_shapes(path):
+    weights = [_weights(50), _weights(20, seed=1)]
+    metadata = {'shapes': []}
+    arrays = {}
+    for shape_index, shape_weights in enumerate(weights):
+        shape_metadata, shape_arrays = _shape(shape_weights)
+        metadata['shapes'].append(shape_metadata)
+        arrays.update({'{}/{}'.format(shape_index, name): array for name, array in shape_arrays.items()})
+    write_skin_file(path, metadata, arrays)
+
+    shapes_data = read_skincluster_data(path)
+
+    assert len(shapes_data) == 2
+    for data, shape_weights in zip(shapes_data, weights):
+        assert data['num_vertices'] == len(shape_weights)
+        assert 'rest_points' in data
+        np.testing.assert_allclose(decode_shape_weights(data), shape_weights, atol=1e-7)
+
+
+@pytest.mark.parametrize('encoding', ['float32', 'uint8'])
+def test_decode_shape_weight_rows(path, encoding):
+    weights = _weights(300, seed=6)
+    write_skin_file(path, *_shape(weights, encoding))
+    data = read_skincluster_data(path)[0]
+
+    decoded = decode_shape_weights(data)
+    for start, stop in ((0, 300), (0, 1), (150, 170), (299, 300), (290, 400)):
+        np.testing.assert_array_equal(decode_shape_weight_rows(data, start, stop), decoded[start:stop])
+
+    dense = {'weights': weights, 'influence_names': data['influence_names']}
+    np.testing.assert_array_equal(decode_shape_weight_rows(dense, 10, 20), weights[10:20])
+
+
+def test_pickle_files_need_opt_in(tmp_path):
+    path = str(tmp_path / 'legacy.pckl.gzip')
+    weights = _weights(10)
+    with gzip.open(path, 'wb') as file_obj:
+        pickle.dump({'weights': weights, 'influence_names': ['joint_{}'.format(index) for index in range(6)],
+                     'num_influences': NUM_INFLUENCES}, file_obj)
+
+    with pytest.raises(ValueError):
+        read_skincluster_data(path)
+
+    np.testing.assert_allclose(decode_shape_weights(read_skincluster_data(path, allow_pickle=True)[0]), weights)
+
+
+def test_condition_skin_file(path, tmp_path):
+    weights = _weights(200, seed=2)
+    write_skin_file(path, *_shape(weights))
+    output_path = str(tmp_path / 'conditioned.skin')
+
+    assert condition_skin_file(path, max_influences=1, output_path=output_path) == output_path
+
+    conditioned = decode_shape_weights(read_skincluster_data(output_path)[0])
+    assert (np.count_nonzero(conditioned, axis=1) <= 1).all()
+    np.testing.assert_allclose(conditioned.sum(axis=1), weights.any(axis=1).astype(np.float64), atol=1e-6)
+    np.testing.assert_allclose(decode_shape_weights(read_skincluster_data(path)[0]), weights, atol=1e-7)
+
+
+def test_condition_skin_file_updates_header_stats(path):
+    weights = _weights(200, seed=2)
+    metadata, arrays = _shape(weights, 'uint16')
+    metadata['weights_max_error'] = 0.0
+    metadata['influence_max_weights'] = weights.max(axis=0).tolist()
+    write_skin_file(path, metadata, arrays)
+
+    condition_skin_file(path, max_influences=1)
+
+    # capping changes the stored values, so their stats are measured again
+    conditioned_metadata = SkinFile(path).metadata
+    conditioned = decode_shape_weights(read_skincluster_data(path)[0])
+    assert 0.0 <= conditioned_metadata['weights_max_error'] < 1.0 / 65535
+    np.testing.assert_allclose(conditioned_metadata['influence_max_weights'], conditioned.max(axis=0),
+                               atol=1.0 / 65535)
+
+
+def test_select_shape_influences():
+    data = {'influence_names': ['a', 'b', 'c'], 'bind_pre_matrix_values': np.arange(48.0).reshape(3, 4, 4),
+            'influence_max_weights': [0.5, 0.0, 1.0], 'num_influences': 3, 'shape': 'body',
+            'weights/values': np.ones(3)}
+
+    selected = select_shape_influences(data, [0, 2])
+
+    assert selected['influence_names'] == ['a', 'c'] and selected['influence_max_weights'] == [0.5, 1.0]
+    assert selected['num_influences'] == 2 and selected['shape'] == 'body'
+    assert 'weights/values' not in selected
+    np.testing.assert_array_equal(selected['bind_pre_matrix_values'], data['bind_pre_matrix_values'][[0, 2]])
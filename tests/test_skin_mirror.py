@@ -0,0 +1,55 @@
+"""Tests for rig.deformers.skin_mirror."""
+import numpy as np
+
+from rig.deformers.skin_mirror import mirror_name, build_mirror_influence_map, find_mirror_vertices, mirror_weights
+
+INFLUENCES = ['|root|spine_c_001', 'arm_l_upper_001', 'arm_r_upper_001', 'L_eye', 'R_eye', 'tail_l_001']
+
+
+def _symmetric_points():
+    """Returns grid points on both sides of the yz plane, plus one unmatched point on each side."""
+    x, y = np.meshgrid(np.linspace(-2.0, 2.0, 9), np.linspace(0.0, 3.0, 7))
+    points = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+
+    return np.vstack([points, [[-5.0, 0.5, 0.0], [5.0, 1.5, 0.0]]])
+
+
+def test_mirror_name():
+    assert mirror_name('arm_l_upper_001') == 'arm_r_upper_001'
+    assert mirror_name('R_eye') == 'L_eye'
+    assert mirror_name('|rig|leg_l|foot_l_001') == '|rig|leg_r|foot_r_001'
+    assert mirror_name('spine_c_001') == 'spine_c_001'
+    assert mirror_name('lip_upper') == 'lip_upper'
+
+
+def test_build_mirror_influence_map():
+    # tail_l_001 has no bound counterpart and maps to itself
+    np.testing.assert_array_equal(build_mirror_influence_map(INFLUENCES), [0, 2, 1, 4, 3, 5])
+
+
+def test_find_mirror_vertices():
+    points = _symmetric_points()
+
+    mirror_indices = find_mirror_vertices(points + [0.0, 0.0, 1e-4], tolerance=1e-3)
+
+    matched = mirror_indices >= 0
+    assert list(np.flatnonzero(~matched)) == [len(points) - 2, len(points) - 1]
+    np.testing.assert_allclose(points[mirror_indices[matched]], points[matched] * [-1.0, 1.0, 1.0])
+
+
+def test_mirror_weights():
+    points = _symmetric_points()
+    rng = np.random.default_rng(0)
+    weights = rng.random((len(points), len(INFLUENCES)))
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    destination, mirrored, unmatched = mirror_weights(weights, points, INFLUENCES, direction=1)
+
+    assert (points[destination, 0] < 0.0).all()
+    assert list(unmatched) == [len(points) - 2]
+    sources = find_mirror_vertices(points)[destination]
+    np.testing.assert_allclose(mirrored, weights[sources][:, [0, 2, 1, 4, 3, 5]])
+
+    destination, _, unmatched = mirror_weights(weights, points, INFLUENCES, direction=-1)
+    assert (points[destination, 0] > 0.0).all()
+    assert list(unmatched) == [len(points) - 1]
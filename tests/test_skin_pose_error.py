@@ -0,0 +1,112 @@
+"""Tests for rig.deformers.skin_pose_error."""
+import numpy as np
+import pytest
+
+from rig.deformers.skin_weights import dense_to_csr
+from rig.deformers.skin_pose_error import pose_error, pose_error_shape_data, format_pose_error_report
+
+NUM_INFLUENCES = 5
+NAMES = ['|root|joint_{}'.format(index) for index in range(NUM_INFLUENCES)]
+
+
+@pytest.fixture
+def skin():
+    rng = np.random.default_rng(4)
+    num_vertices, num_poses = 300, 3
+
+    weights = rng.random((num_vertices, NUM_INFLUENCES)) * (rng.random((num_vertices, NUM_INFLUENCES)) < 0.5)
+    weights[:, 0] += 1e-3
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    world_matrices = np.tile(np.eye(4), (num_poses, NUM_INFLUENCES, 1, 1))
+    world_matrices[:, :, 3, :3] = rng.random((num_poses, NUM_INFLUENCES, 3))
+
+    return {'rest_points': rng.random((num_vertices, 3)),
+            'weights': weights,
+            'bind_pre_matrices': np.tile(np.eye(4), (NUM_INFLUENCES, 1, 1)),
+            'world_matrices': world_matrices}
+
+
+def _shape_data(weights, order, **kwargs):
+    indptr, indices, values = dense_to_csr(weights[:, order], dtype=np.float32)
+    data = {'weights/indptr': indptr, 'weights/indices': indices, 'weights/values': values,
+            'num_influences': len(order), 'influence_names': [NAMES[column] for column in order]}
+    data.update(kwargs)
+
+    return data
+
+
+def test_identical_weights_have_no_error(skin):
+    report = pose_error(skin['rest_points'], skin['weights'], skin['weights'], skin['bind_pre_matrices'],
+                        skin['world_matrices'])
+
+    assert not report['vertex_max'].any()
+    assert not report['pose_max'].any()
+
+
+def test_error_matches_brute_force(skin):
+    changed = skin['weights'].copy()
+    changed[:20] = np.roll(changed[:20], 1, axis=1)
+
+    report = pose_error(skin['rest_points'], skin['weights'], changed, skin['bind_pre_matrices'],
+                        skin['world_matrices'], block_vertices=7)
+
+    # linear blend skinning with identity bind pose is a weighted sum of translations
+    offsets = skin['world_matrices'][:, :, 3, :3]
+    distances = np.linalg.norm(np.einsum('vi,pic->pvc', changed - skin['weights'], offsets), axis=-1)
+
+    np.testing.assert_allclose(report['vertex_max'], distances.max(axis=0), atol=1e-9)
+    np.testing.assert_allclose(report['pose_max'], distances.max(axis=1), atol=1e-9)
+    np.testing.assert_array_equal(report['pose_worst_vertex'], distances.argmax(axis=1))
+    assert report['vertex_max'][20:].max() < 1e-9
+
+
+def test_shape_data_remaps_influences_blockwise(skin):
+    changed = skin['weights'].copy()
+    changed[-5:] = np.roll(changed[-5:], 2, axis=1)
+
+    expected = pose_error(skin['rest_points'], skin['weights'], changed, skin['bind_pre_matrices'],
+                          skin['world_matrices'])
+
+    data_a = _shape_data(skin['weights'], list(range(NUM_INFLUENCES)), rest_points=skin['rest_points'],
+                         bind_pre_matrix_values=skin['bind_pre_matrices'], shape='body')
+    data_b = _shape_data(changed, [3, 1, 4, 0, 2])
+    report = pose_error_shape_data(data_a, data_b, skin['world_matrices'], block_vertices=16)
+
+    for key in expected:
+        np.testing.assert_allclose(report[key], expected[key], atol=1e-5)
+    assert report['shape'] == 'body'
+    assert 'body' in format_pose_error_report(report)
+
+
+def test_shape_data_applies_the_envelope(skin):
+    changed = np.roll(skin['weights'], 1, axis=1)
+
+    expected = pose_error(skin['rest_points'], skin['weights'], changed, skin['bind_pre_matrices'],
+                          skin['world_matrices'])
+
+    data_a = _shape_data(skin['weights'], list(range(NUM_INFLUENCES)), rest_points=skin['rest_points'],
+                         bind_pre_matrix_values=skin['bind_pre_matrices'], envelope=0.25)
+    report = pose_error_shape_data(data_a, _shape_data(changed, list(range(NUM_INFLUENCES))), skin['world_matrices'])
+
+    np.testing.assert_allclose(report['vertex_max'], 0.25 * expected['vertex_max'], atol=1e-5)
+    np.testing.assert_allclose(report['pose_mean'], 0.25 * expected['pose_mean'], atol=1e-5)
+
+
+def test_shape_data_rejects_unknown_influences(skin):
+    data_a = _shape_data(skin['weights'][:, :4], [0, 1, 2, 3], rest_points=skin['rest_points'],
+                         bind_pre_matrix_values=skin['bind_pre_matrices'][:4])
+    data_a['influence_names'] = NAMES[:4]
+    data_b = _shape_data(skin['weights'], list(range(NUM_INFLUENCES)))
+
+    with pytest.raises(ValueError, match='joint_4'):
+        pose_error_shape_data(data_a, data_b, skin['world_matrices'][:, :4])
+
+
+def test_shape_data_rejects_other_vertex_counts(skin):
+    data_a = _shape_data(skin['weights'], list(range(NUM_INFLUENCES)), rest_points=skin['rest_points'],
+                         bind_pre_matrix_values=skin['bind_pre_matrices'])
+    data_b = _shape_data(skin['weights'][:-1], list(range(NUM_INFLUENCES)))
+
+    with pytest.raises(ValueError):
+        pose_error_shape_data(data_a, data_b, skin['world_matrices'])
@@ -0,0 +1,103 @@
+"""Tests for rig.deformers.skin_smooth."""
+import numpy as np
+import pytest
+
+from rig.deformers.skin_smooth import mesh_adjacency, triangle_adjacency, smooth_weights
+
+
+def _grid(rows, columns):
+    ids = np.arange(rows * columns).reshape(rows, columns)
+    quads = np.stack([ids[:-1, :-1], ids[1:, :-1], ids[1:, 1:], ids[:-1, 1:]], axis=-1).reshape(-1, 4)
+
+    return np.full(len(quads), 4), quads.ravel(), rows * columns
+
+
+def _random_weights(num_vertices, num_influences, seed=0):
+    rng = np.random.default_rng(seed)
+    weights = rng.random((num_vertices, num_influences)) * (rng.random((num_vertices, num_influences)) < 0.4)
+    weights[:, 0] += 0.01
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    return weights
+
+
+def test_mesh_adjacency_of_a_quad_grid():
+    indptr, indices = mesh_adjacency(*_grid(3, 3))
+
+    neighbours = [sorted(indices[indptr[vertex]:indptr[vertex + 1]]) for vertex in range(9)]
+    assert neighbours[0] == [1, 3]
+    assert neighbours[4] == [1, 3, 5, 7]
+    assert neighbours[8] == [5, 7]
+
+
+def test_mesh_adjacency_is_symmetric_and_leaves_isolated_vertices_empty():
+    face_counts, face_vertices, num_vertices = _grid(4, 5)
+    indptr, indices = mesh_adjacency(face_counts, face_vertices, num_vertices + 2)
+
+    rows = np.repeat(np.arange(num_vertices + 2), np.diff(indptr))
+    edges = set(zip(rows.tolist(), indices.tolist()))
+    assert edges == {(b, a) for a, b in edges}
+    assert np.diff(indptr)[-2:].tolist() == [0, 0]
+
+
+def test_triangle_adjacency_adds_diagonals():
+    indptr, indices = triangle_adjacency([[0, 1, 2], [0, 2, 3]], 4)
+
+    assert sorted(indices[indptr[0]:indptr[1]]) == [1, 2, 3]
+    assert sorted(indices[indptr[1]:indptr[2]]) == [0, 2]
+
+
+@pytest.mark.parametrize('iterations', [1, 4])
+def test_smoothing_keeps_row_sums(iterations):
+    face_counts, face_vertices, num_vertices = _grid(6, 7)
+    weights = _random_weights(num_vertices, 9)
+
+    smoothed = smooth_weights(weights, *mesh_adjacency(face_counts, face_vertices, num_vertices), iterations)
+
+    np.testing.assert_allclose(smoothed.sum(axis=1), weights.sum(axis=1))
+    assert (smoothed >= 0.0).all()
+    assert not np.allclose(smoothed, weights)
+
+
+def test_smoothing_keeps_uniform_weights():
+    face_counts, face_vertices, num_vertices = _grid(4, 4)
+    weights = np.tile([0.25, 0.0, 0.75], (num_vertices, 1))
+
+    smoothed = smooth_weights(weights, *mesh_adjacency(face_counts, face_vertices, num_vertices), 3)
+
+    np.testing.assert_allclose(smoothed, weights)
+
+
+def test_smoothing_matches_the_neighbour_average():
+    face_counts, face_vertices, num_vertices = _grid(3, 3)
+    weights = _random_weights(num_vertices, 4)
+    indptr, indices = mesh_adjacency(face_counts, face_vertices, num_vertices)
+
+    smoothed = smooth_weights(weights, indptr, indices, strength=1.0)
+
+    average = weights[indices[indptr[4]:indptr[5]]].mean(axis=0)
+    np.testing.assert_allclose(smoothed[4], average)
+
+
+def test_locked_influences_and_masked_vertices_keep_their_weights():
+    face_counts, face_vertices, num_vertices = _grid(5, 5)
+    weights = _random_weights(num_vertices, 6, seed=1)
+    mask = np.zeros(num_vertices, dtype=bool)
+    mask[6:19] = True
+
+    smoothed = smooth_weights(weights, *mesh_adjacency(face_counts, face_vertices, num_vertices), 2,
+                              mask=mask, locked=[2])
+
+    np.testing.assert_array_equal(smoothed[~mask], weights[~mask])
+    np.testing.assert_array_equal(smoothed[:, 2], weights[:, 2])
+    np.testing.assert_allclose(smoothed.sum(axis=1), weights.sum(axis=1))
+
+
+def test_unused_influences_stay_empty():
+    face_counts, face_vertices, num_vertices = _grid(4, 4)
+    weights = np.zeros((num_vertices, 5))
+    weights[:, [1, 3]] = _random_weights(num_vertices, 2, seed=2)
+
+    smoothed = smooth_weights(weights, *mesh_adjacency(face_counts, face_vertices, num_vertices), 2)
+
+    assert not smoothed[:, [0, 2, 4]].any()
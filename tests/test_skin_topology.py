@@ -0,0 +1,56 @@
+"""Tests for rig.deformers.skin_topology."""
+import numpy as np
+
+from rig.deformers.skin_file import write_skin_file
+from rig.deformers.skin_topology import topology_fingerprint, bounding_box, compare_topology, TopologyIndex
+
+FACE_COUNTS = [4, 4, 3]
+FACE_VERTICES = [0, 1, 4, 3, 1, 2, 5, 4, 3, 4, 6]
+
+
+def test_fingerprint_tracks_connectivity_only():
+    fingerprint = topology_fingerprint(7, FACE_COUNTS, FACE_VERTICES)
+
+    assert fingerprint['num_vertices'] == 7
+    assert fingerprint['num_faces'] == 3 and fingerprint['num_face_vertices'] == 11
+    assert topology_fingerprint(7, np.array(FACE_COUNTS), np.array(FACE_VERTICES)) == fingerprint
+
+    reordered = topology_fingerprint(7, FACE_COUNTS, FACE_VERTICES[4:8] + FACE_VERTICES[:4] + FACE_VERTICES[8:])
+    mismatches = compare_topology(fingerprint, reordered)
+    assert len(mismatches) == 1 and mismatches[0].startswith('connectivity_hash')
+
+
+def test_compare_topology_with_vertex_count_only():
+    assert compare_topology({'num_vertices': 7}, topology_fingerprint(7, FACE_COUNTS, FACE_VERTICES)) == []
+    assert compare_topology({'num_vertices': 8}, topology_fingerprint(7)) == ['num_vertices: saved 8, target 7']
+
+
+def test_bounding_box():
+    assert bounding_box(np.empty((0, 3))) == [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    assert bounding_box([[1.0, -2.0, 0.0], [-1.0, 3.0, 0.5]]) == [[-1.0, -2.0, 0.0], [1.0, 3.0, 0.5]]
+
+
+def test_topology_index(tmp_path):
+    fingerprint = topology_fingerprint(7, FACE_COUNTS, FACE_VERTICES)
+    metadata = {'shapes': [{'shape': 'body', 'num_vertices': 7, 'topology': fingerprint,
+                            'bounding_box': [[0.0, 0.0, 0.0], [2.0, 2.0, 0.0]]},
+                           {'shape': 'legacy', 'num_vertices': 7}]}
+    asset_dir = tmp_path / 'assets' / 'hero'
+    asset_dir.mkdir(parents=True)
+    skin_path = str(asset_dir / 'hero.skin')
+    write_skin_file(skin_path, metadata, {})
+
+    index_path = str(tmp_path / 'index' / 'topology.json')
+    index = TopologyIndex(index_path)
+    assert index.rebuild(str(tmp_path / 'assets')) == 1
+    index.save()
+
+    reloaded = TopologyIndex(index_path)
+    assert reloaded.hashes == [fingerprint['connectivity_hash']]
+    entries = reloaded.find(fingerprint)
+    assert [(entry['file'], entry['shape']) for entry in entries] == [(skin_path, 'body')]
+    assert reloaded.find(fingerprint['connectivity_hash']) == entries
+
+    # re-adding a file replaces its entries
+    assert reloaded.add_skin_file(skin_path) == 1
+    assert len(reloaded.find(fingerprint)) == 1
@@ -0,0 +1,122 @@
+"""Tests for rig.deformers.skin_transfer."""
+import numpy as np
+import pytest
+
+from rig.deformers.skin_transfer import (UniformGrid, closest_points_on_triangles, compute_transfer,
+                                         transfer_shape_data, transfer_weights)
+
+
+def _grid_mesh(size=10):
+    """Returns the points and triangles of a flat size x size quad grid in the xy plane."""
+    x, y = np.meshgrid(np.arange(size, dtype=np.float64), np.arange(size, dtype=np.float64))
+    points = np.stack([x.ravel(), y.ravel(), np.zeros(size * size)], axis=1)
+
+    corners = (np.arange(size - 1)[None] + size * np.arange(size - 1)[:, None]).ravel()
+    triangles = np.concatenate([np.stack([corners, corners + 1, corners + size + 1], axis=1),
+                                np.stack([corners, corners + size + 1, corners + size], axis=1)])
+
+    return points, triangles
+
+
+def test_grid_query_matches_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(2000, 3)) * [10.0, 1.0, 0.1]
+    targets = rng.normal(size=(500, 3)) * 12.0
+
+    distances, indices = UniformGrid(points).query(targets)
+
+    brute = np.linalg.norm(targets[:, None] - points[None], axis=-1)
+    np.testing.assert_allclose(distances, brute.min(axis=1))
+    np.testing.assert_array_equal(indices, brute.argmin(axis=1))
+
+
+def test_closest_points_on_triangles_regions():
+    a, b, c = np.zeros(3), np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0])
+    targets = np.array([[0.25, 0.25, 2.0], [-1.0, -1.0, 0.0], [2.0, -1.0, 0.0], [1.0, 1.0, 0.0]])
+
+    coords, distances = closest_points_on_triangles(targets, *[np.tile(corner, (len(targets), 1))
+                                                               for corner in (a, b, c)])
+
+    np.testing.assert_allclose(coords, [[0.5, 0.25, 0.25], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.5, 0.5]],
+                               atol=1e-12)
+    np.testing.assert_allclose(distances, [4.0, 2.0, 2.0, 0.5], atol=1e-12)
+
+
+def test_barycentric_transfer_interpolates_linear_weights():
+    points, triangles = _grid_mesh()
+    ramp = points[:, 0] / points[:, 0].max()
+    weights = np.stack([ramp, 1.0 - ramp], axis=1)
+
+    targets = np.random.default_rng(1).random((200, 3)) * [9.0, 9.0, 0.0] + [0.0, 0.0, 0.5]
+    transferred = transfer_weights(points, weights, targets, triangles, mode='barycentric')
+
+    np.testing.assert_allclose(transferred[:, 0], targets[:, 0] / 9.0, atol=1e-9)
+    np.testing.assert_allclose(transferred.sum(axis=1), 1.0)
+
+
+def test_barycentric_transfer_finds_long_thin_triangles():
+    # the target sits right above the middle of a sliver whose corners are all far away,
+    # while the nearest vertex belongs to a small triangle further up
+    points = np.array([[0.0, 0.0, 0.0], [100.0, 0.0, 0.0], [100.0, 1.0, 0.0],
+                       [50.0, 0.5, 3.0], [51.0, 0.5, 3.0], [50.0, 1.5, 3.0]])
+    triangles = np.array([[0, 1, 2], [3, 4, 5]])
+    weights = np.repeat(np.eye(2), 3, axis=0)
+
+    indices, coefficients = compute_transfer(points, [[50.0, 0.2, 1.0]], triangles, mode='barycentric')
+
+    np.testing.assert_array_equal(indices, [[0, 1, 2]])
+    np.testing.assert_allclose(transfer_weights(points, weights, [[50.0, 0.2, 1.0]], triangles, mode='barycentric'),
+                               [[1.0, 0.0]])
+
+
+def test_barycentric_transfer_matches_brute_force():
+    rng = np.random.default_rng(3)
+    points = rng.random((300, 3)) * [20.0, 20.0, 2.0]
+    triangles = rng.integers(0, len(points), (200, 3))
+    targets = rng.random((100, 3)) * [20.0, 20.0, 2.0]
+
+    indices, coefficients = compute_transfer(points, targets, triangles, mode='barycentric')
+    closest = np.einsum('tk,tkj->tj', coefficients, points[indices])
+
+    brute = np.full(len(targets), np.inf)
+    for triangle in triangles:
+        _, distances = closest_points_on_triangles(targets, *[np.tile(points[corner], (len(targets), 1))
+                                                              for corner in triangle])
+        brute = np.minimum(brute, distances)
+    brute = np.minimum(brute, (np.linalg.norm(targets[:, None] - points[None], axis=-1) ** 2).min(axis=1))
+
+    np.testing.assert_allclose(np.einsum('ij,ij->i', targets - closest, targets - closest), brute, atol=1e-9)
+
+
+def test_transfer_shape_data_describes_the_target():
+    points, triangles = _grid_mesh(3)
+    data = {'shape': 'body', 'rest_points': points, 'triangles': triangles, 'influence_names': ['root'],
+            'weights': np.ones((len(points), 1)), 'blend_weights': np.zeros(len(points)), 'num_vertices': len(points),
+            'topology': {'num_vertices': len(points)}, 'bounding_box': [[0.0, 0.0, 0.0], [2.0, 2.0, 0.0]]}
+    targets = points[:4] * 2.0 + 1.0
+
+    transferred = transfer_shape_data(data, targets)
+
+    assert 'topology' not in transferred
+    assert transferred['bounding_box'] == [[1.0, 1.0, 1.0], [5.0, 3.0, 1.0]]
+    assert transferred['num_vertices'] == 4
+
+    topology = {'num_vertices': 4, 'num_faces': 1}
+    assert transfer_shape_data(data, targets, target_topology=topology)['topology'] == topology
+
+
+def test_closest_point_transfer_copies_rows():
+    points, _ = _grid_mesh()
+    weights = np.random.default_rng(2).random((len(points), 4))
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    np.testing.assert_allclose(transfer_weights(points, weights, points + 0.1), weights)
+
+
+def test_transfer_mode_errors():
+    points, _ = _grid_mesh(3)
+
+    with pytest.raises(ValueError):
+        compute_transfer(points, points, mode='nearest')
+    with pytest.raises(ValueError):
+        compute_transfer(points, points, mode='barycentric')
@@ -0,0 +1,179 @@
+"""Tests for rig.deformers.skin_weights."""
+import numpy as np
+import pytest
+
+from rig.deformers.skin_weights import (dense_to_csr, csr_to_dense, build_influence_map, remap_influences,
+                                        prune_weights, limit_influences, normalize_rows, condition_weights,
+                                        encode_weight_values, decode_weight_values, weight_encoding_error,
+                                        choose_weight_encoding, influence_usage, used_influence_columns)
+
+
+TRAILING_EMPTY = np.array([[0.5, 0.5, 0.0],
+                           [0.2, 0.3, 0.5],
+                           [0.0, 0.0, 0.0]])
+
+MIDDLE_EMPTY = np.array([[0.0, 0.0, 0.0],
+                         [0.25, 0.0, 0.75],
+                         [0.0, 0.0, 0.0],
+                         [0.1, 0.6, 0.3],
+                         [0.0, 0.0, 0.0]])
+
+
+@pytest.mark.parametrize('weights', [TRAILING_EMPTY, MIDDLE_EMPTY], ids=['trailing_empty', 'middle_empty'])
+def test_csr_round_trip(weights):
+    indptr, indices, values = dense_to_csr(weights)
+
+    assert len(indptr) == len(weights) + 1
+    assert indptr[-1] == len(indices) == len(values) == np.count_nonzero(weights)
+    assert indices.dtype == np.uint8 and values.dtype == np.float32
+    np.testing.assert_allclose(csr_to_dense(indptr, indices, values, weights.shape[1]), weights, atol=1e-7)
+
+
+def test_csr_threshold_drops_small_weights():
+    weights = np.array([[0.6, 0.39, 0.01]])
+    indptr, indices, values = dense_to_csr(weights, threshold=0.05)
+
+    np.testing.assert_array_equal(indptr, [0, 2])
+    np.testing.assert_array_equal(indices, [0, 1])
+
+
+def test_csr_to_dense_fills_out():
+    out = np.full(TRAILING_EMPTY.shape, 7.0)
+    result = csr_to_dense(*dense_to_csr(TRAILING_EMPTY), num_influences=3, out=out)
+
+    assert result is out
+    assert not out[2].any()
+
+
+def test_dense_to_csr_rejects_vectors():
+    with pytest.raises(ValueError):
+        dense_to_csr(np.ones(4))
+
+
+def test_build_influence_map_by_short_name():
+    column_map = build_influence_map(['|root|hip', 'spine', 'tail', 'ear_l'], ['spine', 'hip', '|root|head'],
+                                     fallbacks={'tail': 'hip'})
+
+    np.testing.assert_array_equal(column_map, [1, 0, 1, -1])
+
+
+def test_remap_influences_merges_and_drops_columns():
+    weights = np.array([[0.1, 0.2, 0.3, 0.4],
+                        [0.0, 1.0, 0.0, 0.0]])
+
+    remapped = remap_influences(weights, np.array([1, 0, 1, -1]), 3)
+
+    np.testing.assert_allclose(remapped, [[0.2, 0.4, 0.0],
+                                          [1.0, 0.0, 0.0]])
+    assert not remap_influences(weights, np.full(4, -1), 2).any()
+
+
+def test_prune_keeps_largest_weight():
+    weights = np.array([[0.05, 0.9, 0.05],
+                        [0.02, 0.01, 0.0]])
+
+    prune_weights(weights, 0.1)
+
+    np.testing.assert_allclose(weights, [[0.0, 0.9, 0.0],
+                                         [0.02, 0.0, 0.0]])
+
+
+def test_limit_influences():
+    weights = np.array([[0.1, 0.4, 0.2, 0.3],
+                        [0.0, 0.0, 1.0, 0.0]])
+
+    limit_influences(weights, 2)
+
+    np.testing.assert_allclose(weights, [[0.0, 0.4, 0.0, 0.3],
+                                         [0.0, 0.0, 1.0, 0.0]])
+    with pytest.raises(ValueError):
+        limit_influences(weights, 0)
+
+
+def test_normalize_rows_leaves_empty_rows():
+    weights = normalize_rows(TRAILING_EMPTY * 3.0)
+
+    np.testing.assert_allclose(weights, TRAILING_EMPTY)
+
+
+def test_condition_weights_copies():
+    rng = np.random.default_rng(0)
+    weights = rng.random((200, 10))
+    original = weights.copy()
+
+    conditioned = condition_weights(weights, prune_threshold=0.05, max_influences=4)
+
+    np.testing.assert_array_equal(weights, original)
+    assert (np.count_nonzero(conditioned, axis=1) <= 4).all()
+    np.testing.assert_allclose(conditioned.sum(axis=1), 1.0)
+
+
+def _round_trip(weights, encoding):
+    indptr, indices, values = dense_to_csr(weights, dtype=np.float64)
+    encoded = encode_weight_values(indptr, values, encoding)
+
+    return encoded, csr_to_dense(indptr, indices, decode_weight_values(indptr, encoded), weights.shape[1])
+
+
+@pytest.mark.parametrize('encoding', ['float32', 'float16', 'uint16', 'uint8'])
+@pytest.mark.parametrize('weights', [TRAILING_EMPTY, MIDDLE_EMPTY], ids=['trailing_empty', 'middle_empty'])
+def test_round_trip_with_empty_rows(weights, encoding):
+    _, decoded = _round_trip(weights, encoding)
+
+    assert decoded.shape == weights.shape
+    assert np.abs(decoded - weights).max() < 1.0 / 255
+    assert not decoded[~weights.any(axis=1)].any()
+
+
+@pytest.mark.parametrize('encoding', ['uint16', 'uint8'])
+def test_fixed_point_keeps_rows_normalized(encoding):
+    rng = np.random.default_rng(0)
+    weights = rng.random((500, 12)) * (rng.random((500, 12)) < 0.3)
+    weights[-3:] = 0.0
+    weights /= np.where(weights.sum(axis=1, keepdims=True) > 0, weights.sum(axis=1, keepdims=True), 1.0)
+
+    encoded, decoded = _round_trip(weights, encoding)
+    indptr = dense_to_csr(weights)[0]
+    rows = np.repeat(np.arange(len(weights)), np.diff(indptr))
+    sums = np.bincount(rows, encoded.astype(np.float64), minlength=len(weights))[np.diff(indptr) > 0]
+
+    assert (sums == np.iinfo(encoded.dtype).max).all()
+    np.testing.assert_allclose(decoded.sum(axis=1)[weights.any(axis=1)], 1.0, atol=1e-12)
+
+
+def test_fixed_point_error_within_one_step():
+    weights = np.array([[1.0 / 3, 1.0 / 3, 1.0 / 3],
+                        [0.999, 0.001, 0.0]])
+    indptr, _, values = dense_to_csr(weights, dtype=np.float64)
+
+    assert weight_encoding_error(indptr, values, 'uint8') < 1.0 / 255
+    assert weight_encoding_error(indptr, values, 'uint16') < 1.0 / 65535
+
+
+def test_choose_weight_encoding():
+    indptr, _, values = dense_to_csr(TRAILING_EMPTY, dtype=np.float64)
+
+    assert choose_weight_encoding(indptr, values, 1e-2) == 'uint8'
+    assert choose_weight_encoding(indptr, values, 1e-4) == 'uint16'
+    assert choose_weight_encoding(indptr, values, 0.0) in ('uint8', 'uint16', 'float32')
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        encode_weight_values(np.array([0, 1]), np.array([1.0]), 'int4')
+
+
+def test_empty_weights():
+    indptr = np.zeros(4, dtype=np.int32)
+
+    assert len(encode_weight_values(indptr, np.empty(0), 'uint16')) == 0
+    assert len(decode_weight_values(indptr, np.empty(0, dtype=np.uint16))) == 0
+
+
+def test_influence_usage():
+    max_weights, sum_weights = influence_usage(MIDDLE_EMPTY)
+
+    np.testing.assert_allclose(max_weights, [0.25, 0.6, 0.75])
+    np.testing.assert_allclose(sum_weights, [0.35, 0.6, 1.05])
+    np.testing.assert_array_equal(used_influence_columns([0.0, 1e-6, 0.5], threshold=1e-5), [2])
+    assert influence_usage(np.empty((0, 2)))[0].tolist() == [0.0, 0.0]